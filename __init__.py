@@ -53,7 +53,9 @@ def register():
 	# Register operators
 	bpy.utils.register_class(EXPORT_OT_SceneSlicer_Preview)
 	bpy.utils.register_class(SCENE_OT_SceneSlicer_RefreshCollections)
+	bpy.utils.register_class(SCENE_OT_SceneSlicer_RemoveSliced)
 	bpy.utils.register_class(EXPORT_OT_SceneSlicer_Export)
+	bpy.utils.register_class(EXPORT_OT_SceneSlicer_Resume)
 
 	# Register UI panels
 	bpy.utils.register_class(VIEW3D_PT_SceneSlicer_Main)
@@ -77,7 +79,9 @@ def unregister():
 	bpy.utils.unregister_class(VIEW3D_PT_SceneSlicer_Main)
 
 	# remove operators
+	bpy.utils.unregister_class(EXPORT_OT_SceneSlicer_Resume)
 	bpy.utils.unregister_class(EXPORT_OT_SceneSlicer_Export)
+	bpy.utils.unregister_class(SCENE_OT_SceneSlicer_RemoveSliced)
 	bpy.utils.unregister_class(SCENE_OT_SceneSlicer_RefreshCollections)
 	bpy.utils.unregister_class(EXPORT_OT_SceneSlicer_Preview)
 
@@ -98,5 +102,5 @@ def unregister():
 @persistent
 def HANDLER_UI_ResetProgress(scene):
 
-	Log("HANDLER_Scene_Update_Pre()")
+	LogDebug("HANDLER_Scene_Update_Pre()")
 	EXPORT_OT_SceneSlicer_Export.UI_ResetProgress(EXPORT_OT_SceneSlicer_Export)
@@ -63,6 +63,87 @@ class SceneSlicerSettings(bpy.types.PropertyGroup):
 	#
 	# Advanced options
 
+	# Slicing method
+	slice_method: bpy.props.EnumProperty(
+		name   = "Slice method",
+		items  = [
+			("BOOLEAN", "Boolean", "Intersect each object with a cutter cube using a Boolean modifier"),
+			("BISECT",  "Bisect",  "Clip each object's evaluated mesh against the six planes of the tile. Faster, with no cutter or modifiers, but cut faces are left open"),
+			("SLAB",    "Slab",    "Cut each object along every grid plane it crosses in one pass, then share the pieces out to the tiles. Fastest for large objects that span many tiles, cut faces are left open"),
+		],
+		default = "BOOLEAN",
+	)  # type: ignore
+
+	# Tiling mode
+	tiling_mode: bpy.props.EnumProperty(
+		name   = "Tiling mode",
+		items  = [
+			("GRID",   "Grid",   "Slice the collection into a uniform grid of tiles, each the size of the grid size"),
+			("OCTREE", "Octree", "Subdivide busy areas down to the grid size and merge sparse ones into larger tiles, written as a hierarchical tileset"),
+		],
+		default = "GRID",
+	)  # type: ignore
+
+	# Octree triangle budget
+	octree_tri_budget: bpy.props.IntProperty(
+		name        = "Octree triangle budget",
+		description = "The most triangles an octree tile can hold before it's split into smaller tiles, down to the grid size",
+		default     = 50000,
+		min         = 1,
+		subtype     = 'UNSIGNED',
+	) # type: ignore
+
+	# Octree merge level
+	octree_max_level: bpy.props.IntProperty(
+		name        = "Octree max merge level",
+		description = "How far sparse tiles can be merged: a tile at level N is 2^N grid tiles across",
+		default     = 3,
+		min         = 0,
+		max         = 8,
+		subtype     = 'UNSIGNED',
+	) # type: ignore
+
+	# Frame-time budget for the modal export loop
+	frame_budget: bpy.props.IntProperty(
+		name        = "Frame budget",
+		description = "How long, in milliseconds, the export may work on tiles before handing control back to Blender. Lower values keep the UI more responsive, higher values export faster",
+		default     = 50,
+		min         = 5,
+		max         = 1000,
+		subtype     = 'UNSIGNED',
+	) # type: ignore
+
+	# Tile traversal order
+	tile_order: bpy.props.EnumProperty(
+		name   = "Tile order",
+		items  = [
+			("LINEAR",  "Linear",  "Process tiles in X, Y, Z order"),
+			("MORTON",  "Morton",  "Process tiles along a Z-order curve, so neighbouring tiles are mostly processed together"),
+			("HILBERT", "Hilbert", "Process tiles along a Hilbert curve, so each tile is followed by one of its neighbours"),
+		],
+		default = "HILBERT",
+	)  # type: ignore
+
+	# Evaluated mesh cache budget
+	mesh_cache_budget: bpy.props.IntProperty(
+		name        = "Mesh cache budget",
+		description = "Memory budget, in MB, for caching the evaluated meshes of objects that span several tiles. Used by the Bisect slice method. Set to 0 to disable the cache",
+		default     = 1024,
+		min         = 0,
+		max         = 65536,
+		subtype     = 'UNSIGNED',
+	) # type: ignore
+
+	# Duplicate method
+	duplicate_method: bpy.props.EnumProperty(
+		name   = "Duplicate method",
+		items  = [
+			("DATA",     "Data",     "Build each duplicate directly from the evaluated mesh, without operators. Much faster"),
+			("OPERATOR", "Operator", "Duplicate and convert each object with Blender operators, keeping its rotation and scale on the object"),
+		],
+		default = "DATA",
+	)  # type: ignore
+
 	# Bool solver method
 	bool_solver: bpy.props.EnumProperty(
 		name   = "Bool solver method",
@@ -87,6 +168,87 @@ class SceneSlicerSettings(bpy.types.PropertyGroup):
 		default     = True,
 	) # type: ignore
 
+	# Tileset JSON schema
+	tileset_schema: bpy.props.EnumProperty(
+		name   = "Tileset schema",
+		items  = [
+			("DENSE",  "Dense",  "List every tile in the grid as a nested array, including empty tiles and their positions"),
+			("SPARSE", "Sparse", "List only the exported tiles, by index and src. Positions are worked out from the tileset origin and tile dimensions"),
+		],
+		default = "DENSE",
+	)  # type: ignore
+
+	# Binary tile index
+	export_tile_index: bpy.props.BoolProperty(
+		name        = "Export tile index",
+		description = "Also export a compact binary index of the tiles, for clients to look up a tile without parsing tileset.json",
+		default     = True,
+	) # type: ignore
+
+	# Incremental export
+	incremental_export: bpy.props.BoolProperty(
+		name        = "Incremental export",
+		description = "Only re-slice and re-export tiles that have changed since the last export, based on a manifest of tile fingerprints stored beside tileset.json",
+		default     = False,
+	) # type: ignore
+
+	# Keep sliced objects
+	keep_sliced: bpy.props.BoolProperty(
+		name        = "Keep sliced objects",
+		description = "Keep every tile's sliced objects in the _sliced collection after export, for inspection. When disabled each tile's objects and meshes are freed as soon as it's exported, which uses far less memory",
+		default     = False,
+	) # type: ignore
+
+	# Profiling
+	use_profiler: bpy.props.BoolProperty(
+		name        = "Profile export",
+		description = "Record how long each stage of the export takes, and write a Chrome/Perfetto trace and a per-stage summary to the output folder",
+		default     = False,
+	) # type: ignore
+
+	# Log level
+	log_level: bpy.props.EnumProperty(
+		name   = "Log level",
+		items  = [
+			("DEBUG",   "Debug",   "Log everything, including a line for every tile and every object decomposed"),
+			("INFO",    "Info",    "Log the progress and results of the export"),
+			("WARNING", "Warning", "Only log settings that couldn't be used and problems the export carried on from"),
+			("ERROR",   "Error",   "Only log failures"),
+		],
+		default = "INFO",
+	)  # type: ignore
+
+	# Log file format
+	log_format: bpy.props.EnumProperty(
+		name   = "Log format",
+		items  = [
+			("TEXT", "Text",       "Write the log file as plain text, one line per message"),
+			("JSON", "JSON lines", "Write the log file as one JSON object per line, with the time, level, thread and message"),
+		],
+		default = "TEXT",
+	)  # type: ignore
+
+	# Log text block
+	log_to_text: bpy.props.BoolProperty(
+		name        = "Log to text block",
+		description = "Also write the log to the scene_slicer.log text block in Blender. Slows down exports with a lot of logging",
+		default     = False,
+	) # type: ignore
+
+	# LOD generation
+	use_lods: bpy.props.BoolProperty(
+		name        = "Export LODs",
+		description = "Also export decimated levels of detail for each tile, listed with their triangle counts and file sizes in tileset.json",
+		default     = False,
+	) # type: ignore
+
+	# LOD decimation ratios
+	lod_ratios: bpy.props.StringProperty(
+		name        = "LOD ratios",
+		description = "Comma separated ratios of triangles to keep for each LOD level after the full detail one, eg 0.5, 0.15",
+		default     = "0.5, 0.15",
+	) # type: ignore
+
 	#
 	# glTF settings
 	
@@ -104,6 +266,17 @@ class SceneSlicerSettings(bpy.types.PropertyGroup):
 		default     = True,
 	) # type: ignore
 
+	# glTF writer
+	gltf_writer: bpy.props.EnumProperty(
+		name        = "glTF writer",
+		description = "How tiles are written to glTF",
+		default     = "NATIVE",
+		items       = [
+			("NATIVE",   "Native",        "Write static meshes directly, falling back to the glTF exporter for anything textured, skinned, animated or Draco compressed. Much faster"),
+			("EXPORTER", "glTF exporter", "Always use Blender's glTF exporter"),
+		],
+	)  # type: ignore
+
 	# File format: gltf or glb
 	export_format: bpy.props.EnumProperty(
 		name        = "glTF Export format",
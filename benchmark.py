@@ -0,0 +1,929 @@
+# WhatDo:
+#
+# Measures how fast the scene slicer is, so settings changes and new releases can be compared. A
+# synthetic scene of a controlled size is built procedurally - many small props, a few huge
+# terrain meshes, props with modifiers and parented hierarchies - and exported once for every
+# combination of grid size, bool solver and export format, the same way headless.py does.
+#
+# Usage:
+#
+#   blender -b --factory-startup --python path/to/scene_slicer/benchmark.py -- [options]
+#
+# Options:
+#
+#   --scene NAME            The scene preset to build, one of SCENE_PRESETS (default: medium)
+#   --props N               Override the number of props in the preset
+#   --terrains N            Override the number of terrain meshes in the preset
+#   --hierarchies N         Override the number of parented hierarchies in the preset
+#   --seed N                Override the random seed in the preset
+#   --grid-sizes SIZE ...   Grid sizes to run, eg 16 or 16x16x8 (default: 16 32)
+#   --bool-solvers NAME ... bool_solver values to run (default: FAST EXACT)
+#   --formats NAME ...      export_format values to run (default: GLB GLTF_SEPARATE)
+#   --set KEY=VALUE         Set a setting for every run, as in headless.py, eg --set slice_method=BISECT
+#   --repeat N              Export each combination N times and keep the median (default: 1)
+#   --output PATH           Folder to export to, each run gets its own subfolder
+#   --results FILE          Where to write the results JSON (default: benchmark.results.json in the output folder)
+#   --baseline FILE         A results file from an earlier run to compare against
+#   --threshold RATIO       How much worse a metric can get before it counts as a regression (default: 0.1)
+#
+# A single line starting with RESULTS_PREFIX is printed when the benchmark ends, followed by the
+# path to the results file. Blender exits with EXIT_OK if every run finished and nothing regressed
+# against the baseline, EXIT_FAILED otherwise, and EXIT_BAD_ARGS if the arguments were invalid.
+#
+
+import argparse
+import bmesh
+import bpy
+import importlib
+import json
+import math
+import os
+import platform
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import traceback
+
+import numpy as np
+
+# Not available on Windows, where peak memory isn't measured
+try:
+	import resource
+except ImportError:
+	resource = None
+
+
+
+#  ██████╗ ██████╗ ███╗   ██╗███████╗████████╗ █████╗ ███╗   ██╗████████╗███████╗
+# ██╔════╝██╔═══██╗████╗  ██║██╔════╝╚══██╔══╝██╔══██╗████╗  ██║╚══██╔══╝██╔════╝
+# ██║     ██║   ██║██╔██╗ ██║███████╗   ██║   ███████║██╔██╗ ██║   ██║   ███████╗
+# ██║     ██║   ██║██║╚██╗██║╚════██║   ██║   ██╔══██║██║╚██╗██║   ██║   ╚════██║
+# ╚██████╗╚██████╔╝██║ ╚████║███████║   ██║   ██║  ██║██║ ╚████║   ██║   ███████║
+#  ╚═════╝ ╚═════╝ ╚═╝  ╚═══╝╚══════╝   ╚═╝   ╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝   ╚══════╝
+#
+
+RESULTS_PREFIX  = "SCENE_SLICER_BENCHMARK"
+RESULTS_NAME    = "benchmark.results.json"
+RESULTS_VERSION = 1
+
+# Name of the collection the synthetic scene is built in
+BENCHMARK_COLLECTION = "Benchmark"
+
+# Sizes of the synthetic scenes. The scene covers size x size Blender units, with the terrains side
+# by side across it and every prop made of one of a few shared meshes
+SCENE_PRESETS = {
+	"small": {
+		"size"              : 64,
+		"props"             : 200,
+		"terrains"          : 1,
+		"terrain_resolution": 64,
+		"hierarchies"       : 10,
+		"hierarchy_depth"   : 3,
+		"modifier_ratio"    : 0.25,
+		"seed"              : 1,
+	},
+	"medium": {
+		"size"              : 128,
+		"props"             : 2000,
+		"terrains"          : 2,
+		"terrain_resolution": 256,
+		"hierarchies"       : 50,
+		"hierarchy_depth"   : 3,
+		"modifier_ratio"    : 0.25,
+		"seed"              : 1,
+	},
+	"large": {
+		"size"              : 256,
+		"props"             : 10000,
+		"terrains"          : 4,
+		"terrain_resolution": 512,
+		"hierarchies"       : 200,
+		"hierarchy_depth"   : 4,
+		"modifier_ratio"    : 0.25,
+		"seed"              : 1,
+	},
+}
+
+# Metrics compared against the baseline, and whether a higher value is better
+COMPARE_METRICS = {
+	"time"         : False,
+	"tiles_per_sec": True,
+	"peak_rss"     : False,
+	"output_bytes" : False,
+}
+
+# Files written to the output folder that aren't part of the export itself
+MEASURE_EXCLUDE = ("profile.", "scene_slicer.log")
+
+# How often, in seconds, memory use is sampled during a run
+RSS_SAMPLE_INTERVAL = 0.05
+
+
+
+#  █████╗ ██████╗  ██████╗ ██╗   ██╗███╗   ███╗███████╗███╗   ██╗████████╗███████╗
+# ██╔══██╗██╔══██╗██╔════╝ ██║   ██║████╗ ████║██╔════╝████╗  ██║╚══██╔══╝██╔════╝
+# ███████║██████╔╝██║  ███╗██║   ██║██╔████╔██║█████╗  ██╔██╗ ██║   ██║   ███████╗
+# ██╔══██║██╔══██╗██║   ██║██║   ██║██║╚██╔╝██║██╔══╝  ██║╚██╗██║   ██║   ╚════██║
+# ██║  ██║██║  ██║╚██████╔╝╚██████╔╝██║ ╚═╝ ██║███████╗██║ ╚████║   ██║   ███████║
+# ╚═╝  ╚═╝╚═╝  ╚═╝ ╚═════╝  ╚═════╝ ╚═╝     ╚═╝╚══════╝╚═╝  ╚═══╝   ╚═╝   ╚══════╝
+#
+
+def ParseArgs(argv: list) -> argparse.Namespace:
+	"""
+	Parse the benchmark command line.
+
+	:param argv: The script arguments, see GetScriptArgs in headless.py.
+	:type argv: list[str]
+
+	:return: The parsed arguments.
+	:rtype: argparse.Namespace
+	"""
+
+	parser = argparse.ArgumentParser(prog="benchmark.py", description="Export synthetic scenes with a range of settings and record how fast it was.")
+	parser.add_argument("--scene",        default="medium", choices=list(SCENE_PRESETS), help="The scene preset to build")
+	parser.add_argument("--props",        type=int, help="Override the number of props")
+	parser.add_argument("--terrains",     type=int, help="Override the number of terrain meshes")
+	parser.add_argument("--hierarchies",  type=int, help="Override the number of parented hierarchies")
+	parser.add_argument("--seed",         type=int, help="Override the random seed")
+	parser.add_argument("--grid-sizes",   nargs="+", default=["16", "32"], metavar="SIZE", help="Grid sizes to run, eg 16 or 16x16x8")
+	parser.add_argument("--bool-solvers", nargs="+", default=["FAST", "EXACT"], metavar="NAME", help="bool_solver values to run")
+	parser.add_argument("--formats",      nargs="+", default=["GLB", "GLTF_SEPARATE"], metavar="NAME", help="export_format values to run")
+	parser.add_argument("--set",          action="append", default=[], metavar="KEY=VALUE", help="Set a setting for every run")
+	parser.add_argument("--repeat",       type=int, default=1, help="Export each combination this many times and keep the median")
+	parser.add_argument("--output",       default=os.path.join(tempfile.gettempdir(), "scene_slicer_benchmark"), help="Folder to export to")
+	parser.add_argument("--results",      help="Where to write the results JSON")
+	parser.add_argument("--baseline",     help="A results file from an earlier run to compare against")
+	parser.add_argument("--threshold",    type=float, default=0.1, help="How much worse a metric can get before it counts as a regression")
+
+	return parser.parse_args(argv)
+
+
+def GetSceneSpec(args: argparse.Namespace) -> dict:
+	"""
+	Get the size of the scene to build, from the preset and any overrides.
+
+	:param args: The parsed arguments, see ParseArgs.
+	:type args: argparse.Namespace
+
+	:return: The scene spec, with the same keys as the SCENE_PRESETS entries plus "preset".
+	:rtype: dict
+	"""
+
+	spec = dict(SCENE_PRESETS[args.scene], preset=args.scene)
+
+	for key in ("props", "terrains", "hierarchies", "seed"):
+		value = getattr(args, key)
+		if value is not None:
+			if value < 0:
+				raise ValueError(f"--{key} can't be negative")
+			spec[key] = value
+
+	return spec
+
+
+def GetRunMatrix(args: argparse.Namespace) -> list[dict]:
+	"""
+	Get every combination of grid size, bool solver and export format to run.
+
+	:param args: The parsed arguments, see ParseArgs.
+	:type args: argparse.Namespace
+
+	:return: A run for each combination, with a name that's stable between benchmarks and the settings to apply.
+	:rtype: list[dict]
+	"""
+
+	runs = []
+
+	for grid_size in args.grid_sizes:
+		try:
+			dimensions = [float(value) for value in grid_size.lower().split("x")]
+		except ValueError:
+			raise ValueError(f"Invalid grid size: {grid_size}")
+
+		if len(dimensions) == 1:
+			dimensions *= 3
+		if len(dimensions) != 3:
+			raise ValueError(f"Grid sizes must be one or three numbers, eg 16 or 16x16x8, got {grid_size}")
+
+		for bool_solver in args.bool_solvers:
+			for export_format in args.formats:
+				runs.append({
+					"name"    : f"grid{grid_size.lower()}_{bool_solver}_{export_format}",
+					"settings": {
+						"tile_dimensions": dimensions,
+						"bool_solver"    : bool_solver,
+						"export_format"  : export_format,
+					},
+				})
+
+	return runs
+
+
+
+# ███████╗ ██████╗███████╗███╗   ██╗███████╗     ██████╗ ███████╗███╗   ██╗███████╗██████╗  █████╗ ████████╗██╗ ██████╗ ███╗   ██╗
+# ██╔════╝██╔════╝██╔════╝████╗  ██║██╔════╝    ██╔════╝ ██╔════╝████╗  ██║██╔════╝██╔══██╗██╔══██╗╚══██╔══╝██║██╔═══██╗████╗  ██║
+# ███████╗██║     █████╗  ██╔██╗ ██║█████╗      ██║  ███╗█████╗  ██╔██╗ ██║█████╗  ██████╔╝███████║   ██║   ██║██║   ██║██╔██╗ ██║
+# ╚════██║██║     ██╔══╝  ██║╚██╗██║██╔══╝      ██║   ██║██╔══╝  ██║╚██╗██║██╔══╝  ██╔══██╗██╔══██║   ██║   ██║██║   ██║██║╚██╗██║
+# ███████║╚██████╗███████╗██║ ╚████║███████╗    ╚██████╔╝███████╗██║ ╚████║███████╗██║  ██║██║  ██║   ██║   ██║╚██████╔╝██║ ╚████║
+# ╚══════╝ ╚═════╝╚══════╝╚═╝  ╚═══╝╚══════╝     ╚═════╝ ╚══════╝╚═╝  ╚═══╝╚══════╝╚═╝  ╚═╝╚═╝  ╚═╝   ╚═╝   ╚═╝ ╚═════╝ ╚═╝  ╚═══╝
+#
+
+def BuildScene(spec: dict) -> bpy.types.Collection:
+	"""
+	Build the synthetic scene in a new BENCHMARK_COLLECTION collection, replacing any left from an
+	earlier benchmark. The same spec always builds the same scene.
+
+	:param spec: The scene spec, see GetSceneSpec.
+	:type spec: dict
+
+	:return: The collection holding the scene.
+	:rtype: bpy.types.Collection
+	"""
+
+	from . collections import DeleteCollection
+
+	old_collection = bpy.data.collections.get(BENCHMARK_COLLECTION)
+	if old_collection:
+		DeleteCollection(old_collection, remove_objects=True)
+
+	collection = bpy.data.collections.new(BENCHMARK_COLLECTION)
+	bpy.context.scene.collection.children.link(collection)
+
+	rng       = random.Random(spec["seed"])
+	materials = GetMaterials()
+	meshes    = CreatePropMeshes(materials)
+
+	for i in range(spec["terrains"]):
+		CreateTerrain(collection, spec, i, rng, materials[0])
+
+	for i in range(spec["props"]):
+		CreateProp(collection, spec, rng, meshes)
+
+	for i in range(spec["hierarchies"]):
+		parent = None
+		for depth in range(spec["hierarchy_depth"]):
+			parent = CreateProp(collection, spec, rng, meshes, parent)
+
+	# Work out the world matrices of the parented objects before their bounds are read
+	bpy.context.view_layer.update()
+
+	return collection
+
+
+def GetMaterials() -> list[bpy.types.Material]:
+	"""
+	Get the materials used by the synthetic scene, creating them the first time.
+
+	:return: The materials, the first is for the terrain.
+	:rtype: list[bpy.types.Material]
+	"""
+
+	colors = [
+		(0.25, 0.45, 0.15, 1.0),
+		(0.60, 0.60, 0.60, 1.0),
+		(0.55, 0.35, 0.20, 1.0),
+		(0.80, 0.20, 0.15, 1.0),
+	]
+
+	materials = []
+	for i, color in enumerate(colors):
+		name     = f"{BENCHMARK_COLLECTION}_{i}"
+		material = bpy.data.materials.get(name) or bpy.data.materials.new(name)
+		material.diffuse_color = color
+		materials.append(material)
+
+	return materials
+
+
+def CreatePropMeshes(materials: list[bpy.types.Material]) -> list[bpy.types.Mesh]:
+	"""
+	Create the meshes shared by the props: a box, a cylinder and a sphere, from a handful of
+	triangles up to a few hundred.
+
+	:param materials: The scene materials, see GetMaterials.
+	:type materials: list[bpy.types.Material]
+
+	:return: The prop meshes.
+	:rtype: list[bpy.types.Mesh]
+	"""
+
+	shapes = [
+		lambda bm: bmesh.ops.create_cube(bm, size=1.0),
+		lambda bm: bmesh.ops.create_cone(bm, cap_ends=True, segments=16, radius1=0.5, radius2=0.5, depth=1.0),
+		lambda bm: bmesh.ops.create_uvsphere(bm, u_segments=24, v_segments=12, radius=0.5),
+	]
+
+	meshes = []
+	for i, shape in enumerate(shapes):
+		bm = bmesh.new()
+		shape(bm)
+
+		mesh = bpy.data.meshes.new(f"{BENCHMARK_COLLECTION}_prop_{i}")
+		bm.to_mesh(mesh)
+		bm.free()
+
+		mesh.materials.append(materials[1 + i % (len(materials) - 1)])
+		meshes.append(mesh)
+
+	return meshes
+
+
+def CreateTerrain(
+	collection: bpy.types.Collection,
+	spec      : dict,
+	index     : int,
+	rng       : random.Random,
+	material  : bpy.types.Material
+) -> bpy.types.Object:
+	"""
+	Create a terrain mesh: a dense grid with rolling hills, covering a strip of the scene. The
+	terrains are laid side by side along X, so each one spans many tiles.
+
+	:param collection: The collection to add it to.
+	:type collection: bpy.types.Collection
+
+	:param spec: The scene spec, see GetSceneSpec.
+	:type spec: dict
+
+	:param index: Which terrain this is, from 0.
+	:type index: int
+
+	:param rng: The random generator for the scene.
+	:type rng: random.Random
+
+	:param material: The terrain material.
+	:type material: bpy.types.Material
+
+	:return: The terrain object.
+	:rtype: bpy.types.Object
+	"""
+
+	size       = spec["size"]
+	resolution = spec["terrain_resolution"]
+	width      = size / spec["terrains"]
+
+	bm = bmesh.new()
+	bmesh.ops.create_grid(bm, x_segments=max(1, resolution // spec["terrains"]), y_segments=resolution, size=1.0)
+
+	mesh = bpy.data.meshes.new(f"{BENCHMARK_COLLECTION}_terrain_{index}")
+	bm.to_mesh(mesh)
+	bm.free()
+
+	# Stretch the grid over the strip and raise the hills, all at once rather than vert by vert
+	co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+	mesh.vertices.foreach_get("co", co)
+	co = co.reshape(-1, 3)
+
+	co[:, 0] = index * width + (co[:, 0] - co[:, 0].min()) / np.ptp(co[:, 0]) * width
+	co[:, 1] = (co[:, 1] - co[:, 1].min()) / np.ptp(co[:, 1]) * size
+
+	height = np.zeros(len(co), dtype=np.float32)
+	for octave in range(4):
+		frequency = (2 ** octave) * 2 * math.pi / size
+		phase_x   = rng.uniform(0, 2 * math.pi)
+		phase_y   = rng.uniform(0, 2 * math.pi)
+		height   += np.sin(co[:, 0] * frequency + phase_x) * np.cos(co[:, 1] * frequency + phase_y) / (2 ** octave)
+
+	co[:, 2] = height * size * 0.02
+
+	mesh.vertices.foreach_set("co", co.ravel())
+	mesh.update()
+	mesh.materials.append(material)
+
+	obj = bpy.data.objects.new(mesh.name, mesh)
+	collection.objects.link(obj)
+
+	return obj
+
+
+def CreateProp(
+	collection: bpy.types.Collection,
+	spec      : dict,
+	rng       : random.Random,
+	meshes    : list[bpy.types.Mesh],
+	parent    : bpy.types.Object = None
+) -> bpy.types.Object:
+	"""
+	Create a prop using one of the shared meshes, with a random position, rotation and scale.
+	Some props get a Bevel or Array modifier, so there's something to evaluate, and arrays make
+	the prop span more tiles.
+
+	:param collection: The collection to add it to.
+	:type collection: bpy.types.Collection
+
+	:param spec: The scene spec, see GetSceneSpec.
+	:type spec: dict
+
+	:param rng: The random generator for the scene.
+	:type rng: random.Random
+
+	:param meshes: The shared prop meshes, see CreatePropMeshes.
+	:type meshes: list[bpy.types.Mesh]
+
+	:param parent: The object to parent it to, placed near it, or None for a prop anywhere in the scene.
+	:type parent: bpy.types.Object
+
+	:return: The prop object.
+	:rtype: bpy.types.Object
+	"""
+
+	size = spec["size"]
+
+	obj = bpy.data.objects.new(f"{BENCHMARK_COLLECTION}_prop", rng.choice(meshes))
+	collection.objects.link(obj)
+
+	if parent:
+		obj.parent   = parent
+		obj.location = (rng.uniform(-2, 2), rng.uniform(-2, 2), rng.uniform(0.5, 2))
+	else:
+		obj.location = (rng.uniform(0, size), rng.uniform(0, size), rng.uniform(0, size * 0.04))
+
+	obj.rotation_euler = (0, 0, rng.uniform(0, 2 * math.pi))
+	obj.scale          = (rng.uniform(0.3, 2),) * 3
+
+	if rng.random() < spec["modifier_ratio"]:
+		if rng.random() < 0.5:
+			mod          = obj.modifiers.new(name="Bevel", type='BEVEL')
+			mod.width    = 0.05
+			mod.segments = 2
+		else:
+			mod                          = obj.modifiers.new(name="Array", type='ARRAY')
+			mod.count                    = rng.randint(2, 6)
+			mod.relative_offset_displace = (1.5, 0, 0)
+
+	return obj
+
+
+def GetSceneStats(collection: bpy.types.Collection, spec: dict, build_time: float) -> dict:
+	"""
+	Describe the built scene for the results file.
+
+	:param collection: The collection holding the scene.
+	:type collection: bpy.types.Collection
+
+	:param spec: The scene spec it was built from.
+	:type spec: dict
+
+	:param build_time: How long building it took, in seconds.
+	:type build_time: float
+
+	:return: The spec, with the object and triangle counts and the build time.
+	:rtype: dict
+	"""
+
+	from . triCounts import GetEvaluatedTriCount
+
+	objects = list(collection.all_objects)
+
+	return dict(
+		spec,
+		objects    = len(objects),
+		tris       = GetEvaluatedTriCount(objects),
+		build_time = round(build_time, 3),
+	)
+
+
+
+# ███╗   ███╗███████╗ █████╗ ███████╗██╗   ██╗██████╗ ███████╗███╗   ███╗███████╗███╗   ██╗████████╗
+# ████╗ ████║██╔════╝██╔══██╗██╔════╝██║   ██║██╔══██╗██╔════╝████╗ ████║██╔════╝████╗  ██║╚══██╔══╝
+# ██╔████╔██║█████╗  ███████║███████╗██║   ██║██████╔╝█████╗  ██╔████╔██║█████╗  ██╔██╗ ██║   ██║
+# ██║╚██╔╝██║██╔══╝  ██╔══██║╚════██║██║   ██║██╔══██╗██╔══╝  ██║╚██╔╝██║██╔══╝  ██║╚██╗██║   ██║
+# ██║ ╚═╝ ██║███████╗██║  ██║███████║╚██████╔╝██║  ██║███████╗██║ ╚═╝ ██║███████╗██║ ╚████║   ██║
+# ╚═╝     ╚═╝╚══════╝╚═╝  ╚═╝╚══════╝ ╚═════╝ ╚═╝  ╚═╝╚══════╝╚═╝     ╚═╝╚══════╝╚═╝  ╚═══╝   ╚═╝
+#
+
+def GetCurrentRss() -> int | None:
+	"""
+	Get how much memory the process is using right now.
+
+	:return: The resident set size in bytes, or None where it can't be read (only Linux is supported).
+	:rtype: int | None
+	"""
+
+	try:
+		with open("/proc/self/statm", "r") as file:
+			return int(file.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+	except (OSError, ValueError, AttributeError):
+		return None
+
+
+def GetProcessPeakRss() -> int | None:
+	"""
+	Get the most memory the process has used since it started.
+
+	:return: The peak resident set size in bytes, or None where it isn't available.
+	:rtype: int | None
+	"""
+
+	if resource is None:
+		return None
+
+	# Linux reports kilobytes, macOS bytes
+	peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+	return peak if sys.platform == "darwin" else peak * 1024
+
+
+class RssSampler:
+	"""
+	Tracks the peak memory use during a run by sampling it on a background thread. The process
+	peak can't be used as it never goes down, so every run after the biggest would report the
+	same figure. Where the current memory use can't be read, the process peak is used anyway.
+	"""
+
+	def __init__(self):
+		self.peak   = 0
+		self.stop   = threading.Event()
+		self.thread = None
+
+
+	def Start(self):
+		"""
+		Start sampling.
+		"""
+
+		self.peak = GetCurrentRss() or 0
+		self.stop.clear()
+
+		if self.peak:
+			self.thread = threading.Thread(target=self.Run, name="SceneSlicerRss", daemon=True)
+			self.thread.start()
+
+
+	def Run(self):
+		"""
+		Sample the memory use every RSS_SAMPLE_INTERVAL seconds until stopped.
+		"""
+
+		while not self.stop.wait(RSS_SAMPLE_INTERVAL):
+			self.peak = max(self.peak, GetCurrentRss() or 0)
+
+
+	def Stop(self) -> tuple[int | None, str]:
+		"""
+		Stop sampling.
+
+		:return: The peak memory use in bytes, and whether it was "sampled" during the run or is the "process" peak.
+		:rtype: tuple[int | None, str]
+		"""
+
+		if not self.thread:
+			return GetProcessPeakRss(), "process"
+
+		self.stop.set()
+		self.thread.join()
+		self.thread = None
+
+		return max(self.peak, GetCurrentRss() or 0), "sampled"
+
+
+def GetOutputSize(folder: str) -> int:
+	"""
+	Get the total size of the files exported to a folder, leaving out the profile and log files.
+
+	:param folder: The output folder.
+	:type folder: str
+
+	:return: The total size in bytes.
+	:rtype: int
+	"""
+
+	size = 0
+	for root, dirs, files in os.walk(folder):
+		for file_name in files:
+			if not file_name.startswith(MEASURE_EXCLUDE):
+				size += os.path.getsize(os.path.join(root, file_name))
+
+	return size
+
+
+def GetStageTimes(folder: str) -> dict[str, dict]:
+	"""
+	Read the time spent in each stage from the profile summary written by the run.
+
+	:param folder: The output folder.
+	:type folder: str
+
+	:return: Maps each stage to its count and self time in milliseconds, empty if there's no profile.
+	:rtype: dict[str, dict]
+	"""
+
+	from . profiler import PROFILE_SUMMARY_NAME
+
+	try:
+		with open(os.path.join(folder, PROFILE_SUMMARY_NAME), "r") as file:
+			summary = json.load(file)
+	except (OSError, ValueError):
+		return {}
+
+	return {name: {"count": stage["count"], "self_ms": stage["self_ms"]} for name, stage in summary.items()}
+
+
+
+# ██████╗ ██╗   ██╗███╗   ██╗███████╗
+# ██╔══██╗██║   ██║████╗  ██║██╔════╝
+# ██████╔╝██║   ██║██╔██╗ ██║███████╗
+# ██╔══██╗██║   ██║██║╚██╗██║╚════██║
+# ██║  ██║╚██████╔╝██║ ╚████║███████║
+# ╚═╝  ╚═╝ ╚═════╝ ╚═╝  ╚═══╝╚══════╝
+#
+
+def RunConfiguration(
+	collection   : bpy.types.Collection,
+	run          : dict,
+	base_settings: dict,
+	output_root  : str,
+	repeat       : int
+) -> dict:
+	"""
+	Export the scene with one combination of settings, repeat times, and measure it.
+
+	Each export goes to an empty folder, with incremental export off so every tile is exported,
+	and with the profiler on for the per-stage times. The repeat with the median time is kept.
+
+	:param collection: The collection holding the scene.
+	:type collection: bpy.types.Collection
+
+	:param run: The run, see GetRunMatrix.
+	:type run: dict
+
+	:param base_settings: Settings applied before the run's own, from --set.
+	:type base_settings: dict
+
+	:param output_root: The folder to export to, the run gets its own subfolder.
+	:type output_root: str
+
+	:param repeat: How many times to export.
+	:type repeat: int
+
+	:return: The run's name, settings and status, and its time, tiles per second, per-stage times, peak memory use and output size.
+	:rtype: dict
+	"""
+
+	from . headless import ApplySettings
+	from . logging  import Log, LogError, LogReset
+	from . session  import SliceSession
+
+	# Get scene slicer settings
+	ss_settings = bpy.context.scene.ss_settings
+	output_path = os.path.join(output_root, run["name"])
+
+	ApplySettings(ss_settings, base_settings)
+	ApplySettings(ss_settings, dict(
+		run["settings"],
+		export_collection  = collection.name,
+		output_path        = output_path + os.sep,
+		incremental_export = False,
+		use_profiler       = True,
+	))
+
+	samples = []
+	sampler = RssSampler()
+
+	for attempt in range(repeat):
+		shutil.rmtree(output_path, ignore_errors=True)
+		os.makedirs(output_path)
+
+		LogReset()
+		Log("Benchmark run", run["name"], f"({attempt + 1} of {repeat})")
+
+		sampler.Start()
+		time_start = time.perf_counter()
+
+		session = SliceSession(collection, use_checkpoint=False)
+		try:
+			session.Begin()
+			session.Step()
+			summary = session.Finish()
+		except Exception as e:
+			LogError(traceback.format_exc())
+			session.Cleanup()
+			summary = session.GetSummary("FAILED")
+			summary["error"] = str(e)
+
+		time_taken        = time.perf_counter() - time_start
+		peak_rss, source  = sampler.Stop()
+
+		samples.append({
+			"status"        : summary["status"],
+			"error"         : summary.get("error"),
+			"tiles_exported": summary["tiles_exported"],
+			"time"          : round(time_taken, 3),
+			"tiles_per_sec" : round(summary["tiles_exported"] / time_taken, 3) if time_taken > 0 else None,
+			"stages"        : GetStageTimes(output_path),
+			"peak_rss"      : peak_rss,
+			"peak_rss_type" : source,
+			"output_bytes"  : GetOutputSize(output_path),
+		})
+
+		if summary["status"] != "FINISHED":
+			break
+
+	# Keep the median run, and every time so the spread can be seen
+	times  = [sample["time"] for sample in samples]
+	result = min(samples, key=lambda sample: abs(sample["time"] - statistics.median(times)))
+
+	return dict(result, name=run["name"], settings=run["settings"], times=times)
+
+
+
+# ██████╗  █████╗ ███████╗███████╗██╗     ██╗███╗   ██╗███████╗
+# ██╔══██╗██╔══██╗██╔════╝██╔════╝██║     ██║████╗  ██║██╔════╝
+# ██████╔╝███████║███████╗█████╗  ██║     ██║██╔██╗ ██║█████╗
+# ██╔══██╗██╔══██║╚════██║██╔══╝  ██║     ██║██║╚██╗██║██╔══╝
+# ██████╔╝██║  ██║███████║███████╗███████╗██║██║ ╚████║███████╗
+# ╚═════╝ ╚═╝  ╚═╝╚══════╝╚══════╝╚══════╝╚═╝╚═╝  ╚═══╝╚══════╝
+#
+
+def CompareToBaseline(results: dict, baseline: dict, threshold: float) -> dict:
+	"""
+	Compare the runs against those with the same name in a baseline results file.
+
+	:param results: The results of this benchmark.
+	:type results: dict
+
+	:param baseline: The results of an earlier benchmark.
+	:type baseline: dict
+
+	:param threshold: How much worse a metric can get, as a ratio, before it counts as a regression.
+	:type threshold: float
+
+	:return: The comparison: for each run and metric, the baseline and new values, the change as a ratio and whether it regressed, plus a list of "regressions".
+	:rtype: dict
+	"""
+
+	from . logging import Log, LogWarning
+
+	baseline_scene = baseline.get("scene", {})
+	if any(baseline_scene.get(key) != results["scene"].get(key) for key in ("preset", "seed", "objects", "tris")):
+		LogWarning("The baseline was run on a different scene, so the comparison may not mean much")
+
+	baseline_runs = {run["name"]: run for run in baseline.get("runs", [])}
+	comparison    = {"threshold": threshold, "runs": {}, "regressions": []}
+
+	Log("-----------------------------------------------------")
+	Log(f"{'run':<36} {'metric':<14} {'baseline':>14} {'value':>14} {'change':>9}")
+
+	for run in results["runs"]:
+		base = baseline_runs.get(run["name"])
+		if not base or base.get("status") != "FINISHED" or run["status"] != "FINISHED":
+			continue
+
+		metrics = {}
+		for metric, higher_is_better in COMPARE_METRICS.items():
+			value      = run.get(metric)
+			base_value = base.get(metric)
+			if not value or not base_value:
+				continue
+
+			change    = (value - base_value) / base_value
+			regressed = change < -threshold if higher_is_better else change > threshold
+
+			metrics[metric] = {
+				"baseline" : base_value,
+				"value"    : value,
+				"change"   : round(change, 4),
+				"regressed": regressed,
+			}
+
+			if regressed:
+				comparison["regressions"].append(f"{run['name']}: {metric}")
+
+			Log(f"{run['name']:<36} {metric:<14} {base_value:>14} {value:>14} {change:>+9.1%}{'  REGRESSED' if regressed else ''}")
+
+		comparison["runs"][run["name"]] = metrics
+
+	missing = [run["name"] for run in results["runs"] if run["name"] not in baseline_runs]
+	if missing:
+		Log("Not in the baseline:", ", ".join(missing))
+
+	return comparison
+
+
+
+# ██████╗ ███████╗███╗   ██╗ ██████╗██╗  ██╗███╗   ███╗ █████╗ ██████╗ ██╗  ██╗
+# ██╔══██╗██╔════╝████╗  ██║██╔════╝██║  ██║████╗ ████║██╔══██╗██╔══██╗██║ ██╔╝
+# ██████╔╝█████╗  ██╔██╗ ██║██║     ███████║██╔████╔██║███████║██████╔╝█████╔╝
+# ██╔══██╗██╔══╝  ██║╚██╗██║██║     ██╔══██║██║╚██╔╝██║██╔══██║██╔══██╗██╔═██╗
+# ██████╔╝███████╗██║ ╚████║╚██████╗██║  ██║██║ ╚═╝ ██║██║  ██║██║  ██║██║  ██╗
+# ╚═════╝ ╚══════╝╚═╝  ╚═══╝ ╚═════╝╚═╝  ╚═╝╚═╝     ╚═╝╚═╝  ╚═╝╚═╝  ╚═╝╚═╝  ╚═╝
+#
+
+def RunBenchmark(argv: list) -> int:
+	"""
+	Build the synthetic scene, export it with every combination of settings, write the results
+	and compare them against the baseline.
+
+	:param argv: The script arguments, see GetScriptArgs in headless.py.
+	:type argv: list[str]
+
+	:return: The exit code, one of EXIT_OK, EXIT_FAILED or EXIT_BAD_ARGS from headless.py.
+	:rtype: int
+	"""
+
+	from . import bl_info
+	from . headless import EXIT_BAD_ARGS, EXIT_FAILED, EXIT_OK, ParseSettingValues
+	from . logging  import Log, LogError, LogFlush
+
+	args = ParseArgs(argv)
+
+	try:
+		spec          = GetSceneSpec(args)
+		runs          = GetRunMatrix(args)
+		base_settings = ParseSettingValues(args.set)
+
+		baseline = None
+		if args.baseline:
+			with open(args.baseline, "r") as file:
+				baseline = json.load(file)
+
+	except (OSError, ValueError) as e:
+		LogError(e)
+		LogFlush()
+		return EXIT_BAD_ARGS
+
+	output_root  = os.path.abspath(args.output)
+	results_path = args.results or os.path.join(output_root, RESULTS_NAME)
+	os.makedirs(output_root, exist_ok=True)
+
+	Log("#------------------------------------------------#")
+	Log("#      Benchmarking the scene slicer             #")
+	Log("#------------------------------------------------#")
+
+	time_start = time.perf_counter()
+	collection = BuildScene(spec)
+	scene      = GetSceneStats(collection, spec, time.perf_counter() - time_start)
+
+	Log("Built the", spec["preset"], "scene:", scene["objects"], "objects,", scene["tris"], "tris, in", scene["build_time"], "s")
+
+	results = {
+		"version"  : RESULTS_VERSION,
+		"addon"    : ".".join(map(str, bl_info["version"])),
+		"blender"  : bpy.app.version_string,
+		"platform" : platform.platform(),
+		"python"   : platform.python_version(),
+		"date"     : time.strftime("%Y-%m-%dT%H:%M:%S"),
+		"scene"    : scene,
+		"settings" : base_settings,
+		"runs"     : [],
+	}
+
+	for run in runs:
+		try:
+			result = RunConfiguration(collection, run, base_settings, output_root, max(1, args.repeat))
+		except ValueError as e:
+			# An invalid setting, eg a bool solver that doesn't exist
+			LogError(e)
+			LogFlush()
+			return EXIT_BAD_ARGS
+
+		results["runs"].append(result)
+		Log(run["name"], "-", result["status"], "in", result["time"], "s,", result["tiles_per_sec"], "tiles/s")
+
+	if baseline:
+		results["comparison"] = CompareToBaseline(results, baseline, args.threshold)
+
+	with open(results_path, "w") as file:
+		json.dump(results, file, indent="\t")
+
+	failed      = [run["name"] for run in results["runs"] if run["status"] != "FINISHED"]
+	regressions = results.get("comparison", {}).get("regressions", [])
+
+	if failed:
+		LogError("Runs that failed:", ", ".join(failed))
+	if regressions:
+		LogError("Regressions against the baseline:", ", ".join(regressions))
+
+	LogFlush()
+	print(RESULTS_PREFIX, results_path, flush=True)
+
+	return EXIT_FAILED if failed or regressions else EXIT_OK
+
+
+
+# ██████╗  ██████╗  ██████╗ ████████╗███████╗████████╗██████╗  █████╗ ██████╗
+# ██╔══██╗██╔═══██╗██╔═══██╗╚══██╔══╝██╔════╝╚══██╔══╝██╔══██╗██╔══██╗██╔══██╗
+# ██████╔╝██║   ██║██║   ██║   ██║   ███████╗   ██║   ██████╔╝███████║██████╔╝
+# ██╔══██╗██║   ██║██║   ██║   ██║   ╚════██║   ██║   ██╔══██╗██╔══██║██╔═══╝
+# ██████╔╝╚██████╔╝╚██████╔╝   ██║   ███████║   ██║   ██║  ██║██║  ██║██║
+# ╚═════╝  ╚═════╝  ╚═════╝    ╚═╝   ╚══════╝   ╚═╝   ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝
+#
+
+if __name__ == "__main__":
+	# When run with --python this file isn't part of the addon package, so import the package from
+	# the folder it lives in and hand over to the copy of this module inside it
+	addon_dir = os.path.dirname(os.path.abspath(__file__))
+	sys.path.insert(0, os.path.dirname(addon_dir))
+
+	addon = importlib.import_module(os.path.basename(addon_dir))
+
+	# The addon won't be registered if it isn't enabled in the user preferences
+	if not hasattr(bpy.types.Scene, "ss_settings"):
+		addon.register()
+
+	headless  = importlib.import_module(addon.__name__ + ".headless")
+	benchmark = importlib.import_module(addon.__name__ + ".benchmark")
+	sys.exit(benchmark.RunBenchmark(headless.GetScriptArgs()))
@@ -75,3 +75,50 @@ def RemoveBrokenBooleans(obj):
 		if modifier.type == 'BOOLEAN' and modifier.operation == 'INTERSECT' and modifier.object == None:
 			obj.modifiers.remove(modifier)
 			break
+
+
+
+#  ██████╗██╗   ██╗████████╗████████╗███████╗██████╗     ██████╗ ██╗███╗   ██╗██████╗ ██╗███╗   ██╗ ██████╗
+# ██╔════╝██║   ██║╚══██╔══╝╚══██╔══╝██╔════╝██╔══██╗    ██╔══██╗██║████╗  ██║██╔══██╗██║████╗  ██║██╔════╝
+# ██║     ██║   ██║   ██║      ██║   █████╗  ██████╔╝    ██████╔╝██║██╔██╗ ██║██║  ██║██║██╔██╗ ██║██║  ███╗
+# ██║     ██║   ██║   ██║      ██║   ██╔══╝  ██╔══██╗    ██╔══██╗██║██║╚██╗██║██║  ██║██║██║╚██╗██║██║   ██║
+# ╚██████╗╚██████╔╝   ██║      ██║   ███████╗██║  ██║    ██████╔╝██║██║ ╚████║██████╔╝██║██║ ╚████║╚██████╔╝
+#  ╚═════╝ ╚═════╝    ╚═╝      ╚═╝   ╚══════╝╚═╝  ╚═╝    ╚═════╝ ╚═╝╚═╝  ╚═══╝╚═════╝ ╚═╝╚═╝  ╚═══╝ ╚═════╝
+#
+
+def BindCutter(
+	objects      : list[bpy.types.Object],
+	cutter       : bpy.types.Object,
+	bound_objects: set[bpy.types.Object]
+) -> set[bpy.types.Object]:
+	"""
+	Ensure only the given objects have an INTERSECT boolean using the cutter.
+
+	Every object with a boolean pointing at the cutter depends on it in the depsgraph, so moving
+	the cutter re-evaluates all of them. Binding only the objects in the current tile keeps the
+	cost of each move proportional to the tile, not to the whole collection.
+
+	:param objects: The objects that should have the boolean, usually the objects in the current tile.
+	:type objects: list[bpy.types.Object]
+
+	:param cutter: The object to be set as the target for the boolean modifier.
+	:type cutter: bpy.types.Object
+
+	:param bound_objects: The objects currently bound to the cutter, as returned by the last call.
+	:type bound_objects: set[bpy.types.Object]
+
+	:return: The set of objects now bound to the cutter.
+	:rtype: set[bpy.types.Object]
+	"""
+
+	objects = {obj for obj in objects if obj.type == 'MESH'}
+
+	# Detach the boolean from objects that are no longer in the tile
+	for obj in bound_objects - objects:
+		RemoveIntersectBooleans(obj, cutter)
+
+	# Attach it to objects that have just entered the tile
+	for obj in objects - bound_objects:
+		AddIntersectBooleans(obj, cutter)
+
+	return objects
@@ -1,10 +1,9 @@
 import bpy
+import numpy as np
 
 from mathutils 	import Vector
 from typing 	import Optional
 
-from . logging 	import Log
-
 ROUNDING_PRECISION = 4
 
 def custom_round(number, decimal_places):
@@ -77,6 +76,68 @@ def GetObjectsWithinBounds(
 
 
 
+# ██████╗  ██████╗ ██╗   ██╗███╗   ██╗██████╗ ███████╗    ██████╗  █████╗ ████████╗ █████╗
+# ██╔══██╗██╔═══██╗██║   ██║████╗  ██║██╔══██╗██╔════╝    ██╔══██╗██╔══██╗╚══██╔══╝██╔══██╗
+# ██████╔╝██║   ██║██║   ██║██╔██╗ ██║██║  ██║███████╗    ██║  ██║███████║   ██║   ███████║
+# ██╔══██╗██║   ██║██║   ██║██║╚██╗██║██║  ██║╚════██║    ██║  ██║██╔══██║   ██║   ██╔══██║
+# ██████╔╝╚██████╔╝╚██████╔╝██║ ╚████║██████╔╝███████║    ██████╔╝██║  ██║   ██║   ██║  ██║
+# ╚═════╝  ╚═════╝  ╚═════╝ ╚═╝  ╚═══╝╚═════╝ ╚══════╝    ╚═════╝ ╚═╝  ╚═╝   ╚═╝   ╚═╝  ╚═╝
+#
+
+def GetCollectionBoundsData(col: bpy.types.Collection) -> dict[str, object]:
+	"""
+	Get the world-space bounds of every object in a collection in a single batched pass.
+
+	The matrix_world and bound_box of all objects are read into NumPy arrays with one
+	foreach_get each, and all bounding box corners are transformed in a single matmul.
+	The result feeds both GetCollectionBounds and GetCollectionObjectBounds, so the
+	collection only needs to be walked once per export.
+
+	:param col: The Blender collection containing objects.
+	:type col: bpy.types.Collection
+
+	:return: A dictionary with the following keys:
+		- "objects"   : List of the objects in the collection, in all_objects order.
+		- "bounds_min": (n, 3) array of rounded minimum world-space bounds, one row per object.
+		- "bounds_max": (n, 3) array of rounded maximum world-space bounds, one row per object.
+	:rtype: dict[str, object]
+	"""
+
+	objects = list(col.all_objects)
+	count   = len(objects)
+
+	matrices = np.empty(count * 16, dtype=np.float32)
+	corners  = np.empty(count * 24, dtype=np.float32)
+
+	if count > 0:
+		try:
+			col.all_objects.foreach_get("matrix_world", matrices)
+			col.all_objects.foreach_get("bound_box", corners)
+		except (TypeError, RuntimeError):
+			# Fall back to reading the objects one at a time
+			for i, obj in enumerate(objects):
+				matrices[i * 16:(i + 1) * 16] = [value for column in obj.matrix_world.col for value in column]
+				corners[i * 24:(i + 1) * 24]  = [value for corner in obj.bound_box for value in corner]
+
+	# foreach_get returns matrices in column-major order, so each (4, 4) block is already the
+	# transpose of matrix_world. Multiplying row vectors by it gives the world-space corners
+	matrices = matrices.reshape(count, 4, 4).astype(np.float64)
+	corners  = corners.reshape(count, 8, 3).astype(np.float64)
+	corners  = np.concatenate((corners, np.ones((count, 8, 1))), axis=2)
+
+	world_corners = np.matmul(corners, matrices)[:, :, :3]
+
+	# Rounding is monotonic, so rounding the min/max is the same as rounding each corner first
+	factor = 10 ** ROUNDING_PRECISION
+
+	return {
+		"objects"   : objects,
+		"bounds_min": np.round(world_corners.min(axis=1, initial=np.inf) * factor) / factor,
+		"bounds_max": np.round(world_corners.max(axis=1, initial=-np.inf) * factor) / factor,
+	}
+
+
+
 #  ██████╗ ███████╗████████╗    ██████╗  ██████╗ ██╗   ██╗███╗   ██╗██████╗ ███████╗
 # ██╔════╝ ██╔════╝╚══██╔══╝    ██╔══██╗██╔═══██╗██║   ██║████╗  ██║██╔══██╗██╔════╝
 # ██║  ███╗█████╗     ██║       ██████╔╝██║   ██║██║   ██║██╔██╗ ██║██║  ██║███████╗
@@ -118,7 +179,10 @@ def GetObjectBounds(obj: object) -> tuple[
 	return min_xyz, max_xyz
 
 
-def GetCollectionObjectBounds(col: bpy.types.Collection) -> dict[
+def GetCollectionObjectBounds(
+		col        : bpy.types.Collection,
+		bounds_data: Optional[dict[str, object]] = None
+	) -> dict[
 		bpy.types.Object, 
 		tuple[
 			tuple[float, float, float], 
@@ -131,6 +195,9 @@ def GetCollectionObjectBounds(col: bpy.types.Collection) -> dict[
 	:param col: The Blender collection containing objects.
 	:type col: bpy.types.Collection
 
+	:param bounds_data: Optional pre-computed bounds, as returned by GetCollectionBoundsData.
+	:type bounds_data: dict[str, object]
+
 	:return: A dictionary mapping objects to their min and max bounding box coordinates.
 	:rtype: Dict[
 				bpy.types.Object, 
@@ -144,20 +211,30 @@ def GetCollectionObjectBounds(col: bpy.types.Collection) -> dict[
 	# Get scene slicer settings
 	ss_settings = bpy.context.scene.ss_settings
 
+	# Read the bounds of the whole collection in one pass, unless we've been given them already
+	if bounds_data is None:
+		bounds_data = GetCollectionBoundsData(col)
+
+	bounds_min = bounds_data["bounds_min"].tolist()
+	bounds_max = bounds_data["bounds_max"].tolist()
+
 	# Blank dict to store the results
 	object_bounds = {}
 	
-	# Get the bounds for each object in the collection and store it with the object reference as the key
-	for obj in col.all_objects:
+	# Store the bounds of each object in the collection with the object reference as the key
+	for i, obj in enumerate(bounds_data["objects"]):
 		if ss_settings.skip_colliders and obj.name.endswith("_collider"):
 			continue
 
-		object_bounds[obj] = GetObjectBounds(obj)
+		object_bounds[obj] = (bounds_min[i], bounds_max[i])
 	
 	return object_bounds
 
 
-def GetCollectionBounds(col: bpy.types.Collection) -> tuple[
+def GetCollectionBounds(
+		col        : bpy.types.Collection,
+		bounds_data: Optional[dict[str, object]] = None
+	) -> tuple[
 		tuple[float, float, float], 
 		tuple[float, float, float], 
 		tuple[float, float, float]
@@ -167,34 +244,23 @@ def GetCollectionBounds(col: bpy.types.Collection) -> tuple[
 
 	:param col: The Blender collection containing objects.
 	:type col: bpy.types.Collection
+	:param bounds_data: Optional pre-computed bounds, as returned by GetCollectionBoundsData.
+	:type bounds_data: dict[str, object]
 	:return: A tuple containing the minimum bounds, maximum bounds, and center of mass.
 	:rtype: Tuple[Tuple[float, float, float], Tuple[float, float, float], Tuple[float, float, float]]
 	"""
 
-	# Start with some min and max values
+	# Read the bounds of the whole collection in one pass, unless we've been given them already
+	if bounds_data is None:
+		bounds_data = GetCollectionBoundsData(col)
+
+	# Start with some min and max values, used as-is if the collection is empty
 	min_xyz = [ float('inf'),  float('inf'),  float('inf')]
 	max_xyz = [-float('inf'), -float('inf'), -float('inf')]
 
-	## Loop through all the objects in the collection and their bounding boxes
-	for obj in col.all_objects:
-
-		# Check each bounding box corner, in world space
-		for v in obj.bound_box:
-			v_world = obj.matrix_world @ Vector((v[0], v[1], v[2]))
-
-			# check if the obj bounds are lower than the current lowest
-			if v_world[2] < min_xyz[2]:
-				Log("New lowest object found at ", v_world[2], obj.name)
-				
-				# Move the 3d cursor to the lowest point
-				bpy.context.scene.cursor.location = v_world
-				pass
-			
-			# Update min/max for each axis
-			for i in range(3):
-
-				min_xyz[i] = min(min_xyz[i], custom_round(v_world[i], ROUNDING_PRECISION))
-				max_xyz[i] = max(max_xyz[i], custom_round(v_world[i], ROUNDING_PRECISION))
+	if len(bounds_data["objects"]) > 0:
+		min_xyz = bounds_data["bounds_min"].min(axis=0).tolist()
+		max_xyz = bounds_data["bounds_max"].max(axis=0).tolist()
 
 	center_of_mass = [
 		round(((max_xyz[i] - min_xyz[i]) / 2 ) + min_xyz[i], ROUNDING_PRECISION)
@@ -202,4 +268,3 @@ def GetCollectionBounds(col: bpy.types.Collection) -> tuple[
 	]
 
 	return min_xyz, max_xyz, center_of_mass
-	
\ No newline at end of file
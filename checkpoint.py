@@ -0,0 +1,280 @@
+import bpy
+import hashlib
+import json
+import os
+
+from . export		import GetExportPath
+from . incremental	import GetSettingsFingerprint
+from . logging		import Log, LogWarning
+
+
+
+#  ██████╗ ██████╗ ███╗   ██╗███████╗████████╗ █████╗ ███╗   ██╗████████╗███████╗
+# ██╔════╝██╔═══██╗████╗  ██║██╔════╝╚══██╔══╝██╔══██╗████╗  ██║╚══██╔══╝██╔════╝
+# ██║     ██║   ██║██╔██╗ ██║███████╗   ██║   ███████║██╔██╗ ██║   ██║   ███████╗
+# ██║     ██║   ██║██║╚██╗██║╚════██║   ██║   ██╔══██║██║╚██╗██║   ██║   ╚════██║
+# ╚██████╗╚██████╔╝██║ ╚████║███████║   ██║   ██║  ██║██║ ╚████║   ██║   ███████║
+#  ╚═════╝ ╚═════╝ ╚═╝  ╚═══╝╚══════╝   ╚═╝   ╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝   ╚══════╝
+#
+
+CHECKPOINT_NAME    = "tileset.checkpoint"
+CHECKPOINT_VERSION = 1
+
+
+
+# ███████╗██╗██╗     ███████╗███████╗
+# ██╔════╝██║██║     ██╔════╝██╔════╝
+# █████╗  ██║██║     █████╗  ███████╗
+# ██╔══╝  ██║██║     ██╔══╝  ╚════██║
+# ██║     ██║███████╗███████╗███████║
+# ╚═╝     ╚═╝╚══════╝╚══════╝╚══════╝
+#
+
+def GetCheckpointPath() -> str:
+	"""
+	Get the path of the checkpoint file for the current output folder. Unlike GetExportPath this
+	doesn't create the folder, so it's safe to call while drawing the UI.
+
+	:return: The checkpoint file path.
+	:rtype: str
+	"""
+
+	# Get scene slicer settings
+	ss_settings = bpy.context.scene.ss_settings
+
+	return os.path.normpath(os.path.join(bpy.path.abspath(ss_settings.output_path), CHECKPOINT_NAME))
+
+
+def GetTileFiles(src: str) -> list[str]:
+	"""
+	Get the files a tile is written to, for the current export format. Textures aren't included
+	as they're shared between tiles.
+
+	:param src: The tile's glTF file name, without an extension.
+	:type src: str
+
+	:return: The file names, relative to the output folder.
+	:rtype: list[str]
+	"""
+
+	# Get scene slicer settings
+	ss_settings = bpy.context.scene.ss_settings
+
+	if ss_settings.export_format == "GLB":
+		return [src + ".glb"]
+
+	return [src + ".gltf", src + ".bin"]
+
+
+def GetFileDigest(file_path: str) -> str:
+	"""
+	Get the SHA-1 digest of a file, read in chunks so large tiles aren't loaded all at once.
+
+	:param file_path: The file to hash.
+	:type file_path: str
+
+	:return: The digest, as hex.
+	:rtype: str
+	"""
+
+	hasher = hashlib.sha1()
+	with open(file_path, "rb") as file:
+		for chunk in iter(lambda: file.read(1024 * 1024), b""):
+			hasher.update(chunk)
+
+	return hasher.hexdigest()
+
+
+
+#  ██████╗██╗  ██╗███████╗ ██████╗██╗  ██╗██████╗  ██████╗ ██╗███╗   ██╗████████╗
+# ██╔════╝██║  ██║██╔════╝██╔════╝██║ ██╔╝██╔══██╗██╔═══██╗██║████╗  ██║╚══██╔══╝
+# ██║     ███████║█████╗  ██║     █████╔╝ ██████╔╝██║   ██║██║██╔██╗ ██║   ██║
+# ██║     ██╔══██║██╔══╝  ██║     ██╔═██╗ ██╔═══╝ ██║   ██║██║██║╚██╗██║   ██║
+# ╚██████╗██║  ██║███████╗╚██████╗██║  ██╗██║     ╚██████╔╝██║██║ ╚████║   ██║
+#  ╚═════╝╚═╝  ╚═╝╚══════╝ ╚═════╝╚═╝  ╚═╝╚═╝      ╚═════╝ ╚═╝╚═╝  ╚═══╝   ╚═╝
+#
+
+class ExportCheckpoint:
+	"""
+	Records each completed tile to a checkpoint file in the output folder as the export goes, so
+	an export that was cancelled or crashed can be resumed without redoing finished tiles.
+
+	The file is JSON-lines: a header describing the export, then one line per completed tile
+	with its src and the size and digest of each file written for it. Lines are flushed to disk
+	as they're written, so at most the tile in progress is lost.
+
+	:param collection: The collection being sliced.
+	:type collection: bpy.types.Collection
+
+	:param tileset_data: The tileset data, as returned by CreateTilesetFromCollection.
+	:type tileset_data: dict
+	"""
+
+	def __init__(self, collection: bpy.types.Collection, tileset_data: dict):
+		# Get scene slicer settings
+		ss_settings = bpy.context.scene.ss_settings
+
+		self.path   = GetExportPath(CHECKPOINT_NAME)
+		self.header = {
+			"version"        : CHECKPOINT_VERSION,
+			"collection"     : collection.name,
+			"settings"       : GetSettingsFingerprint(ss_settings),
+			"tileset_size"   : tileset_data["tileset_size"],
+			"tileset_origin" : tileset_data["tileset_origin"],
+			"tile_dimensions": tileset_data["tile_dimensions"],
+		}
+		self.file = None
+
+
+	def Start(self):
+		"""
+		Start a new checkpoint, replacing any previous one.
+		"""
+
+		self.file = open(self.path, "w")
+		self.WriteLine(self.header)
+
+
+	def Resume(self) -> dict:
+		"""
+		Read the tiles completed by a previous export and carry on recording after them. Tiles
+		whose files are missing or don't match their recorded size and digest are left out, so
+		they're exported again. If the checkpoint is missing or from a different export, a new
+		one is started.
+
+		:return: Maps the indexes of intact completed tiles to their src, or None if the tile was skipped, and their LODs.
+		:rtype: dict[tuple[int, int, int], tuple[str, list[dict]]]
+		"""
+
+		completed = {}
+
+		lines = []
+		if os.path.exists(self.path):
+			with open(self.path, "r") as file:
+				lines = file.readlines()
+
+		try:
+			header = json.loads(lines[0]) if lines else None
+		except json.JSONDecodeError:
+			header = None
+
+		if header != json.loads(json.dumps(self.header)):
+			Log("No matching checkpoint found, starting the export from the beginning")
+			self.Start()
+			return completed
+
+		for line in lines[1:]:
+			# Ignore a partly written line from an export that died mid-write
+			try:
+				tile = json.loads(line)
+			except json.JSONDecodeError:
+				continue
+
+			if self.IsTileIntact(tile):
+				completed[tuple(tile["index"])] = tile
+			else:
+				LogWarning("Tile", tile["src"], "is missing or damaged, it will be exported again")
+
+		# Rewrite the checkpoint with only the intact tiles, dropping any damaged line at the end.
+		# It's written beside the old one and swapped in, so a crash here doesn't lose anything
+		temp_path = self.path + ".tmp"
+		with open(temp_path, "w") as file:
+			for data in [self.header] + list(completed.values()):
+				file.write(json.dumps(data) + "\n")
+		os.replace(temp_path, self.path)
+
+		self.file = open(self.path, "a")
+
+		Log("Resuming export,", len(completed), "tiles already completed")
+		return {tile_index: (tile["src"], tile.get("lods")) for tile_index, tile in completed.items()}
+
+
+	def IsTileIntact(self, tile: dict) -> bool:
+		"""
+		Check a completed tile's files are still there and unchanged.
+
+		:param tile: The tile's checkpoint entry.
+		:type tile: dict
+
+		:return: True if every file matches its recorded size and digest.
+		:rtype: bool
+		"""
+
+		for file_name, info in tile["files"].items():
+			file_path = GetExportPath(file_name)
+
+			if not os.path.exists(file_path) or os.path.getsize(file_path) != info["size"]:
+				return False
+			if GetFileDigest(file_path) != info["sha1"]:
+				return False
+
+		return True
+
+
+	def Record(self, tile_index: tuple[int, int, int], src: str, lods: list[dict] = None):
+		"""
+		Record a completed tile, along with the size and digest of its files.
+
+		:param tile_index: The index of the tile.
+		:type tile_index: tuple[int, int, int]
+
+		:param src: The tile's glTF file name, or None if the tile was skipped.
+		:type src: str
+
+		:param lods: The tile's LOD levels, as returned by ExportTileLods, or None if LODs are disabled.
+		:type lods: list[dict]
+		"""
+
+		# The LOD files are checked on resume too, the first level is the tile itself
+		sources = [lod["src"] for lod in lods] if lods else [src]
+
+		files = {}
+		for tile_src in sources:
+			if not tile_src:
+				continue
+
+			for file_name in GetTileFiles(tile_src):
+				file_path = GetExportPath(file_name)
+				files[file_name] = {
+					"size": os.path.getsize(file_path),
+					"sha1": GetFileDigest(file_path),
+				}
+
+		line = {"index": list(tile_index), "src": src, "files": files}
+		if lods:
+			line["lods"] = lods
+
+		self.WriteLine(line)
+
+
+	def WriteLine(self, data: dict):
+		"""
+		Append a line to the checkpoint and make sure it reaches the disk.
+
+		:param data: The data to write.
+		:type data: dict
+		"""
+
+		self.file.write(json.dumps(data) + "\n")
+		self.file.flush()
+		os.fsync(self.file.fileno())
+
+
+	def Close(self):
+		"""
+		Close the checkpoint file, leaving it in place to resume from.
+		"""
+
+		if self.file:
+			self.file.close()
+			self.file = None
+
+
+	def Remove(self):
+		"""
+		Close and delete the checkpoint, once the export has finished.
+		"""
+
+		self.Close()
+		if os.path.exists(self.path):
+			os.remove(self.path)
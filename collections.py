@@ -13,15 +13,35 @@ def DeleteCollection(
 	if remove_objects:
 		# Make a list for all objects in the collection
 		# If we try and loop through the collection and delete at the same time, Blender may crash
-		objects = []
-		for obj in col.all_objects:
-			obj.select_set(False)
-			objects.append(obj)
-
-		for obj in objects:   
-			bpy.data.objects.remove(obj)
+		RemoveObjects(list(col.all_objects))
 	
 	# Delete the collection itself
 	bpy.data.collections.remove(col)
 	
 	return True
+
+
+def RemoveObjects(
+	objects: list[bpy.types.Object],
+) -> int:
+	"""
+	Removes objects along with any mesh data that only they use, in a single batch_remove call,
+	so no orphan meshes are left behind. Materials and other shared data are left alone.
+
+	Returns the number of meshes removed
+	"""
+
+	if not objects:
+		return 0
+
+	# Count how many of the objects use each mesh, a mesh with other users has to stay
+	mesh_users = {}
+	for obj in objects:
+		if obj.type == 'MESH' and obj.data:
+			mesh_users[obj.data] = mesh_users.get(obj.data, 0) + 1
+
+	meshes = [mesh for mesh, count in mesh_users.items() if mesh.users == count]
+
+	bpy.data.batch_remove(list(objects) + meshes)
+
+	return len(meshes)
@@ -1,7 +1,8 @@
 import bpy
-import time
 
-from . logging import Log
+from mathutils import Matrix, Vector
+
+from . profiler import Span
 
 
 
@@ -32,7 +33,6 @@ def DuplicateObjects(
 	:return: List of duplicated objects with applied modifiers and updated origins.
 	:rtype: list[bpy.types.Object]
 	"""
-	time_start = time.time()
 
 	# Ensure nothing is selected
 	bpy.ops.object.select_all(action='DESELECT')
@@ -45,29 +45,25 @@ def DuplicateObjects(
 	
 	# Clone objects, apply their modifiers, set their origins
 	for index, obj in enumerate(objects):
-		t = time.time
-		time_object_start = t
-
-		# Create a duplicate of the object
-		duplicate_obj      = obj.copy()
-		duplicate_obj.data = obj.data.copy()
-		bpy.context.collection.objects.link(duplicate_obj)
-
-		# Rename the original temporarily and ensure the clone has the original name
-		# We do this so that the exported model doesn't end up with different mesh names
-		original_name      = obj.name
-		obj.name           = temp_prefix + original_name
-		duplicate_obj.name = original_name
-
-		# Check if the object has `_collider` in the name, and if so ensure it appears at the end
-		if '_collider' in duplicate_obj.name and not duplicate_obj.name.endswith('_collider'):
-			duplicate_obj.name = duplicate_obj.name + '_collider'
-		
-		# Set the duplicate object as the active object
-		bpy.context.view_layer.objects.active = duplicate_obj
-		duplicate_obj.select_set(True)
-		
-		#Log("    ", index, "rename and set active took", time.time() - time_object_start)
+		with Span("duplicate", object=obj.name):
+			# Create a duplicate of the object
+			duplicate_obj      = obj.copy()
+			duplicate_obj.data = obj.data.copy()
+			bpy.context.collection.objects.link(duplicate_obj)
+
+			# Rename the original temporarily and ensure the clone has the original name
+			# We do this so that the exported model doesn't end up with different mesh names
+			original_name      = obj.name
+			obj.name           = temp_prefix + original_name
+			duplicate_obj.name = original_name
+
+			# Check if the object has `_collider` in the name, and if so ensure it appears at the end
+			if '_collider' in duplicate_obj.name and not duplicate_obj.name.endswith('_collider'):
+				duplicate_obj.name = duplicate_obj.name + '_collider'
+			
+			# Set the duplicate object as the active object
+			bpy.context.view_layer.objects.active = duplicate_obj
+			duplicate_obj.select_set(True)
 
 		# Ensure we're in Object Mode
 		bpy.ops.object.mode_set(mode='OBJECT')
@@ -76,14 +72,16 @@ def DuplicateObjects(
 		if obj.rigid_body is not None:
 			bpy.ops.rigidbody.object_remove()
 
-		# Convert to mesh and apply modifiers
-		bpy.ops.object.convert(target='MESH', keep_original=False)
+		# Convert to mesh and apply modifiers, this is where the boolean is evaluated
+		with Span("convert", object=original_name, modifiers=len(duplicate_obj.modifiers)):
+			bpy.ops.object.convert(target='MESH', keep_original=False)
 
 		# Clear the parent and keep its transform
 		bpy.ops.object.parent_clear(type='CLEAR_KEEP_TRANSFORM')
 
 		# Update the objects origin to match the 3d cursor
-		bpy.ops.object.origin_set(type='ORIGIN_CURSOR')
+		with Span("origin_set", object=original_name):
+			bpy.ops.object.origin_set(type='ORIGIN_CURSOR')
 
 		# Add the duplicate object to the list
 		duplicate_objects.append(duplicate_obj)
@@ -93,5 +91,150 @@ def DuplicateObjects(
 	#	obj.location = (0, 0, 0)
 	
 	
-	Log("DuplicateObjects took", time.time() - time_start, "for", len(objects), "objects")
-	return duplicate_objects
\ No newline at end of file
+	return duplicate_objects
+
+
+def NewWorldMeshFromObject(
+	obj      : bpy.types.Object,
+	depsgraph: bpy.types.Depsgraph,
+	offset   : Matrix = Matrix.Identity(4)
+) -> bpy.types.Mesh:
+	"""
+	Create a new mesh from an object's evaluated mesh, with all modifiers applied, in world space.
+
+	:param obj: The object to copy the mesh from.
+	:type obj: bpy.types.Object
+
+	:param depsgraph: The evaluated depsgraph to read the object from.
+	:type depsgraph: bpy.types.Depsgraph
+
+	:param offset: Optional matrix applied after the world transform, eg. to move the mesh to a new origin.
+	:type offset: mathutils.Matrix
+
+	:return: The new mesh.
+	:rtype: bpy.types.Mesh
+	"""
+
+	obj_eval = obj.evaluated_get(depsgraph)
+
+	# Copy the evaluated mesh, with all modifiers applied
+	mesh = bpy.data.meshes.new_from_object(obj_eval, preserve_all_data_layers=True, depsgraph=depsgraph)
+
+	# Move the vertices into world space in one go
+	mesh.transform(offset @ obj_eval.matrix_world)
+
+	# Baking a negative scale into the vertices turns the faces inside out, so flip them back
+	if obj_eval.matrix_world.is_negative:
+		mesh.flip_normals()
+
+	return mesh
+
+
+def DuplicateObjectsData(
+	objects    : list[bpy.types.Object],
+	new_origin : tuple[float, float, float],
+	temp_prefix: str
+) -> list[bpy.types.Object]:
+	"""
+	Duplicate a list of Blender objects, applying modifiers and updating the origin, without any
+	operators. This has the same result as DuplicateObjects, but builds each mesh directly from
+	the evaluated depsgraph object, so there is no selection, mode switching or undo overhead.
+
+	The parent transform is baked into the mesh, which is stored relative to new_origin, and the
+	duplicate is placed at new_origin with no parent, rotation or scale.
+
+	:param objects: List of Blender objects to duplicate.
+	:type objects: list[bpy.types.Object]
+
+	:param new_origin: The origin of the duplicated objects.
+	:type new_origin: tuple[float, float, float]
+
+	:param temp_prefix: Prefix to be added to the original objects' names temporarily.
+	:type temp_prefix: str
+
+	:return: List of duplicated objects with applied modifiers and updated origins.
+	:rtype: list[bpy.types.Object]
+	"""
+
+	depsgraph = bpy.context.evaluated_depsgraph_get()
+	to_origin = Matrix.Translation(-Vector(new_origin))
+
+	# Create a blank list to store the duplicated objects
+	duplicate_objects = []
+
+	for obj in objects:
+		# Copying the evaluated mesh is where any boolean is evaluated
+		with Span("evaluate", object=obj.name, modifiers=len(obj.modifiers)):
+			mesh = NewWorldMeshFromObject(obj, depsgraph, to_origin)
+
+		with Span("duplicate", object=obj.name):
+			duplicate_objects.append(CreateTileObject(obj, mesh, new_origin, temp_prefix))
+
+	return duplicate_objects
+
+
+
+# ████████╗██╗██╗     ███████╗     ██████╗ ██████╗      ██╗███████╗ ██████╗████████╗
+# ╚══██╔══╝██║██║     ██╔════╝    ██╔═══██╗██╔══██╗     ██║██╔════╝██╔════╝╚══██╔══╝
+#    ██║   ██║██║     █████╗      ██║   ██║██████╔╝     ██║█████╗  ██║        ██║
+#    ██║   ██║██║     ██╔══╝      ██║   ██║██╔══██╗██   ██║██╔══╝  ██║        ██║
+#    ██║   ██║███████╗███████╗    ╚██████╔╝██████╔╝╚█████╔╝███████╗╚██████╗   ██║
+#    ╚═╝   ╚═╝╚══════╝╚══════╝     ╚═════╝ ╚═════╝  ╚════╝ ╚══════╝ ╚═════╝   ╚═╝
+#
+
+def CreateTileObject(
+	obj        : bpy.types.Object,
+	mesh       : bpy.types.Mesh,
+	new_origin : tuple[float, float, float],
+	temp_prefix: str
+) -> bpy.types.Object:
+	"""
+	Create a new object for a tile from a mesh built from one of the source objects, without
+	using any operators. The mesh should already be in world space relative to new_origin.
+
+	The new object takes the original object's name, materials and collider naming rule, the
+	same as the objects produced by DuplicateObjects.
+
+	:param obj: The source object the mesh was built from.
+	:type obj: bpy.types.Object
+
+	:param mesh: The mesh for the new object.
+	:type mesh: bpy.types.Mesh
+
+	:param new_origin: The location of the new object.
+	:type new_origin: tuple[float, float, float]
+
+	:param temp_prefix: Prefix to be added to the original object's name temporarily.
+	:type temp_prefix: str
+
+	:return: The new object, linked to the active collection.
+	:rtype: bpy.types.Object
+	"""
+
+	# Use the materials the original object actually renders with, including object-linked ones
+	mesh.materials.clear()
+	for slot in obj.material_slots:
+		mesh.materials.append(slot.material)
+
+	# Keep the original smoothing settings, only present before Blender 4.1
+	if hasattr(mesh, "use_auto_smooth") and obj.type == 'MESH':
+		mesh.use_auto_smooth   = obj.data.use_auto_smooth
+		mesh.auto_smooth_angle = obj.data.auto_smooth_angle
+
+	# Rename the original temporarily and ensure the new object has the original name
+	# We do this so that the exported model doesn't end up with different mesh names
+	original_name = obj.name
+	if not original_name.startswith(temp_prefix):
+		obj.name = temp_prefix + original_name
+	else:
+		original_name = original_name[len(temp_prefix):]
+
+	tile_obj          = bpy.data.objects.new(original_name, mesh)
+	tile_obj.location = new_origin
+	bpy.context.collection.objects.link(tile_obj)
+
+	# Check if the object has `_collider` in the name, and if so ensure it appears at the end
+	if '_collider' in tile_obj.name and not tile_obj.name.endswith('_collider'):
+		tile_obj.name = tile_obj.name + '_collider'
+
+	return tile_obj
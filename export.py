@@ -4,6 +4,11 @@ import 	json
 from 	collections 			import defaultdict
 from 	xml.etree.ElementTree 	import tostring
 
+from 	. gltfWriter			import GetNativeFallbackReason, WriteObjectsToGLtf
+from 	. logging				import LogDebug
+from 	. profiler				import Span
+from 	. tilesets				import IterTilesetRows, SwizzleNode, SwizzleTilesetHeader
+
 
 
 # ██████╗  █████╗ ████████╗██╗  ██╗
@@ -56,6 +61,12 @@ def GetExportPath(file: str = None) -> str:
 # ╚══════╝╚═╝  ╚═╝╚═╝      ╚═════╝ ╚═╝  ╚═╝   ╚═╝        ╚════╝ ╚══════╝ ╚═════╝ ╚═╝  ╚═══╝
 #
 
+# Schema version written to sparse tilesets. Tilesets without a schema_version are dense (1)
+SPARSE_SCHEMA_VERSION = 2
+
+# Schema version written to octree tilesets, see IterOctreeTilesetJSON
+OCTREE_SCHEMA_VERSION = 3
+
 def ExportDataToJSON(
 	data,
 	file,
@@ -65,14 +76,204 @@ def ExportDataToJSON(
 	Export the supplied tileset_data to a file at the given output_path
 	"""
 
-	if minify:
-		json_string = json.dumps(data)
-	else:
-		json_string = json.dumps(data, indent="\t")
+	encoder = json.JSONEncoder(indent=None if minify else "\t")
+
+	# Stream the data to the file a piece at a time, rather than building the whole string first
+	WriteFileAtomic(file, encoder.iterencode(data))
+
+
+def ExportTilesetToJSON(
+	tileset_data,
+	file,
+	minify,
+	swizzle = False,
+	schema  = "DENSE"
+):
+	"""
+	Export the tileset data to a file, streaming the tiles out one at a time.
+
+	Only a single tile is ever encoded at once, and if swizzle is set the tiles are swizzled as
+	they're written, so no swizzled copy of the tileset is made either. Each tile is written on
+	a single line when not minified.
+
+	The DENSE schema writes every tile in the grid as a nested x/y/z array. The SPARSE schema
+	writes a flat list of the tiles that were exported, with just their index and src, as their
+	positions can be worked out from the tileset origin and tile dimensions.
+
+	Tilesets built with octree tiling are always written as a hierarchy of nodes, whatever the
+	schema, see IterOctreeTilesetJSON.
+
+	Args:
+	- tileset_data (dict[str, object]): The tileset data, as returned by CreateTilesetFromCollection.
+	- file (str): The path to write to.
+	- minify (bool): Leave out the whitespace.
+	- swizzle (bool): Swizzle the tileset to Y+ up, the same as SwizzleTilesetData.
+	- schema (str): DENSE or SPARSE.
+
+	Returns:
+	- None
+	"""
+
+	with Span("json_write", schema=schema):
+		if "root" in tileset_data:
+			WriteFileAtomic(file, IterOctreeTilesetJSON(tileset_data, minify, swizzle))
+		elif schema == "SPARSE":
+			WriteFileAtomic(file, IterSparseTilesetJSON(tileset_data, minify, swizzle))
+		else:
+			WriteFileAtomic(file, IterTilesetJSON(tileset_data, minify, swizzle))
+
+
+def GetTilesetHeaderJSON(tileset_data, minify, swizzle = False, extra = None):
+	"""
+	Encode everything in the tileset data except the tiles, leaving the object open so the
+	tiles can be streamed after it.
+
+	Args:
+	- tileset_data (dict[str, object]): The tileset data, as returned by CreateTilesetFromCollection.
+	- minify (bool): Leave out the whitespace.
+	- swizzle (bool): Swizzle the tileset to Y+ up.
+	- extra (dict[str, object], optional): Values to add before the rest of the header.
+
+	Returns:
+	- str: The start of the JSON document, up to and including the opening of the tiles array.
+	"""
+
+	newline   = "" if minify else "\n"
+	indent    = "" if minify else "\t"
+	separator = ", " if minify else ","
+
+	header = dict(extra or {})
+	header.update(SwizzleTilesetHeader(tileset_data) if swizzle else tileset_data)
+	header = {key: value for key, value in header.items() if key not in ("tiles", "root")}
+	header_json = json.dumps(header, indent=None if minify else "\t")
+
+	return header_json[:-1].rstrip("\n") + separator + newline + indent + '"tiles": ['
+
+
+def IterTilesetJSON(tileset_data, minify, swizzle = False):
+	"""
+	Encode the tileset data to JSON in pieces, in the dense schema. See ExportTilesetToJSON.
+
+	Args:
+	- tileset_data (dict[str, object]): The tileset data, as returned by CreateTilesetFromCollection.
+	- minify (bool): Leave out the whitespace.
+	- swizzle (bool): Swizzle the tileset to Y+ up.
+
+	Returns:
+	- Iterator[str]: The pieces of the JSON document.
+	"""
+
+	newline   = "" if minify else "\n"
+	indent    = "" if minify else "\t"
+	separator = ", " if minify else ","
 
-	# Write the data object to an output JSON file
-	with open(file, "w") as json_file:
-		json_file.write(json_string)
+	yield GetTilesetHeaderJSON(tileset_data, minify, swizzle)
+
+	for x, plane in enumerate(IterTilesetRows(tileset_data, swizzle)):
+		yield (separator if x else "") + newline + indent * 2 + "["
+
+		for y, row in enumerate(plane):
+			yield (separator if y else "") + newline + indent * 3 + "["
+			yield separator.join(newline + indent * 4 + json.dumps(tile) for tile in row)
+			yield newline + indent * 3 + "]"
+
+		yield newline + indent * 2 + "]"
+
+	yield newline + indent + "]" + newline + "}"
+
+
+def IterSparseTilesetJSON(tileset_data, minify, swizzle = False):
+	"""
+	Encode the tileset data to JSON in pieces, in the sparse schema. See ExportTilesetToJSON.
+
+	Args:
+	- tileset_data (dict[str, object]): The tileset data, as returned by CreateTilesetFromCollection.
+	- minify (bool): Leave out the whitespace.
+	- swizzle (bool): Swizzle the tileset to Y+ up.
+
+	Returns:
+	- Iterator[str]: The pieces of the JSON document.
+	"""
+
+	newline   = "" if minify else "\n"
+	indent    = "" if minify else "\t"
+	separator = ", " if minify else ","
+
+	yield GetTilesetHeaderJSON(tileset_data, minify, swizzle, {"schema_version": SPARSE_SCHEMA_VERSION})
+
+	count = 0
+	for plane in IterTilesetRows(tileset_data, swizzle):
+		for row in plane:
+			for tile in row:
+				if tile["src"] is None:
+					continue
+
+				sparse_tile = {"index": tile["index"], "src": tile["src"]}
+				if "lods" in tile:
+					sparse_tile["lods"] = tile["lods"]
+
+				yield (separator if count else "") + newline + indent * 2 + json.dumps(sparse_tile)
+				count += 1
+
+	yield newline + indent + "]" + newline + "}"
+
+
+def IterOctreeTilesetJSON(tileset_data, minify, swizzle = False):
+	"""
+	Encode an octree tileset to JSON in pieces. The tiles array holds the root node, and each
+	node lists its children. Only leaf nodes have a src, and it's null if the leaf was empty.
+
+	Args:
+	- tileset_data (dict[str, object]): The tileset data, with the "root" node from BuildOctree.
+	- minify (bool): Leave out the whitespace.
+	- swizzle (bool): Swizzle the tileset to Y+ up.
+
+	Returns:
+	- Iterator[str]: The pieces of the JSON document.
+	"""
+
+	newline = "" if minify else "\n"
+	indent  = "" if minify else "\t"
+
+	yield GetTilesetHeaderJSON(tileset_data, minify, swizzle, {"schema_version": OCTREE_SCHEMA_VERSION, "tiling": "OCTREE"})
+
+	if tileset_data["root"]:
+		root = SwizzleNode(tileset_data["root"]) if swizzle else tileset_data["root"]
+		yield newline + indent * 2 + json.dumps(root, indent=None if minify else "\t").replace("\n", "\n" + indent * 2)
+
+	yield newline + indent + "]" + newline + "}"
+
+
+def WriteFileAtomic(file, chunks):
+	"""
+	Write text to a file a chunk at a time. The chunks go to a temporary file beside it, which
+	only replaces the real file once it's complete, so a crash or error part way through never
+	leaves a half written file behind.
+
+	Args:
+	- file (str): The path to write to.
+	- chunks (Iterable[str]): The text to write.
+
+	Returns:
+	- None
+	"""
+
+	temp_file = file + ".tmp"
+
+	try:
+		with open(temp_file, "w", buffering=1024 * 1024) as json_file:
+			for chunk in chunks:
+				json_file.write(chunk)
+
+			json_file.flush()
+			os.fsync(json_file.fileno())
+
+		os.replace(temp_file, file)
+
+	except BaseException:
+		if os.path.exists(temp_file):
+			os.remove(temp_file)
+		raise
 
 
 
@@ -223,6 +424,16 @@ def ExportObjectsToGLtf(
 	# Work out the destination name
 	file_path = GetExportPath(filename)
 
+	# Plain static meshes can be written directly, which skips the exporter's scene gathering
+	if ss_settings.gltf_writer == "NATIVE":
+		fallback_reason = GetNativeFallbackReason(objects)
+		if not fallback_reason:
+			with Span("gltf_export", src=filename, writer="NATIVE", objects=len(objects)):
+				WriteObjectsToGLtf(objects, file_path, ss_settings.export_format, ss_settings.swizzle_yz, reset_origin)
+			return
+
+		LogDebug("Using the glTF exporter for", filename, "-", fallback_reason)
+
 	# Deselect all the objects
 	bpy.ops.object.select_all(action='DESELECT')
 
@@ -246,7 +457,8 @@ def ExportObjectsToGLtf(
 	export_settings["use_selection"]             		    = True
 	export_settings["export_draco_mesh_compression_enable"] = ss_settings.use_draco
 
-	bpy.ops.export_scene.gltf(**export_settings)
+	with Span("gltf_export", src=filename, writer="EXPORTER", objects=len(objects)):
+		bpy.ops.export_scene.gltf(**export_settings)
 
 	# If we reset the origin for export, move the object back to it's original location
 	if reset_origin:
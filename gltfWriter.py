@@ -0,0 +1,499 @@
+import bpy
+import json
+import numpy as np
+import os
+import struct
+
+
+
+#  ██████╗ ██████╗ ███╗   ██╗███████╗████████╗ █████╗ ███╗   ██╗████████╗███████╗
+# ██╔════╝██╔═══██╗████╗  ██║██╔════╝╚══██╔══╝██╔══██╗████╗  ██║╚══██╔══╝██╔════╝
+# ██║     ██║   ██║██╔██╗ ██║███████╗   ██║   ███████║██╔██╗ ██║   ██║   ███████╗
+# ██║     ██║   ██║██║╚██╗██║╚════██║   ██║   ██╔══██║██║╚██╗██║   ██║   ╚════██║
+# ╚██████╗╚██████╔╝██║ ╚████║███████║   ██║   ██║  ██║██║ ╚████║   ██║   ███████║
+#  ╚═════╝ ╚═════╝ ╚═╝  ╚═══╝╚══════╝   ╚═╝   ╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝   ╚══════╝
+#
+
+GENERATOR = "DCL Toolkit: Scene Slicer"
+
+GLB_MAGIC      = 0x46546C67
+GLB_VERSION    = 2
+GLB_CHUNK_JSON = 0x4E4F534A
+GLB_CHUNK_BIN  = 0x004E4942
+
+COMPONENT_TYPES = {
+	"<f4": 5126, # FLOAT
+	"<u2": 5123, # UNSIGNED_SHORT
+	"<u4": 5125, # UNSIGNED_INT
+}
+
+TARGET_ARRAY_BUFFER         = 34962
+TARGET_ELEMENT_ARRAY_BUFFER = 34963
+
+
+
+# ███████╗ █████╗ ██╗     ██╗     ██████╗  █████╗  ██████╗██╗  ██╗
+# ██╔════╝██╔══██╗██║     ██║     ██╔══██╗██╔══██╗██╔════╝██║ ██╔╝
+# █████╗  ███████║██║     ██║     ██████╔╝███████║██║     █████╔╝
+# ██╔══╝  ██╔══██║██║     ██║     ██╔══██╗██╔══██║██║     ██╔═██╗
+# ██║     ██║  ██║███████╗███████╗██████╔╝██║  ██║╚██████╗██║  ██╗
+# ╚═╝     ╚═╝  ╚═╝╚══════╝╚══════╝╚═════╝ ╚═╝  ╚═╝ ╚═════╝╚═╝  ╚═╝
+#
+
+def UsesImageTextures(mat: bpy.types.Material) -> bool:
+	"""
+	Check whether a material samples any image textures.
+
+	:param mat: The material to check.
+	:type mat: bpy.types.Material
+
+	:return: True if the material's node tree contains an image texture node.
+	:rtype: bool
+	"""
+
+	if not mat.use_nodes or not mat.node_tree:
+		return False
+
+	return any(node.type == 'TEX_IMAGE' for node in mat.node_tree.nodes)
+
+
+def GetNativeFallbackReason(objects: list[bpy.types.Object]) -> str:
+	"""
+	Check whether the objects can be written by the native writer, which only handles plain
+	static meshes with untextured materials. Anything else needs the full glTF exporter.
+
+	:param objects: The objects to be exported.
+	:type objects: list[bpy.types.Object]
+
+	:return: Why the full exporter is needed, or None if the native writer can be used.
+	:rtype: str
+	"""
+
+	# Get scene slicer settings
+	ss_settings = bpy.context.scene.ss_settings
+
+	if ss_settings.use_draco:
+		return "Draco compression is enabled"
+
+	for obj in objects:
+		if obj.type != 'MESH':
+			return f"{obj.name} is not a mesh"
+
+		if obj.animation_data or obj.data.animation_data or obj.data.shape_keys:
+			return f"{obj.name} is animated or has shape keys"
+
+		if (obj.parent and obj.parent.type == 'ARMATURE') or any(mod.type == 'ARMATURE' for mod in obj.modifiers):
+			return f"{obj.name} is skinned"
+
+		for slot in obj.material_slots:
+			if slot.material and UsesImageTextures(slot.material):
+				return f"{slot.material.name} uses image textures"
+
+	return None
+
+
+
+# ███╗   ███╗ █████╗ ████████╗███████╗██████╗ ██╗ █████╗ ██╗     ███████╗
+# ████╗ ████║██╔══██╗╚══██╔══╝██╔════╝██╔══██╗██║██╔══██╗██║     ██╔════╝
+# ██╔████╔██║███████║   ██║   █████╗  ██████╔╝██║███████║██║     ███████╗
+# ██║╚██╔╝██║██╔══██║   ██║   ██╔══╝  ██╔══██╗██║██╔══██║██║     ╚════██║
+# ██║ ╚═╝ ██║██║  ██║   ██║   ███████╗██║  ██║██║██║  ██║███████╗███████║
+# ╚═╝     ╚═╝╚═╝  ╚═╝   ╚═╝   ╚══════╝╚═╝  ╚═╝╚═╝╚═╝  ╚═╝╚══════╝╚══════╝
+#
+
+def GetMaterialData(mat: bpy.types.Material) -> dict:
+	"""
+	Get the glTF material for a Blender material, read from its Principled BSDF if it has one,
+	otherwise from its viewport display settings.
+
+	:param mat: The material to convert.
+	:type mat: bpy.types.Material
+
+	:return: The glTF material.
+	:rtype: dict
+	"""
+
+	base_color = list(mat.diffuse_color)
+	metallic   = mat.metallic
+	roughness  = mat.roughness
+
+	if mat.use_nodes and mat.node_tree:
+		for node in mat.node_tree.nodes:
+			if node.type == 'BSDF_PRINCIPLED':
+				base_color    = list(node.inputs["Base Color"].default_value)
+				base_color[3] = node.inputs["Alpha"].default_value
+				metallic      = node.inputs["Metallic"].default_value
+				roughness     = node.inputs["Roughness"].default_value
+				break
+
+	material = {
+		"name"                : mat.name,
+		"pbrMetallicRoughness": {
+			"baseColorFactor": [round(c, 6) for c in base_color],
+			"metallicFactor" : round(metallic, 6),
+			"roughnessFactor": round(roughness, 6),
+		},
+	}
+
+	if base_color[3] < 1:
+		material["alphaMode"] = "BLEND"
+
+	if not mat.use_backface_culling:
+		material["doubleSided"] = True
+
+	return material
+
+
+
+# ███╗   ███╗███████╗███████╗██╗  ██╗███████╗███████╗
+# ████╗ ████║██╔════╝██╔════╝██║  ██║██╔════╝██╔════╝
+# ██╔████╔██║█████╗  ███████╗███████║█████╗  ███████╗
+# ██║╚██╔╝██║██╔══╝  ╚════██║██╔══██║██╔══╝  ╚════██║
+# ██║ ╚═╝ ██║███████╗███████║██║  ██║███████╗███████║
+# ╚═╝     ╚═╝╚══════╝╚══════╝╚═╝  ╚═╝╚══════╝╚══════╝
+#
+
+def GetMeshArrays(mesh: bpy.types.Mesh, y_up: bool) -> dict:
+	"""
+	Read the triangles of a mesh straight into NumPy arrays, ready to be written as glTF.
+
+	glTF stores normals and UVs per vertex, so each triangle corner becomes a vertex, and
+	corners with the same position, normal and UV are merged back together.
+
+	:param mesh: The mesh to read.
+	:type mesh: bpy.types.Mesh
+
+	:param y_up: Convert from Blender's Z+ up to glTF's Y+ up.
+	:type y_up: bool
+
+	:return: The "positions", "normals", "uvs" (or None), "indices" and "materials" of each triangle, or None if the mesh has no triangles.
+	:rtype: dict
+	"""
+
+	mesh.calc_loop_triangles()
+
+	tri_count  = len(mesh.loop_triangles)
+	loop_count = len(mesh.loops)
+	if tri_count == 0:
+		return None
+
+	tri_loops     = np.empty(tri_count * 3, dtype=np.int32)
+	tri_materials = np.empty(tri_count,     dtype=np.int32)
+	mesh.loop_triangles.foreach_get("loops",          tri_loops)
+	mesh.loop_triangles.foreach_get("material_index", tri_materials)
+
+	loop_vertices = np.empty(loop_count, dtype=np.int32)
+	mesh.loops.foreach_get("vertex_index", loop_vertices)
+
+	co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+	mesh.vertices.foreach_get("co", co)
+
+	# Blender 4.1 replaced split normals with corner normals
+	normals = np.empty(loop_count * 3, dtype=np.float32)
+	if hasattr(mesh, "corner_normals"):
+		mesh.corner_normals.foreach_get("vector", normals)
+	else:
+		mesh.calc_normals_split()
+		mesh.loops.foreach_get("normal", normals)
+
+	columns = [co.reshape(-1, 3)[loop_vertices], normals.reshape(-1, 3)]
+
+	# glTF UVs start at the top left rather than the bottom left
+	uv_layer = mesh.uv_layers.active
+	if uv_layer:
+		uvs = np.empty(loop_count * 2, dtype=np.float32)
+		uv_layer.data.foreach_get("uv", uvs)
+		uvs = uvs.reshape(-1, 2)
+		uvs[:, 1] = 1.0 - uvs[:, 1]
+		columns.append(uvs)
+
+	# Merge corners that share all their attributes
+	vertices, loop_to_vertex = np.unique(np.hstack(columns), axis=0, return_inverse=True)
+	loop_to_vertex = loop_to_vertex.reshape(-1)
+
+	positions = vertices[:, 0:3]
+	normals   = vertices[:, 3:6]
+	if y_up:
+		positions = positions[:, [0, 2, 1]] * np.array([1, 1, -1], dtype=np.float32)
+		normals   = normals[:, [0, 2, 1]]   * np.array([1, 1, -1], dtype=np.float32)
+
+	return {
+		"positions": positions,
+		"normals"  : normals,
+		"uvs"      : vertices[:, 6:8] if uv_layer else None,
+		"indices"  : loop_to_vertex[tri_loops].reshape(-1, 3),
+		"materials": tri_materials,
+	}
+
+
+
+# ██████╗ ██╗   ██╗██╗██╗     ██████╗ ███████╗██████╗
+# ██╔══██╗██║   ██║██║██║     ██╔══██╗██╔════╝██╔══██╗
+# ██████╔╝██║   ██║██║██║     ██║  ██║█████╗  ██████╔╝
+# ██╔══██╗██║   ██║██║██║     ██║  ██║██╔══╝  ██╔══██╗
+# ██████╔╝╚██████╔╝██║███████╗██████╔╝███████╗██║  ██║
+# ╚═════╝  ╚═════╝ ╚═╝╚══════╝╚═════╝ ╚══════╝╚═╝  ╚═╝
+#
+
+class GltfBuilder:
+	"""
+	Collects the meshes, materials and binary data for a single glTF file.
+
+	:param y_up: Convert from Blender's Z+ up to glTF's Y+ up.
+	:type y_up: bool
+	"""
+
+	def __init__(self, y_up: bool):
+		self.y_up = y_up
+
+		self.buffer       = bytearray()
+		self.buffer_views = []
+		self.accessors    = []
+		self.materials    = []
+		self.meshes       = []
+		self.nodes        = []
+
+		self.material_indexes = {}
+
+
+	def AddAccessor(self, array: np.ndarray, accessor_type: str, target: int, with_bounds: bool = False) -> int:
+		"""
+		Append an array to the binary buffer, with a buffer view and accessor for it.
+
+		:param array: The data, as float32, uint16 or uint32.
+		:type array: np.ndarray
+
+		:param accessor_type: The glTF accessor type, eg SCALAR, VEC2, VEC3.
+		:type accessor_type: str
+
+		:param target: The buffer view target, ARRAY_BUFFER or ELEMENT_ARRAY_BUFFER.
+		:type target: int
+
+		:param with_bounds: Include the min and max of each component, required for positions.
+		:type with_bounds: bool
+
+		:return: The index of the accessor.
+		:rtype: int
+		"""
+
+		# Each buffer view must start on a 4 byte boundary
+		self.buffer.extend(b"\x00" * (-len(self.buffer) % 4))
+
+		data = np.ascontiguousarray(array)
+		self.buffer_views.append({
+			"buffer"    : 0,
+			"byteOffset": len(self.buffer),
+			"byteLength": data.nbytes,
+			"target"    : target,
+		})
+		self.buffer.extend(data.tobytes())
+
+		accessor = {
+			"bufferView"   : len(self.buffer_views) - 1,
+			"componentType": COMPONENT_TYPES[data.dtype.str],
+			"count"        : len(data),
+			"type"         : accessor_type,
+		}
+
+		if with_bounds:
+			accessor["min"] = data.min(axis=0).tolist()
+			accessor["max"] = data.max(axis=0).tolist()
+
+		self.accessors.append(accessor)
+		return len(self.accessors) - 1
+
+
+	def AddMaterial(self, mat: bpy.types.Material) -> int:
+		"""
+		Add a material, or get the index of it if it's already been added.
+
+		:param mat: The material to add.
+		:type mat: bpy.types.Material
+
+		:return: The index of the material.
+		:rtype: int
+		"""
+
+		if mat not in self.material_indexes:
+			self.materials.append(GetMaterialData(mat))
+			self.material_indexes[mat] = len(self.materials) - 1
+
+		return self.material_indexes[mat]
+
+
+	def AddObject(self, obj: bpy.types.Object, depsgraph: bpy.types.Depsgraph, reset_origin: bool):
+		"""
+		Add a mesh object as a node, with one primitive per material it uses.
+
+		:param obj: The object to add.
+		:type obj: bpy.types.Object
+
+		:param depsgraph: The dependency graph to evaluate the object with.
+		:type depsgraph: bpy.types.Depsgraph
+
+		:param reset_origin: Place the object at the world origin, as the exporter does.
+		:type reset_origin: bool
+		"""
+
+		obj_eval = obj.evaluated_get(depsgraph)
+		mesh     = obj_eval.to_mesh()
+		arrays   = GetMeshArrays(mesh, self.y_up)
+		obj_eval.to_mesh_clear()
+
+		if arrays is None:
+			return
+
+		attributes = {
+			"POSITION": self.AddAccessor(arrays["positions"].astype("<f4"), "VEC3", TARGET_ARRAY_BUFFER, True),
+			"NORMAL"  : self.AddAccessor(arrays["normals"].astype("<f4"),   "VEC3", TARGET_ARRAY_BUFFER),
+		}
+		if arrays["uvs"] is not None:
+			attributes["TEXCOORD_0"] = self.AddAccessor(arrays["uvs"].astype("<f4"), "VEC2", TARGET_ARRAY_BUFFER)
+
+		index_type = "<u2" if len(arrays["positions"]) < 65535 else "<u4"
+
+		# Split the triangles up by material, all primitives share the same vertices
+		primitives = []
+		for material_index in np.unique(arrays["materials"]).tolist():
+			indices   = arrays["indices"][arrays["materials"] == material_index].reshape(-1)
+			primitive = {
+				"attributes": attributes,
+				"indices"   : self.AddAccessor(indices.astype(index_type), "SCALAR", TARGET_ELEMENT_ARRAY_BUFFER),
+			}
+
+			if material_index < len(obj.material_slots) and obj.material_slots[material_index].material:
+				primitive["material"] = self.AddMaterial(obj.material_slots[material_index].material)
+
+			primitives.append(primitive)
+
+		self.meshes.append({"name": obj.data.name, "primitives": primitives})
+
+		# Add the node, converting its transform to Y+ up if needed
+		location, rotation, scale = obj.matrix_world.decompose()
+		if reset_origin:
+			location.zero()
+
+		if self.y_up:
+			translation = [location.x, location.z, -location.y]
+			rotation    = [rotation.x, rotation.z, -rotation.y, rotation.w]
+			scale       = [scale.x, scale.z, scale.y]
+		else:
+			translation = [location.x, location.y, location.z]
+			rotation    = [rotation.x, rotation.y, rotation.z, rotation.w]
+			scale       = [scale.x, scale.y, scale.z]
+
+		node = {"name": obj.name, "mesh": len(self.meshes) - 1}
+		if translation != [0, 0, 0]:
+			node["translation"] = translation
+		if rotation != [0, 0, 0, 1]:
+			node["rotation"] = rotation
+		if scale != [1, 1, 1]:
+			node["scale"] = scale
+
+		self.nodes.append(node)
+
+
+	def GetJSON(self, buffer_uri: str = None) -> dict:
+		"""
+		Get the glTF JSON describing everything added so far.
+
+		:param buffer_uri: The file name of the binary buffer, or None if it's embedded in a GLB.
+		:type buffer_uri: str
+
+		:return: The glTF JSON.
+		:rtype: dict
+		"""
+
+		buffer = {"byteLength": len(self.buffer)}
+		if buffer_uri:
+			buffer["uri"] = buffer_uri
+
+		gltf = {
+			"asset"      : {"version": "2.0", "generator": GENERATOR},
+			"scene"      : 0,
+			"scenes"     : [{"nodes": list(range(len(self.nodes)))}],
+			"nodes"      : self.nodes,
+			"meshes"     : self.meshes,
+			"accessors"  : self.accessors,
+			"bufferViews": self.buffer_views,
+			"buffers"    : [buffer],
+		}
+
+		if self.materials:
+			gltf["materials"] = self.materials
+
+		return gltf
+
+
+
+# ██╗    ██╗██████╗ ██╗████████╗███████╗██████╗
+# ██║    ██║██╔══██╗██║╚══██╔══╝██╔════╝██╔══██╗
+# ██║ █╗ ██║██████╔╝██║   ██║   █████╗  ██████╔╝
+# ██║███╗██║██╔══██╗██║   ██║   ██╔══╝  ██╔══██╗
+# ╚███╔███╔╝██║  ██║██║   ██║   ███████╗██║  ██║
+#  ╚══╝╚══╝ ╚═╝  ╚═╝╚═╝   ╚═╝   ╚══════╝╚═╝  ╚═╝
+#
+
+def WriteObjectsToGLtf(
+	objects      : list[bpy.types.Object],
+	file_path    : str,
+	export_format: str,
+	y_up         : bool,
+	reset_origin : bool = True
+) -> str:
+	"""
+	Write static mesh objects straight to a glTF file, without going through the glTF exporter.
+	Check GetNativeFallbackReason first, anything it rejects needs the full exporter.
+
+	:param objects: The objects to write.
+	:type objects: list[bpy.types.Object]
+
+	:param file_path: The path to write to, without an extension.
+	:type file_path: str
+
+	:param export_format: GLB, or GLTF_SEPARATE for a .gltf and .bin pair.
+	:type export_format: str
+
+	:param y_up: Convert from Blender's Z+ up to glTF's Y+ up.
+	:type y_up: bool
+
+	:param reset_origin: Place the objects at the world origin, as the exporter does.
+	:type reset_origin: bool
+
+	:return: The path of the file written.
+	:rtype: str
+	"""
+
+	depsgraph = bpy.context.evaluated_depsgraph_get()
+
+	builder = GltfBuilder(y_up)
+	for obj in objects:
+		builder.AddObject(obj, depsgraph, reset_origin)
+
+	if export_format == "GLB":
+		file_path += ".glb"
+
+		json_bytes = json.dumps(builder.GetJSON(), separators=(",", ":")).encode("utf-8")
+		json_bytes += b" " * (-len(json_bytes) % 4)
+
+		bin_bytes = bytes(builder.buffer)
+		bin_bytes += b"\x00" * (-len(bin_bytes) % 4)
+
+		with open(file_path, "wb") as file:
+			file.write(struct.pack("<III", GLB_MAGIC, GLB_VERSION, 12 + 8 + len(json_bytes) + 8 + len(bin_bytes)))
+			file.write(struct.pack("<II", len(json_bytes), GLB_CHUNK_JSON))
+			file.write(json_bytes)
+			file.write(struct.pack("<II", len(bin_bytes), GLB_CHUNK_BIN))
+			file.write(bin_bytes)
+
+	else:
+		bin_path  = file_path + ".bin"
+		file_path += ".gltf"
+
+		with open(bin_path, "wb") as file:
+			file.write(builder.buffer)
+
+		with open(file_path, "w") as file:
+			json.dump(builder.GetJSON(os.path.basename(bin_path)), file, separators=(",", ":"))
+
+	return file_path
@@ -0,0 +1,341 @@
+# WhatDo:
+#
+# Runs the scene slicer without the UI, for batch exports on build machines. The same pipeline as
+# the "Slice and Export" button is driven synchronously: no modal timer and no redraws.
+#
+# Usage:
+#
+#   blender -b scene.blend --python path/to/scene_slicer/headless.py -- [options]
+#
+# Options:
+#
+#   --job FILE          JSON file of SceneSlicerSettings values, eg {"export_collection": "park"}
+#   --set KEY=VALUE     Set a single setting, overriding the job file. Values are parsed as JSON
+#                       where possible, eg --set tile_dimensions=[8,8,4] --set use_draco=false
+#   --collection NAME   Shorthand for --set export_collection=NAME
+#   --output PATH       Shorthand for --set output_path=PATH
+#   --summary FILE      Also write the summary JSON to this file
+#   --workers N         Share the tiles between N background Blender instances, see parallel.py
+#   --resume            Carry on from the checkpoint left by a cancelled or crashed export
+#
+# A single line starting with SUMMARY_PREFIX is printed when the run ends, followed by the summary
+# as JSON. Blender exits with EXIT_OK on success, EXIT_BAD_ARGS if the arguments or job file are
+# invalid, and EXIT_FAILED if the export itself raised an error.
+#
+
+import argparse
+import bpy
+import importlib
+import json
+import os
+import sys
+import traceback
+
+
+
+#  ██████╗ ██████╗ ███╗   ██╗███████╗████████╗ █████╗ ███╗   ██╗████████╗███████╗
+# ██╔════╝██╔═══██╗████╗  ██║██╔════╝╚══██╔══╝██╔══██╗████╗  ██║╚══██╔══╝██╔════╝
+# ██║     ██║   ██║██╔██╗ ██║███████╗   ██║   ███████║██╔██╗ ██║   ██║   ███████╗
+# ██║     ██║   ██║██║╚██╗██║╚════██║   ██║   ██╔══██║██║╚██╗██║   ██║   ╚════██║
+# ╚██████╗╚██████╔╝██║ ╚████║███████║   ██║   ██║  ██║██║ ╚████║   ██║   ███████║
+#  ╚═════╝ ╚═════╝ ╚═╝  ╚═══╝╚══════╝   ╚═╝   ╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝   ╚══════╝
+#
+
+SUMMARY_PREFIX = "SCENE_SLICER_SUMMARY"
+
+EXIT_OK        = 0
+EXIT_FAILED    = 1
+EXIT_BAD_ARGS  = 2
+
+
+
+#  █████╗ ██████╗  ██████╗ ██╗   ██╗███╗   ███╗███████╗███╗   ██╗████████╗███████╗
+# ██╔══██╗██╔══██╗██╔════╝ ██║   ██║████╗ ████║██╔════╝████╗  ██║╚══██╔══╝██╔════╝
+# ███████║██████╔╝██║  ███╗██║   ██║██╔████╔██║█████╗  ██╔██╗ ██║   ██║   ███████╗
+# ██╔══██║██╔══██╗██║   ██║██║   ██║██║╚██╔╝██║██╔══╝  ██║╚██╗██║   ██║   ╚════██║
+# ██║  ██║██║  ██║╚██████╔╝╚██████╔╝██║ ╚═╝ ██║███████╗██║ ╚████║   ██║   ███████║
+# ╚═╝  ╚═╝╚═╝  ╚═╝ ╚═════╝  ╚═════╝ ╚═╝     ╚═╝╚══════╝╚═╝  ╚═══╝   ╚═╝   ╚══════╝
+#
+
+def GetScriptArgs() -> list:
+	"""
+	Get the arguments meant for this script, ie everything after the "--" on Blender's command line.
+
+	:return: The script arguments.
+	:rtype: list[str]
+	"""
+
+	if "--" in sys.argv:
+		return sys.argv[sys.argv.index("--") + 1:]
+	return []
+
+
+def ParseArgs(argv: list) -> argparse.Namespace:
+	"""
+	Parse the headless command line.
+
+	:param argv: The script arguments, see GetScriptArgs.
+	:type argv: list[str]
+
+	:return: The parsed arguments.
+	:rtype: argparse.Namespace
+	"""
+
+	parser = argparse.ArgumentParser(prog="headless.py", description="Slice a collection into tiles and export them without the UI.")
+	parser.add_argument("--job",        help="JSON file of SceneSlicerSettings values")
+	parser.add_argument("--set",        action="append", default=[], metavar="KEY=VALUE", help="Set a single setting, overriding the job file")
+	parser.add_argument("--collection", help="The collection to export")
+	parser.add_argument("--output",     help="The output folder")
+	parser.add_argument("--summary",    help="Also write the summary JSON to this file")
+	parser.add_argument("--workers",    type=int, default=1, help="Share the tiles between this many background Blender instances")
+	parser.add_argument("--resume",     action="store_true", help="Carry on from the checkpoint left by a cancelled or crashed export")
+	parser.add_argument("--worker-unit", help=argparse.SUPPRESS)
+
+	return parser.parse_args(argv)
+
+
+def GetJobSettings(args: argparse.Namespace) -> dict:
+	"""
+	Merge the job file and command line arguments into a single dict of settings. Command line
+	arguments take precedence over the job file.
+
+	:param args: The parsed arguments, see ParseArgs.
+	:type args: argparse.Namespace
+
+	:return: The settings to apply, keyed by SceneSlicerSettings property name.
+	:rtype: dict
+	"""
+
+	settings = {}
+
+	if args.job:
+		with open(args.job, "r") as file:
+			job = json.load(file)
+		if not isinstance(job, dict):
+			raise ValueError(f"Job file {args.job} must contain a JSON object")
+		settings.update(job)
+
+	settings.update(ParseSettingValues(args.set))
+
+	if args.collection:
+		settings["export_collection"] = args.collection
+	if args.output:
+		settings["output_path"] = args.output
+
+	return settings
+
+
+def ParseSettingValues(items: list) -> dict:
+	"""
+	Parse KEY=VALUE arguments into a dict of settings.
+
+	:param items: The arguments, eg from --set.
+	:type items: list[str]
+
+	:return: The settings, keyed by SceneSlicerSettings property name.
+	:rtype: dict
+	"""
+
+	settings = {}
+
+	for item in items:
+		key, sep, value = item.partition("=")
+		if not sep:
+			raise ValueError(f"Expected KEY=VALUE, got {item}")
+
+		# Parse the value as JSON so numbers, bools and lists work, otherwise use the plain string
+		try:
+			settings[key.strip()] = json.loads(value)
+		except json.JSONDecodeError:
+			settings[key.strip()] = value
+
+	return settings
+
+
+def ApplySettings(ss_settings, settings: dict):
+	"""
+	Apply a dict of values to the scene slicer settings, checking each one is a real setting.
+
+	:param ss_settings: The scene slicer settings.
+	:type ss_settings: SceneSlicerSettings
+
+	:param settings: The values to apply, keyed by property name.
+	:type settings: dict
+	"""
+
+	properties = ss_settings.bl_rna.properties
+
+	for key, value in settings.items():
+		if key == "rna_type" or key not in properties:
+			raise ValueError(f"Unknown setting: {key}")
+
+		# Blender validates the value itself, eg enum items and vector lengths
+		try:
+			setattr(ss_settings, key, value)
+		except (TypeError, ValueError) as e:
+			raise ValueError(f"Invalid value for {key}: {value!r} ({e})")
+
+
+def GetSettingsValues(ss_settings) -> dict:
+	"""
+	Get the current scene slicer settings as a dict that can be dumped to JSON and read back
+	with ApplySettings, eg as a job file.
+
+	:param ss_settings: The scene slicer settings.
+	:type ss_settings: SceneSlicerSettings
+
+	:return: The setting values, keyed by property name.
+	:rtype: dict
+	"""
+
+	settings = {}
+
+	for prop in ss_settings.bl_rna.properties:
+		if prop.identifier in ("rna_type", "export_progress", "export_text"):
+			continue
+
+		value = getattr(ss_settings, prop.identifier)
+		if getattr(prop, "is_array", False):
+			value = list(value)
+
+		settings[prop.identifier] = value
+
+	return settings
+
+
+
+# ██╗  ██╗███████╗ █████╗ ██████╗ ██╗     ███████╗███████╗███████╗
+# ██║  ██║██╔════╝██╔══██╗██╔══██╗██║     ██╔════╝██╔════╝██╔════╝
+# ███████║█████╗  ███████║██║  ██║██║     █████╗  ███████╗███████╗
+# ██╔══██║██╔══╝  ██╔══██║██║  ██║██║     ██╔══╝  ╚════██║╚════██║
+# ██║  ██║███████╗██║  ██║██████╔╝███████╗███████╗███████║███████║
+# ╚═╝  ╚═╝╚══════╝╚═╝  ╚═╝╚═════╝ ╚══════╝╚══════╝╚══════╝╚══════╝
+#
+
+def RunHeadless(argv: list) -> int:
+	"""
+	Run a complete slice and export from the command line and print a summary.
+
+	:param argv: The script arguments, see GetScriptArgs.
+	:type argv: list[str]
+
+	:return: The exit code, one of EXIT_OK, EXIT_FAILED or EXIT_BAD_ARGS.
+	:rtype: int
+	"""
+
+	from . logging  import Log, LogError, LogReset, LogWarning
+	from . parallel import RunParallelExport, RunWorker
+	from . session  import SliceSession
+
+	args    = ParseArgs(argv)
+	summary = {"status": "CANCELLED"}
+
+	# Get scene slicer settings
+	ss_settings = bpy.context.scene.ss_settings
+
+	try:
+		ApplySettings(ss_settings, GetJobSettings(args))
+	except (OSError, ValueError) as e:
+		LogError(e)
+		summary["error"] = str(e)
+		WriteSummary(summary, args.summary)
+		return EXIT_BAD_ARGS
+
+	# The log settings and output folder come from the job, workers leave the log file to the coordinator
+	LogReset(log_file=not args.worker_unit)
+	Log("#------------------------------------------------#")
+	Log("#      Exporting collection to tilset (headless) #")
+	Log("#------------------------------------------------#")
+
+	# Ensure we have a valid collection
+	collection = bpy.data.collections.get(ss_settings.export_collection)
+	if not collection:
+		LogError("No collection specified. Nothing to do...")
+		summary["error"] = "No collection specified"
+		WriteSummary(summary, args.summary)
+		return EXIT_BAD_ARGS
+
+	# Work units are shared out by grid tile, which octree tiles don't line up with
+	if args.workers > 1 and ss_settings.tiling_mode == "OCTREE":
+		LogWarning("Parallel export doesn't support octree tiling yet, exporting in this process")
+		args.workers = 1
+
+	# Hand over to the coordinator or worker side of a parallel export
+	if args.worker_unit or args.workers > 1:
+		try:
+			if args.worker_unit:
+				summary = RunWorker(collection, args.worker_unit)
+			else:
+				summary = RunParallelExport(collection, args.workers)
+		except Exception as e:
+			LogError(traceback.format_exc())
+			summary = {"status": "FAILED", "error": str(e)}
+
+		WriteSummary(summary, args.summary)
+		return EXIT_OK if summary["status"] == "FINISHED" else EXIT_FAILED
+
+	# Run every tile in one go, there's no UI to keep responsive
+	session = SliceSession(collection, args.resume)
+	try:
+		session.Begin()
+		session.Step()
+		summary = session.Finish()
+	except Exception as e:
+		LogError(traceback.format_exc())
+		session.Cleanup()
+		summary = session.GetSummary("FAILED")
+		summary["error"] = str(e)
+		WriteSummary(summary, args.summary)
+		return EXIT_FAILED
+
+	WriteSummary(summary, args.summary)
+	return EXIT_OK
+
+
+def WriteSummary(summary: dict, file_path: str = None):
+	"""
+	Print the summary on a single line so it can be picked out of Blender's output, and optionally
+	write it to a file too.
+
+	:param summary: The summary of the run.
+	:type summary: dict
+
+	:param file_path: Path to also write the summary to, or None.
+	:type file_path: str
+	"""
+
+	from . logging import LogFlush
+
+	# Write out the buffered log first, so the summary is the last thing printed
+	LogFlush()
+
+	print(SUMMARY_PREFIX, json.dumps(summary), flush=True)
+
+	if file_path:
+		with open(file_path, "w") as file:
+			json.dump(summary, file, indent="\t")
+
+
+
+# ██████╗  ██████╗  ██████╗ ████████╗███████╗████████╗██████╗  █████╗ ██████╗
+# ██╔══██╗██╔═══██╗██╔═══██╗╚══██╔══╝██╔════╝╚══██╔══╝██╔══██╗██╔══██╗██╔══██╗
+# ██████╔╝██║   ██║██║   ██║   ██║   ███████╗   ██║   ██████╔╝███████║██████╔╝
+# ██╔══██╗██║   ██║██║   ██║   ██║   ╚════██║   ██║   ██╔══██╗██╔══██║██╔═══╝
+# ██████╔╝╚██████╔╝╚██████╔╝   ██║   ███████║   ██║   ██║  ██║██║  ██║██║
+# ╚═════╝  ╚═════╝  ╚═════╝    ╚═╝   ╚══════╝   ╚═╝   ╚═╝  ╚═╝╚═╝  ╚═╝╚═╝
+#
+
+if __name__ == "__main__":
+	# When run with --python this file isn't part of the addon package, so import the package from
+	# the folder it lives in and hand over to the copy of this module inside it
+	addon_dir = os.path.dirname(os.path.abspath(__file__))
+	sys.path.insert(0, os.path.dirname(addon_dir))
+
+	addon = importlib.import_module(os.path.basename(addon_dir))
+
+	# The addon won't be registered if it isn't enabled in the user preferences
+	if not hasattr(bpy.types.Scene, "ss_settings"):
+		addon.register()
+
+	headless = importlib.import_module(addon.__name__ + ".headless")
+	sys.exit(headless.RunHeadless(GetScriptArgs()))
@@ -0,0 +1,455 @@
+import bpy
+import hashlib
+import json
+import numpy as np
+import os
+
+from . export		import ExportDataToJSON, GetExportPath
+from . spatialIndex	import GetObjectsInTile
+
+
+
+#  ██████╗ ██████╗ ███╗   ██╗███████╗████████╗ █████╗ ███╗   ██╗████████╗███████╗
+# ██╔════╝██╔═══██╗████╗  ██║██╔════╝╚══██╔══╝██╔══██╗████╗  ██║╚══██╔══╝██╔════╝
+# ██║     ██║   ██║██╔██╗ ██║███████╗   ██║   ███████║██╔██╗ ██║   ██║   ███████╗
+# ██║     ██║   ██║██║╚██╗██║╚════██║   ██║   ██╔══██║██║╚██╗██║   ██║   ╚════██║
+# ╚██████╗╚██████╔╝██║ ╚████║███████║   ██║   ██║  ██║██║ ╚████║   ██║   ███████║
+#  ╚═════╝ ╚═════╝ ╚═╝  ╚═══╝╚══════╝   ╚═╝   ╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝   ╚══════╝
+#
+
+MANIFEST_NAME    = "tileset.manifest.json"
+MANIFEST_VERSION = 2
+
+# Custom property used to tag sliced objects with the tile they belong to
+TILE_PROPERTY = "ss_tile"
+
+# Settings that change the exported tiles. Anything else (eg tile order, frame budget) only
+# changes how the export runs, so doesn't invalidate the tiles
+EXPORT_SETTINGS = [
+	"tile_dimensions",
+	"slice_method",
+	"tiling_mode",
+	"octree_tri_budget",
+	"octree_max_level",
+	"duplicate_method",
+	"bool_solver",
+	"skip_colliders",
+	"use_draco",
+	"swizzle_yz",
+	"gltf_writer",
+	"export_format",
+	"output_prefix",
+	"export_origin",
+	"use_lods",
+	"lod_ratios",
+]
+
+# Properties that only affect the UI or are Blender's own bookkeeping, so are left out of
+# fingerprints. Read-only properties (eg session_uid, users, execution_time) and is_* flags
+# are left out too, as they change from run to run without the content changing
+IGNORED_PROPERTIES = {
+	"tag",
+	"use_fake_user",
+	"use_extra_user",
+	"rna_type",
+	"select",
+	"location",
+	"width",
+	"height",
+	"dimensions",
+	"show_expanded",
+	"show_options",
+	"show_preview",
+	"show_in_editmode",
+	"show_on_cage",
+	"is_active",
+}
+
+
+
+# ███████╗██╗███╗   ██╗ ██████╗ ███████╗██████╗ ██████╗ ██████╗ ██╗███╗   ██╗████████╗███████╗
+# ██╔════╝██║████╗  ██║██╔════╝ ██╔════╝██╔══██╗██╔══██╗██╔══██╗██║████╗  ██║╚══██╔══╝██╔════╝
+# █████╗  ██║██╔██╗ ██║██║  ███╗█████╗  ██████╔╝██████╔╝██████╔╝██║██╔██╗ ██║   ██║   ███████╗
+# ██╔══╝  ██║██║╚██╗██║██║   ██║██╔══╝  ██╔══██╗██╔═══╝ ██╔══██╗██║██║╚██╗██║   ██║   ╚════██║
+# ██║     ██║██║ ╚████║╚██████╔╝███████╗██║  ██║██║     ██║  ██║██║██║ ╚████║   ██║   ███████║
+# ╚═╝     ╚═╝╚═╝  ╚═══╝ ╚═════╝ ╚══════╝╚═╝  ╚═╝╚═╝     ╚═╝  ╚═╝╚═╝╚═╝  ╚═══╝   ╚═╝   ╚══════╝
+#
+
+def GetTileKey(tile_index: tuple[int, int, int]) -> str:
+	"""
+	Get the key used for a tile in the manifest and the TILE_PROPERTY of its sliced objects.
+
+	:param tile_index: The index of the tile.
+	:type tile_index: tuple[int, int, int]
+
+	:return: The tile key, eg "1_0_2".
+	:rtype: str
+	"""
+
+	return "_".join(str(i) for i in tile_index)
+
+
+def GetValueString(value) -> str:
+	"""
+	Get a stable string for a property value. Blender arrays don't repr their contents, so they
+	are converted to tuples first.
+
+	:param value: The property value.
+	:type value: any
+
+	:return: A string that only changes when the value does.
+	:rtype: str
+	"""
+
+	if isinstance(value, str):
+		return value
+
+	try:
+		return repr(tuple(value))
+	except TypeError:
+		return repr(value)
+
+
+def HashProperties(hasher, struct):
+	"""
+	Add the values of a struct's simple properties to a hash, eg the settings of a modifier. ID
+	pointers are added by name, for objects their transform too and for images their file.
+
+	:param hasher: The hash to update.
+	:type hasher: hashlib._Hash
+
+	:param struct: The struct to hash, eg a modifier, material or node.
+	:type struct: bpy.types.bpy_struct
+	"""
+
+	# The struct type stands in for read-only properties like a modifier's type
+	hasher.update(struct.bl_rna.identifier.encode())
+
+	for prop in struct.bl_rna.properties:
+		if prop.identifier in IGNORED_PROPERTIES or prop.identifier.startswith("is_"):
+			continue
+		if prop.is_readonly or prop.type == 'COLLECTION':
+			continue
+
+		value = getattr(struct, prop.identifier, None)
+
+		if prop.type == 'POINTER':
+			if isinstance(value, bpy.types.ID):
+				hasher.update(value.name.encode())
+				if isinstance(value, bpy.types.Object):
+					hasher.update(GetValueString(value.matrix_world).encode())
+				elif isinstance(value, bpy.types.Image):
+					HashImage(hasher, value)
+			continue
+
+		hasher.update(prop.identifier.encode())
+		hasher.update(GetValueString(value).encode())
+
+
+def HashImage(hasher, image: bpy.types.Image):
+	"""
+	Add an image's contents to a hash, so editing or replacing the image changes the fingerprint
+	even though its name doesn't. Packed images are hashed by their data, and images on disk by
+	their path, size and modification time. Unsaved edits are hashed by their pixels.
+
+	:param hasher: The hash to update.
+	:type hasher: hashlib._Hash
+
+	:param image: The image to hash.
+	:type image: bpy.types.Image
+	"""
+
+	hasher.update(image.source.encode())
+	hasher.update(image.filepath.encode())
+
+	if image.packed_file:
+		hasher.update(hashlib.sha1(image.packed_file.data).digest())
+	else:
+		file_path = bpy.path.abspath(image.filepath, library=image.library)
+		if os.path.isfile(file_path):
+			stat = os.stat(file_path)
+			hasher.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+
+	if image.is_dirty and image.has_data:
+		pixels = np.empty(len(image.pixels), dtype=np.float32)
+		image.pixels.foreach_get(pixels)
+		hasher.update(pixels.tobytes())
+
+
+def HashMesh(hasher, mesh: bpy.types.Mesh):
+	"""
+	Add a mesh's geometry, shading and UVs to a hash, read in bulk with foreach_get.
+
+	:param hasher: The hash to update.
+	:type hasher: hashlib._Hash
+
+	:param mesh: The mesh to hash.
+	:type mesh: bpy.types.Mesh
+	"""
+
+	layers = [
+		(mesh.vertices, "co",             3, np.float32),
+		(mesh.edges,    "use_edge_sharp", 1, bool),
+		(mesh.loops,    "vertex_index",   1, np.int32),
+		(mesh.polygons, "loop_total",     1, np.int32),
+		(mesh.polygons, "material_index", 1, np.int32),
+		(mesh.polygons, "use_smooth",     1, bool),
+	]
+	layers += [(uv_layer.data, "uv", 2, np.float32) for uv_layer in mesh.uv_layers]
+
+	for collection, attribute, size, dtype in layers:
+		data = np.empty(len(collection) * size, dtype=dtype)
+		collection.foreach_get(attribute, data)
+		hasher.update(data.tobytes())
+
+
+def GetObjectFingerprint(obj: bpy.types.Object) -> str:
+	"""
+	Get a fingerprint of everything about an object that affects its exported tiles: its name,
+	transform, mesh data, modifiers and materials.
+
+	:param obj: The object to fingerprint.
+	:type obj: bpy.types.Object
+
+	:return: The fingerprint, as a hex digest.
+	:rtype: str
+	"""
+
+	hasher = hashlib.sha1()
+	hasher.update(obj.name.encode())
+	hasher.update(GetValueString(obj.matrix_world).encode())
+
+	if obj.type == 'MESH':
+		HashMesh(hasher, obj.data)
+
+	for mod in obj.modifiers:
+		HashProperties(hasher, mod)
+
+	for slot in obj.material_slots:
+		mat = slot.material
+		if not mat:
+			continue
+
+		HashProperties(hasher, mat)
+
+		if mat.use_nodes and mat.node_tree:
+			for node in mat.node_tree.nodes:
+				hasher.update(node.name.encode())
+				HashProperties(hasher, node)
+
+				for socket in node.inputs:
+					if hasattr(socket, "default_value"):
+						hasher.update(GetValueString(socket.default_value).encode())
+
+			for link in mat.node_tree.links:
+				hasher.update(f"{link.from_node.name}.{link.from_socket.identifier}>{link.to_node.name}.{link.to_socket.identifier}".encode())
+
+	return hasher.hexdigest()
+
+
+def GetSettingsFingerprint(ss_settings) -> str:
+	"""
+	Get a fingerprint of the settings that change the exported tiles, see EXPORT_SETTINGS.
+
+	:param ss_settings: The scene slicer settings.
+	:type ss_settings: SceneSlicerSettings
+
+	:return: The fingerprint, as a hex digest.
+	:rtype: str
+	"""
+
+	hasher = hashlib.sha1()
+	for key in EXPORT_SETTINGS:
+		hasher.update(key.encode())
+		hasher.update(GetValueString(getattr(ss_settings, key)).encode())
+
+	return hasher.hexdigest()
+
+
+
+# ███╗   ███╗ █████╗ ███╗   ██╗██╗███████╗███████╗███████╗████████╗
+# ████╗ ████║██╔══██╗████╗  ██║██║██╔════╝██╔════╝██╔════╝╚══██╔══╝
+# ██╔████╔██║███████║██╔██╗ ██║██║█████╗  █████╗  ███████╗   ██║
+# ██║╚██╔╝██║██╔══██║██║╚██╗██║██║██╔══╝  ██╔══╝  ╚════██║   ██║
+# ██║ ╚═╝ ██║██║  ██║██║ ╚████║██║██║     ███████╗███████║   ██║
+# ╚═╝     ╚═╝╚═╝  ╚═╝╚═╝  ╚═══╝╚═╝╚═╝     ╚══════╝╚══════╝   ╚═╝
+#
+
+class TileManifest:
+	"""
+	Tracks a fingerprint for each tile so an export can skip the tiles that haven't changed
+	since the last one.
+
+	A tile's fingerprint covers its index and bounds, the export settings, and the
+	fingerprints of every object overlapping it. The fingerprints and results of the last
+	export are stored in MANIFEST_NAME, beside tileset.json.
+
+	:param spatial_index: The spatial index, as returned by BuildSpatialIndex.
+	:type spatial_index: dict[str, object]
+
+	:param tileset_data: The tileset data, as returned by CreateTilesetFromCollection.
+	:type tileset_data: dict
+	"""
+
+	def __init__(self, spatial_index: dict[str, object], tileset_data: dict):
+		# Get scene slicer settings
+		ss_settings = bpy.context.scene.ss_settings
+
+		self.spatial_index = spatial_index
+		self.tileset_data  = tileset_data
+		self.export_format = ss_settings.export_format
+		self.settings      = GetSettingsFingerprint(ss_settings)
+		self.path          = GetExportPath(MANIFEST_NAME)
+
+		self.previous_tiles      = self.Load()
+		self.tiles               = {}
+		self.object_fingerprints = {}
+		self.tile_fingerprints   = {}
+
+
+	def Load(self) -> dict:
+		"""
+		Read the tiles from the last export's manifest. A missing or unreadable manifest, or one
+		from another version, just means every tile is exported.
+
+		:return: The previous tile entries, keyed by tile key.
+		:rtype: dict
+		"""
+
+		if not os.path.exists(self.path):
+			return {}
+
+		try:
+			with open(self.path, "r") as file:
+				manifest = json.load(file)
+		except (OSError, ValueError):
+			return {}
+
+		if manifest.get("version") != MANIFEST_VERSION:
+			return {}
+
+		return manifest.get("tiles", {})
+
+
+	def GetTileFingerprint(self, tile_index: tuple[int, int, int]) -> str:
+		"""
+		Get the fingerprint of a tile, fingerprinting each of its objects the first time it's seen.
+
+		:param tile_index: The index of the tile.
+		:type tile_index: tuple[int, int, int]
+
+		:return: The fingerprint, as a hex digest.
+		:rtype: str
+		"""
+
+		if tile_index in self.tile_fingerprints:
+			return self.tile_fingerprints[tile_index]
+
+		x, y, z   = tile_index
+		tile_data = self.tileset_data["tiles"][x][y][z]
+
+		hasher = hashlib.sha1()
+		hasher.update(self.settings.encode())
+		hasher.update(GetValueString((GetTileKey(tile_index), tile_data["pos_min"], tile_data["pos_max"])).encode())
+
+		object_fingerprints = []
+		for obj in GetObjectsInTile(self.spatial_index, tile_index):
+			if obj not in self.object_fingerprints:
+				self.object_fingerprints[obj] = GetObjectFingerprint(obj)
+			object_fingerprints.append(self.object_fingerprints[obj])
+
+		for fingerprint in sorted(object_fingerprints):
+			hasher.update(fingerprint.encode())
+
+		self.tile_fingerprints[tile_index] = hasher.hexdigest()
+		return self.tile_fingerprints[tile_index]
+
+
+	def IsUnchanged(self, tile_index: tuple[int, int, int]) -> bool:
+		"""
+		Check whether a tile matches the last export, and its file is still there.
+
+		:param tile_index: The index of the tile.
+		:type tile_index: tuple[int, int, int]
+
+		:return: True if the tile can be skipped.
+		:rtype: bool
+		"""
+
+		previous = self.previous_tiles.get(GetTileKey(tile_index))
+		if not previous or previous["fingerprint"] != self.GetTileFingerprint(tile_index):
+			return False
+
+		# Tiles that had no tris don't have a file
+		if previous["src"] is None:
+			return True
+
+		# Along with its LOD files, the first level is the tile itself
+		sources   = [lod["src"] for lod in previous.get("lods", [])] or [previous["src"]]
+		extension = ".glb" if self.export_format == "GLB" else ".gltf"
+		return all(os.path.exists(GetExportPath(src + extension)) for src in sources)
+
+
+	def GetPreviousSrc(self, tile_index: tuple[int, int, int]) -> str:
+		"""
+		Get the src a tile was given by the last export.
+
+		:param tile_index: The index of the tile.
+		:type tile_index: tuple[int, int, int]
+
+		:return: The glTF file name, or None if the tile was skipped.
+		:rtype: str
+		"""
+
+		return self.previous_tiles[GetTileKey(tile_index)]["src"]
+
+
+	def GetPreviousLods(self, tile_index: tuple[int, int, int]) -> list[dict]:
+		"""
+		Get the LOD levels a tile was given by the last export.
+
+		:param tile_index: The index of the tile.
+		:type tile_index: tuple[int, int, int]
+
+		:return: The LOD levels, or None if LODs were disabled.
+		:rtype: list[dict]
+		"""
+
+		return self.previous_tiles[GetTileKey(tile_index)].get("lods")
+
+
+	def Record(self, tile_index: tuple[int, int, int], src: str, lods: list[dict] = None):
+		"""
+		Record the result of a tile for the next export.
+
+		:param tile_index: The index of the tile.
+		:type tile_index: tuple[int, int, int]
+
+		:param src: The glTF file name, or None if the tile was skipped.
+		:type src: str
+
+		:param lods: The tile's LOD levels, as returned by ExportTileLods, or None if LODs are disabled.
+		:type lods: list[dict]
+		"""
+
+		self.tiles[GetTileKey(tile_index)] = {
+			"fingerprint": self.GetTileFingerprint(tile_index),
+			"src"        : src,
+		}
+
+		if lods:
+			self.tiles[GetTileKey(tile_index)]["lods"] = lods
+
+
+	def Save(self):
+		"""
+		Write the recorded tiles to the manifest, replacing the last export's.
+		"""
+
+		manifest = {
+			"version" : MANIFEST_VERSION,
+			"settings": self.settings,
+			"tiles"   : self.tiles,
+		}
+
+		ExportDataToJSON(manifest, self.path, True)
@@ -0,0 +1,161 @@
+import bpy
+import os
+
+from . checkpoint	import GetTileFiles
+from . export		import ExportObjectsToGLtf, GetExportPath
+from . logging		import LogWarning
+from . triCounts	import GetEvaluatedTriCount
+
+
+
+#  ██████╗ ██████╗ ███╗   ██╗███████╗████████╗ █████╗ ███╗   ██╗████████╗███████╗
+# ██╔════╝██╔═══██╗████╗  ██║██╔════╝╚══██╔══╝██╔══██╗████╗  ██║╚══██╔══╝██╔════╝
+# ██║     ██║   ██║██╔██╗ ██║███████╗   ██║   ███████║██╔██╗ ██║   ██║   ███████╗
+# ██║     ██║   ██║██║╚██╗██║╚════██║   ██║   ██╔══██║██║╚██╗██║   ██║   ╚════██║
+# ╚██████╗╚██████╔╝██║ ╚████║███████║   ██║   ██║  ██║██║ ╚████║   ██║   ███████║
+#  ╚═════╝ ╚═════╝ ╚═╝  ╚═══╝╚══════╝   ╚═╝   ╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝   ╚══════╝
+#
+
+# Name of the temporary modifier used to decimate the sliced objects
+LOD_MODIFIER_NAME = "SS_LOD_Decimate"
+
+
+
+# ██╗      ██████╗ ██████╗     ███████╗███████╗████████╗████████╗██╗███╗   ██╗ ██████╗ ███████╗
+# ██║     ██╔═══██╗██╔══██╗    ██╔════╝██╔════╝╚══██╔══╝╚══██╔══╝██║████╗  ██║██╔════╝ ██╔════╝
+# ██║     ██║   ██║██║  ██║    ███████╗█████╗     ██║      ██║   ██║██╔██╗ ██║██║  ███╗███████╗
+# ██║     ██║   ██║██║  ██║    ╚════██║██╔══╝     ██║      ██║   ██║██║╚██╗██║██║   ██║╚════██║
+# ███████╗╚██████╔╝██████╔╝    ███████║███████╗   ██║      ██║   ██║██║ ╚████║╚██████╔╝███████║
+# ╚══════╝ ╚═════╝ ╚═════╝     ╚══════╝╚══════╝   ╚═╝      ╚═╝   ╚═╝╚═╝  ╚═══╝ ╚═════╝ ╚══════╝
+#
+
+def GetLodRatios(ss_settings) -> list[float]:
+	"""
+	Read the LOD ratios from the settings. Values that aren't a number between 0 and 1 are
+	ignored, and the rest are sorted from most to least detailed.
+
+	:param ss_settings: The scene slicer settings.
+	:type ss_settings: SceneSlicerSettings
+
+	:return: The ratio of triangles to keep for each LOD level after the full detail one, empty if LODs are disabled.
+	:rtype: list[float]
+	"""
+
+	if not ss_settings.use_lods:
+		return []
+
+	ratios = set()
+	for value in ss_settings.lod_ratios.replace(";", ",").split(","):
+		value = value.strip()
+		if not value:
+			continue
+
+		try:
+			ratio = float(value)
+		except ValueError:
+			LogWarning("Ignoring LOD ratio", repr(value), "- not a number")
+			continue
+
+		if not 0 < ratio < 1:
+			LogWarning("Ignoring LOD ratio", value, "- must be between 0 and 1")
+			continue
+
+		ratios.add(ratio)
+
+	return sorted(ratios, reverse=True)
+
+
+
+# ██╗      ██████╗ ██████╗     ███████╗██╗  ██╗██████╗  ██████╗ ██████╗ ████████╗
+# ██║     ██╔═══██╗██╔══██╗    ██╔════╝╚██╗██╔╝██╔══██╗██╔═══██╗██╔══██╗╚══██╔══╝
+# ██║     ██║   ██║██║  ██║    █████╗   ╚███╔╝ ██████╔╝██║   ██║██████╔╝   ██║
+# ██║     ██║   ██║██║  ██║    ██╔══╝   ██╔██╗ ██╔═══╝ ██║   ██║██╔══██╗   ██║
+# ███████╗╚██████╔╝██████╔╝    ███████╗██╔╝ ██╗██║     ╚██████╔╝██║  ██║   ██║
+# ╚══════╝ ╚═════╝ ╚═════╝     ╚══════╝╚═╝  ╚═╝╚═╝      ╚═════╝ ╚═╝  ╚═╝   ╚═╝
+#
+
+def ExportTileLods(
+	objects: list[bpy.types.Object],
+	src    : str,
+	ratios : list[float]
+) -> list[dict]:
+	"""
+	Export decimated copies of a tile that has just been exported at full detail.
+
+	The tile's sliced objects are reused for every level: a Decimate modifier is added to them
+	and only its ratio changes between levels, so nothing is sliced or duplicated again. Both glTF
+	writers apply modifiers, so each level is decimated from the full detail mesh. The modifier
+	is removed again afterwards.
+
+	:param objects: The tile's sliced objects, as exported to src.
+	:type objects: list[bpy.types.Object]
+
+	:param src: The glTF file name of the full detail tile, without an extension.
+	:type src: str
+
+	:param ratios: The ratio of triangles to keep for each level, as returned by GetLodRatios.
+	:type ratios: list[float]
+
+	:return: An entry for each level, starting with the full detail tile, with its src, ratio, triangle count and file size in bytes.
+	:rtype: list[dict]
+	"""
+
+	lods = [GetLodData(objects, src, 1.0)]
+
+	modifiers = [
+		(obj, obj.modifiers.new(name=LOD_MODIFIER_NAME, type='DECIMATE'))
+		for obj in objects
+		if obj.type == 'MESH'
+	]
+
+	try:
+		for level, ratio in enumerate(ratios, 1):
+			for obj, mod in modifiers:
+				mod.decimate_type            = 'COLLAPSE'
+				mod.ratio                    = ratio
+				mod.use_collapse_triangulate = True
+
+			lod_src = f"{src}_lod{level}"
+			ExportObjectsToGLtf(objects, lod_src)
+			lods.append(GetLodData(objects, lod_src, ratio))
+
+	finally:
+		for obj, mod in modifiers:
+			obj.modifiers.remove(mod)
+
+	return lods
+
+
+def GetLodData(
+	objects: list[bpy.types.Object],
+	src    : str,
+	ratio  : float
+) -> dict:
+	"""
+	Get the tileset entry for an exported LOD level.
+
+	:param objects: The objects that were exported, with any Decimate modifier still in place.
+	:type objects: list[bpy.types.Object]
+
+	:param src: The glTF file name of the level, without an extension.
+	:type src: str
+
+	:param ratio: The ratio of triangles the level was decimated to.
+	:type ratio: float
+
+	:return: The level's src, ratio, triangle count and total file size in bytes.
+	:rtype: dict
+	"""
+
+	size = 0
+	for file_name in GetTileFiles(src):
+		file_path = GetExportPath(file_name)
+		if os.path.exists(file_path):
+			size += os.path.getsize(file_path)
+
+	return {
+		"src"  : src,
+		"ratio": ratio,
+		"tris" : GetEvaluatedTriCount(objects),
+		"bytes": size,
+	}
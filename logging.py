@@ -1,4 +1,11 @@
+import atexit
 import bpy
+import json
+import os
+import threading
+import time
+
+from collections import deque
 
 
 
@@ -10,26 +17,311 @@ import bpy
 # ╚══════╝ ╚═════╝  ╚═════╝  ╚═════╝ ╚═╝╚═╝  ╚═══╝ ╚═════╝
 #
 
+# Name of the text block the log is mirrored to, and of the log file in the output folder
 LOG_PATH = "scene_slicer.log"
 
-def Log(*args):
+# Log levels, matching the standard library's
+DEBUG   = 10
+INFO    = 20
+WARNING = 30
+ERROR   = 40
+
+LEVEL_NAMES = {
+	DEBUG  : "DEBUG",
+	INFO   : "INFO",
+	WARNING: "WARNING",
+	ERROR  : "ERROR",
+}
+
+LEVELS_BY_NAME = {name: level for level, name in LEVEL_NAMES.items()}
+
+# How many records are kept in memory, oldest first out
+LOG_BUFFER_SIZE = 10000
+
+# How often, in seconds, the background thread writes buffered records out
+LOG_FLUSH_INTERVAL = 1.0
+
+# Size, in bytes, the log file can grow to before it's rotated, and how many old files are kept
+LOG_FILE_SIZE  = 5 * 1024 * 1024
+LOG_FILE_COUNT = 3
+
+
+
+# ██████╗  █████╗  ██████╗██╗  ██╗███████╗███╗   ██╗██████╗
+# ██╔══██╗██╔══██╗██╔════╝██║ ██╔╝██╔════╝████╗  ██║██╔══██╗
+# ██████╔╝███████║██║     █████╔╝ █████╗  ██╔██╗ ██║██║  ██║
+# ██╔══██╗██╔══██║██║     ██╔═██╗ ██╔══╝  ██║╚██╗██║██║  ██║
+# ██████╔╝██║  ██║╚██████╗██║  ██╗███████╗██║ ╚████║██████╔╝
+# ╚═════╝ ╚═╝  ╚═╝ ╚═════╝╚═╝  ╚═╝╚══════╝╚═╝  ╚═══╝╚═════╝
+#
+
+class LogBackend:
+	"""
+	Buffers log records in memory and writes them out on a background thread, so logging doesn't
+	hold up the export. Records below the level are dropped before their message is even built.
+
+	Records are printed to the console and appended to a rotating log file, as plain text or as
+	JSON lines. They're only mirrored to a Blender text block if asked to, as writing to a text
+	block is slow and can only be done from the main thread.
 	"""
-	Prints the log message composed of the provided arguments and writes it to the LOG_TXT file.
+
+	def __init__(self):
+		self.level       = INFO
+		self.json_lines  = False
+		self.mirror_text = False
+		self.file_path   = None
+
+		# The last LOG_BUFFER_SIZE records, and those not yet written out
+		self.records = deque(maxlen=LOG_BUFFER_SIZE)
+		self.pending = []
+
+		self.lock       = threading.Lock()
+		self.flush_lock = threading.Lock()
+		self.wake       = threading.Event()
+		self.thread     = None
+
+
+	def Configure(self, level: int, json_lines: bool, mirror_text: bool, file_path: str | None):
+		"""
+		Set how records are filtered and written. Anything still buffered is written out first,
+		to the previous log file.
+
+		Args:
+		level: The lowest level to record.
+		json_lines: Whether to write records to the log file as JSON lines instead of text.
+		mirror_text: Whether to also write records to the LOG_PATH text block.
+		file_path: The log file to write to, or None to only print to the console.
+		"""
+
+		self.Flush()
+
+		self.level       = level
+		self.json_lines  = json_lines
+		self.mirror_text = mirror_text
+		self.file_path   = file_path
+
+
+	def Write(self, level: int, args: tuple):
+		"""
+		Record a message, if it's at or above the level.
+
+		Args:
+		level: The level of the message.
+		args: The values making up the message, joined with spaces.
+		"""
+
+		if level < self.level:
+			return
+
+		message = ' '.join(f"{arg:.6f}" if isinstance(arg, float) else str(arg) for arg in args)
+		record  = (time.time(), level, threading.current_thread().name, message)
+
+		with self.lock:
+			self.records.append(record)
+			self.pending.append(record)
+
+		if self.mirror_text and threading.current_thread() is threading.main_thread():
+			if LOG_PATH not in bpy.data.texts:
+				LOG_TXT = bpy.data.texts.new(LOG_PATH)
+			else:
+				LOG_TXT = bpy.data.texts[LOG_PATH]
+
+			LOG_TXT.write(GetLogLine(level, message) + '\n')
+
+		if self.thread is None or not self.thread.is_alive():
+			self.thread = threading.Thread(target=self.Run, name="SceneSlicerLog", daemon=True)
+			self.thread.start()
+
+		if level >= ERROR:
+			self.wake.set()
+
+
+	def Run(self):
+		"""
+		Write the buffered records out every LOG_FLUSH_INTERVAL seconds, or straight away after
+		an error. Runs on the background thread.
+		"""
+
+		while True:
+			self.wake.wait(LOG_FLUSH_INTERVAL)
+			self.wake.clear()
+			self.Flush()
+
+
+	def Flush(self):
+		"""
+		Write any buffered records to the console and the log file.
+		"""
+
+		with self.flush_lock:
+			with self.lock:
+				records, self.pending = self.pending, []
+
+			if not records:
+				return
+
+			print('\n'.join(GetLogLine(level, message) for timestamp, level, thread, message in records), flush=True)
+
+			if not self.file_path:
+				return
+
+			if self.json_lines:
+				lines = [
+					json.dumps({"time": timestamp, "level": LEVEL_NAMES[level], "thread": thread, "message": message})
+					for timestamp, level, thread, message in records
+				]
+			else:
+				lines = [
+					f"{time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(timestamp))}.{int(timestamp % 1 * 1000):03d} {LEVEL_NAMES[level]:<7} {message}"
+					for timestamp, level, thread, message in records
+				]
+
+			try:
+				os.makedirs(os.path.dirname(self.file_path), exist_ok=True)
+				self.Rotate()
+
+				with open(self.file_path, "a", encoding="utf-8") as file:
+					file.write('\n'.join(lines) + '\n')
+
+			except OSError as e:
+				print("Couldn't write to the log file", self.file_path, "-", e)
+				self.file_path = None
+
+
+	def Rotate(self):
+		"""
+		Rotate the log file once it's grown past LOG_FILE_SIZE: scene_slicer.log becomes
+		scene_slicer.log.1, and so on, keeping LOG_FILE_COUNT old files.
+		"""
+
+		if not os.path.exists(self.file_path) or os.path.getsize(self.file_path) < LOG_FILE_SIZE:
+			return
+
+		for i in range(LOG_FILE_COUNT - 1, 0, -1):
+			if os.path.exists(f"{self.file_path}.{i}"):
+				os.replace(f"{self.file_path}.{i}", f"{self.file_path}.{i + 1}")
+
+		os.replace(self.file_path, f"{self.file_path}.1")
+
+
+	def GetRecords(self, level: int = DEBUG) -> list[tuple]:
+		"""
+		Get the records still held in memory.
+
+		Args:
+		level: The lowest level to include.
+
+		Returns:
+		list[tuple]: The records, oldest first, each as (time, level, thread name, message).
+		"""
+
+		with self.lock:
+			return [record for record in self.records if record[1] >= level]
+
+
+def GetLogLine(level: int, message: str) -> str:
+	"""
+	Get the line a record is shown as in the console and the text block, with its level in front
+	unless it's INFO.
+
+	Args:
+	level: The level of the record.
+	message: The message of the record.
+
+	Returns:
+	str: The line to show.
+	"""
+
+	return message if level == INFO else f"{LEVEL_NAMES[level]}: {message}"
+
+
+backend = LogBackend()
+
+# Write out anything still buffered when Blender quits
+atexit.register(backend.Flush)
+
+
+
+# ██╗      ██████╗  ██████╗     ███████╗██╗   ██╗███╗   ██╗ ██████╗████████╗██╗ ██████╗ ███╗   ██╗███████╗
+# ██║     ██╔═══██╗██╔════╝     ██╔════╝██║   ██║████╗  ██║██╔════╝╚══██╔══╝██║██╔═══██╗████╗  ██║██╔════╝
+# ██║     ██║   ██║██║  ███╗    █████╗  ██║   ██║██╔██╗ ██║██║        ██║   ██║██║   ██║██╔██╗ ██║███████╗
+# ██║     ██║   ██║██║   ██║    ██╔══╝  ██║   ██║██║╚██╗██║██║        ██║   ██║██║   ██║██║╚██╗██║╚════██║
+# ███████╗╚██████╔╝╚██████╔╝    ██║     ╚██████╔╝██║ ╚████║╚██████╗   ██║   ██║╚██████╔╝██║ ╚████║███████║
+# ╚══════╝ ╚═════╝  ╚═════╝     ╚═╝      ╚═════╝ ╚═╝  ╚═══╝ ╚═════╝   ╚═╝   ╚═╝ ╚═════╝ ╚═╝  ╚═══╝╚══════╝
+#
+
+def Log(*args, level: int = INFO):
+	"""
+	Log a message composed of the provided arguments. It's printed to the console and written to
+	the log file shortly after, by a background thread.
+
+	Args:
+	*args: Variable number of arguments to be included in the log message.
+	level: The level of the message, INFO by default.
+	"""
+
+	if level >= backend.level:
+		backend.Write(level, args)
+
+def LogDebug(*args):
+	"""
+	Log a detailed message, only recorded when the log level is DEBUG. Cheap enough to leave in
+	hot loops, as nothing is formatted when it's filtered out.
 
 	Args:
 	*args: Variable number of arguments to be included in the log message.
 	"""
 
-	if LOG_PATH not in bpy.data.texts:
-		LOG_TXT = bpy.data.texts.new(LOG_PATH)
-	else:
-		LOG_TXT = bpy.data.texts[LOG_PATH]
+	if DEBUG >= backend.level:
+		backend.Write(DEBUG, args)
+
+def LogWarning(*args):
+	"""
+	Log a message about something that didn't go as asked, but that the export carried on from.
+
+	Args:
+	*args: Variable number of arguments to be included in the log message.
+	"""
+
+	backend.Write(WARNING, args)
+
+def LogError(*args):
+	"""
+	Log a message about something that failed. Errors are written out straight away.
+
+	Args:
+	*args: Variable number of arguments to be included in the log message.
+	"""
+
+	backend.Write(ERROR, args)
+
+def LogFlush():
+	"""
+	Write out any buffered log records now, eg before printing a summary after them.
+	"""
+
+	backend.Flush()
+
+def LogReset(log_file: bool = True):
+	"""
+	Start a new log for an export: apply the log settings, with the log file in the output
+	folder, and clear the records held in memory and the text block.
+
+	Args:
+	log_file: Whether to write to the log file, eg parallel export workers leave it to the coordinator.
+	"""
+
+	ss_settings = bpy.context.scene.ss_settings
+
+	backend.Configure(
+		level       = LEVELS_BY_NAME[ss_settings.log_level],
+		json_lines  = ss_settings.log_format == "JSON",
+		mirror_text = ss_settings.log_to_text,
+		file_path   = os.path.join(bpy.path.abspath(ss_settings.output_path), LOG_PATH) if log_file else None,
+	)
 
-	formatted_args = [f"{arg:.6f}" if isinstance(arg, float) else str(arg) for arg in args]
-	message = ' '.join(formatted_args)
-	print(message)
-	LOG_TXT.write(message + '\n')
+	with backend.lock:
+		backend.records.clear()
 
-def LogReset():
 	if LOG_PATH in bpy.data.texts:
-		bpy.data.texts[LOG_PATH].clear()
\ No newline at end of file
+		bpy.data.texts[LOG_PATH].clear()
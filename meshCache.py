@@ -0,0 +1,130 @@
+import bpy
+
+from collections import OrderedDict
+
+from . duplicate	import NewWorldMeshFromObject
+from . logging 		import Log
+
+# Prefix for the names of cached meshes, so they are easy to spot in the Blender File view
+CACHE_PREFIX = "SS_Cache."
+
+
+
+# ███╗   ███╗███████╗███████╗██╗  ██╗     ██████╗ █████╗  ██████╗██╗  ██╗███████╗
+# ████╗ ████║██╔════╝██╔════╝██║  ██║    ██╔════╝██╔══██╗██╔════╝██║  ██║██╔════╝
+# ██╔████╔██║█████╗  ███████╗███████║    ██║     ███████║██║     ███████║█████╗
+# ██║╚██╔╝██║██╔══╝  ╚════██║██╔══██║    ██║     ██╔══██║██║     ██╔══██║██╔══╝
+# ██║ ╚═╝ ██║███████╗███████║██║  ██║    ╚██████╗██║  ██║╚██████╗██║  ██║███████╗
+# ╚═╝     ╚═╝╚══════╝╚══════╝╚═╝  ╚═╝     ╚═════╝╚═╝  ╚═╝ ╚═════╝╚═╝  ╚═╝╚══════╝
+#
+
+def EstimateMeshBytes(mesh: bpy.types.Mesh) -> int:
+	"""
+	Roughly estimate how much memory a mesh uses, from its element counts.
+
+	:param mesh: The mesh to estimate.
+	:type mesh: bpy.types.Mesh
+
+	:return: The approximate size of the mesh in bytes.
+	:rtype: int
+	"""
+
+	return (
+		len(mesh.vertices) * 12 +
+		len(mesh.edges)    * 8  +
+		len(mesh.loops)    * (8 + 8 * len(mesh.uv_layers)) +
+		len(mesh.polygons) * 12
+	)
+
+
+class EvaluatedMeshCache:
+	"""
+	Least-recently-used cache of each object's evaluated, world-space mesh.
+
+	The mesh is evaluated on first use and shared by every tile that needs the object, so an object
+	straddling N tiles only has its modifier stack evaluated once. When the estimated size of the
+	cached meshes goes over the budget, the least recently used meshes are removed.
+
+	:param budget_bytes: The memory budget for cached meshes, in bytes. 0 disables caching.
+	:type budget_bytes: int
+	"""
+
+	def __init__(self, budget_bytes: int):
+		self.budget_bytes = budget_bytes
+		self.size_bytes   = 0
+		self.peak_bytes   = 0
+		self.hits         = 0
+		self.misses       = 0
+		self.evictions    = 0
+
+		# Maps objects to (mesh, size in bytes), least recently used first
+		self.entries = OrderedDict()
+
+
+	def Get(
+		self,
+		obj      : bpy.types.Object,
+		depsgraph: bpy.types.Depsgraph
+	) -> bpy.types.Mesh:
+		"""
+		Get the evaluated, world-space mesh of an object, evaluating and caching it if needed.
+		The mesh is owned by the cache and must not be modified or removed by the caller.
+
+		:param obj: The object to get the mesh for.
+		:type obj: bpy.types.Object
+
+		:param depsgraph: The evaluated depsgraph to read the object from.
+		:type depsgraph: bpy.types.Depsgraph
+
+		:return: The cached mesh.
+		:rtype: bpy.types.Mesh
+		"""
+
+		if obj in self.entries:
+			self.hits += 1
+			self.entries.move_to_end(obj)
+			return self.entries[obj][0]
+
+		self.misses += 1
+
+		mesh      = NewWorldMeshFromObject(obj, depsgraph)
+		mesh.name = CACHE_PREFIX + obj.name
+		size      = EstimateMeshBytes(mesh)
+
+		self.entries[obj] = (mesh, size)
+		self.size_bytes  += size
+		self.peak_bytes   = max(self.peak_bytes, self.size_bytes)
+
+		# Make room, always keeping the mesh we've just added so the caller can use it
+		while self.size_bytes > self.budget_bytes and len(self.entries) > 1:
+			self.Release(next(iter(self.entries)))
+			self.evictions += 1
+
+		return mesh
+
+
+	def Release(self, obj: bpy.types.Object) -> None:
+		"""
+		Remove an object's mesh from the cache, if it is there.
+
+		:param obj: The object to remove.
+		:type obj: bpy.types.Object
+		"""
+
+		if obj not in self.entries:
+			return
+
+		mesh, size = self.entries.pop(obj)
+		self.size_bytes -= size
+		bpy.data.meshes.remove(mesh)
+
+
+	def Clear(self) -> None:
+		"""
+		Remove every mesh from the cache and log how well it did.
+		"""
+
+		for obj in list(self.entries.keys()):
+			self.Release(obj)
+
+		Log("Mesh cache:", self.hits, "hits,", self.misses, "misses,", self.evictions, "evictions, peak", round(self.peak_bytes / (1024 * 1024), 2), "MB")
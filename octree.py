@@ -0,0 +1,273 @@
+import bpy
+import numpy as np
+
+from . logging	import Log
+from . tiles	import GetTilePositionMin, GetTilePositionMax
+
+
+
+# ██████╗ ██╗   ██╗██╗██╗     ██████╗      ██████╗  ██████╗████████╗██████╗ ███████╗███████╗
+# ██╔══██╗██║   ██║██║██║     ██╔══██╗    ██╔═══██╗██╔════╝╚══██╔══╝██╔══██╗██╔════╝██╔════╝
+# ██████╔╝██║   ██║██║██║     ██║  ██║    ██║   ██║██║        ██║   ██████╔╝█████╗  █████╗
+# ██╔══██╗██║   ██║██║██║     ██║  ██║    ██║   ██║██║        ██║   ██╔══██╗██╔══╝  ██╔══╝
+# ██████╔╝╚██████╔╝██║███████╗██████╔╝    ╚██████╔╝╚██████╗   ██║   ██║  ██║███████╗███████╗
+# ╚═════╝  ╚═════╝ ╚═╝╚══════╝╚═════╝      ╚═════╝  ╚═════╝   ╚═╝   ╚═╝  ╚═╝╚══════╝╚══════╝
+#
+
+def BuildOctree(
+	spatial_index: dict[str, object],
+	tileset_data : dict[str, object],
+	tri_budget   : int,
+	max_level    : int
+) -> dict[str, object]:
+	"""
+	Partition the tileset grid into an octree of tiles that adapt to how much is in them.
+
+	The grid from CreateTilesetFromCollection is the finest level, so tile_dimensions is the
+	smallest a tile can be. Starting from a root node covering the whole grid, nodes are
+	subdivided while they hold more than tri_budget triangles, and kept whole otherwise, so
+	sparse neighbouring cells are merged into a single tile up to 2^max_level cells across.
+	Nodes with nothing in them are dropped.
+
+	Triangle counts are estimated from the face counts of the objects before modifiers, with
+	each object's faces spread evenly over the grid cells its bounds overlap.
+
+	:param spatial_index: The spatial index, as returned by BuildSpatialIndex.
+	:type spatial_index: dict[str, object]
+
+	:param tileset_data: The tileset data, as returned by CreateTilesetFromCollection.
+	:type tileset_data: dict[str, object]
+
+	:param tri_budget: The most triangles a merged tile should hold.
+	:type tri_budget: int
+
+	:param max_level: The highest level a tile can be merged up to.
+	:type max_level: int
+
+	:return: A dictionary with the following keys:
+		- "root"   : The root node. Each node has its level, index, src, positions and children.
+		- "leaves" : Maps each leaf key (level, x, y, z) to its node, in the order to process them.
+		- "buckets": Maps each leaf key to the objects overlapping it, like the spatial index buckets.
+	:rtype: dict[str, object]
+	"""
+
+	tileset_size = tuple(tileset_data["tileset_size"])
+
+	# Spread each object's faces over the cells it overlaps, and count the objects in each cell
+	cell_tris    = np.zeros(tileset_size, dtype=np.float64)
+	cell_objects = np.zeros(tileset_size, dtype=np.int64)
+
+	for obj, (range_min, range_max) in spatial_index["object_ranges"].items():
+		cells = tuple(slice(range_min[i], range_max[i] + 1) for i in range(3))
+		count = np.prod([range_max[i] - range_min[i] + 1 for i in range(3)])
+
+		cell_tris[cells]    += len(obj.data.polygons) / count
+		cell_objects[cells] += 1
+
+	octree = {
+		"root"         : None,
+		"leaves"       : {},
+		"buckets"      : {},
+		"tileset_size" : tileset_size,
+		"tri_sums"     : GetSummedVolume(cell_tris),
+		"object_sums"  : GetSummedVolume(cell_objects),
+		"object_order" : {obj: i for i, obj in enumerate(spatial_index["object_ranges"])},
+	}
+
+	# The root is the smallest power of two cells across that covers the whole grid
+	root_level = max(0, (max(tileset_size) - 1).bit_length())
+
+	octree["root"] = BuildOctreeNode(octree, spatial_index, tileset_data, root_level, (0, 0, 0), tri_budget, max_level)
+
+	# The working data is only needed while building
+	for key in ("tileset_size", "tri_sums", "object_sums", "object_order"):
+		del octree[key]
+
+	Log("Octree built:", len(octree["leaves"]), "tiles, from", tileset_size[0] * tileset_size[1] * tileset_size[2], "grid cells")
+
+	return octree
+
+
+def BuildOctreeNode(
+	octree       : dict[str, object],
+	spatial_index: dict[str, object],
+	tileset_data : dict[str, object],
+	level        : int,
+	index        : tuple[int, int, int],
+	tri_budget   : int,
+	max_level    : int
+) -> dict[str, object] | None:
+	"""
+	Build a node of the octree and, if it's too full to be a single tile, its children.
+
+	:param octree: The octree being built, see BuildOctree.
+	:type octree: dict[str, object]
+
+	:param spatial_index: The spatial index, as returned by BuildSpatialIndex.
+	:type spatial_index: dict[str, object]
+
+	:param tileset_data: The tileset data, as returned by CreateTilesetFromCollection.
+	:type tileset_data: dict[str, object]
+
+	:param level: The level of the node. A node at level L is 2^L grid cells across.
+	:type level: int
+
+	:param index: The index of the node among the nodes at its level.
+	:type index: tuple[int, int, int]
+
+	:param tri_budget: The most triangles a merged tile should hold.
+	:type tri_budget: int
+
+	:param max_level: The highest level a tile can be merged up to.
+	:type max_level: int
+
+	:return: The node, or None if there's nothing in it.
+	:rtype: dict[str, object] | None
+	"""
+
+	# Get scene slicer settings
+	ss_settings = bpy.context.scene.ss_settings
+
+	tileset_size = octree["tileset_size"]
+	cell_count   = 1 << level
+
+	# The range of grid cells the node covers, clipped to the grid
+	cell_min = tuple(index[i] * cell_count for i in range(3))
+	cell_max = tuple(min(cell_min[i] + cell_count, tileset_size[i]) - 1 for i in range(3))
+
+	if any(cell_min[i] > cell_max[i] for i in range(3)):
+		return None
+
+	if GetBoxSum(octree["object_sums"], cell_min, cell_max) == 0:
+		return None
+
+	pos_min = GetTilePositionMin(cell_min, tileset_data["tileset_origin"], tileset_data["tile_dimensions"])
+	pos_max = GetTilePositionMax(cell_max, tileset_data["tileset_origin"], tileset_data["tile_dimensions"])
+	x, y, z = index
+
+	node = {
+		"level"     : level,
+		"index"     : [x, y, z],
+		"src"       : None,
+		"pos_center": tuple((pos_min[i] + pos_max[i]) / 2 for i in range(3)),
+		"pos_min"   : pos_min,
+		"pos_max"   : pos_max,
+		"children"  : [],
+	}
+
+	# Keep the node as a single tile if it's as small as it can get, or small and empty enough to merge
+	tris = GetBoxSum(octree["tri_sums"], cell_min, cell_max)
+	if level == 0 or (level <= max_level and tris <= tri_budget):
+		key = (level, x, y, z)
+
+		node["src"] = f"{ss_settings.output_prefix}_L{level}_{x}_{z}_{y}" if ss_settings.swizzle_yz else f"{ss_settings.output_prefix}_L{level}_{x}_{y}_{z}"
+
+		octree["leaves"][key]  = node
+		octree["buckets"][key] = GetObjectsInCells(octree, spatial_index, cell_min, cell_max)
+
+		return node
+
+	# Otherwise split it into its eight octants
+	for dx in range(2):
+		for dy in range(2):
+			for dz in range(2):
+				child_index = (x * 2 + dx, y * 2 + dy, z * 2 + dz)
+				child       = BuildOctreeNode(octree, spatial_index, tileset_data, level - 1, child_index, tri_budget, max_level)
+
+				if child:
+					node["children"].append(child)
+
+	return node
+
+
+def GetObjectsInCells(
+	octree       : dict[str, object],
+	spatial_index: dict[str, object],
+	cell_min     : tuple[int, int, int],
+	cell_max     : tuple[int, int, int]
+) -> list[bpy.types.Object]:
+	"""
+	Get the objects overlapping a range of grid cells, in the same order as the spatial index.
+
+	:param octree: The octree being built, see BuildOctree.
+	:type octree: dict[str, object]
+
+	:param spatial_index: The spatial index, as returned by BuildSpatialIndex.
+	:type spatial_index: dict[str, object]
+
+	:param cell_min: The first cell of the range.
+	:type cell_min: tuple[int, int, int]
+
+	:param cell_max: The last cell of the range, inclusive.
+	:type cell_max: tuple[int, int, int]
+
+	:return: The objects in the range.
+	:rtype: list[bpy.types.Object]
+	"""
+
+	buckets = spatial_index["buckets"]
+	objects = set()
+
+	for x in range(cell_min[0], cell_max[0] + 1):
+		for y in range(cell_min[1], cell_max[1] + 1):
+			for z in range(cell_min[2], cell_max[2] + 1):
+				objects.update(buckets.get((x, y, z), []))
+
+	return sorted(objects, key=octree["object_order"].get)
+
+
+
+# ███████╗██╗   ██╗███╗   ███╗███╗   ███╗███████╗██████╗     ██╗   ██╗ ██████╗ ██╗     ██╗   ██╗███╗   ███╗███████╗
+# ██╔════╝██║   ██║████╗ ████║████╗ ████║██╔════╝██╔══██╗    ██║   ██║██╔═══██╗██║     ██║   ██║████╗ ████║██╔════╝
+# ███████╗██║   ██║██╔████╔██║██╔████╔██║█████╗  ██║  ██║    ██║   ██║██║   ██║██║     ██║   ██║██╔████╔██║█████╗
+# ╚════██║██║   ██║██║╚██╔╝██║██║╚██╔╝██║██╔══╝  ██║  ██║    ╚██╗ ██╔╝██║   ██║██║     ██║   ██║██║╚██╔╝██║██╔══╝
+# ███████║╚██████╔╝██║ ╚═╝ ██║██║ ╚═╝ ██║███████╗██████╔╝     ╚████╔╝ ╚██████╔╝███████╗╚██████╔╝██║ ╚═╝ ██║███████╗
+# ╚══════╝ ╚═════╝ ╚═╝     ╚═╝╚═╝     ╚═╝╚══════╝╚═════╝       ╚═══╝   ╚═════╝ ╚══════╝ ╚═════╝ ╚═╝     ╚═╝╚══════╝
+#
+
+def GetSummedVolume(values: np.ndarray) -> np.ndarray:
+	"""
+	Get the 3D prefix sums of a grid of values, so the sum of any box of cells can be read in
+	constant time with GetBoxSum.
+
+	:param values: The value of each grid cell.
+	:type values: np.ndarray
+
+	:return: The prefix sums, one larger than values on each axis.
+	:rtype: np.ndarray
+	"""
+
+	sums = np.zeros(tuple(size + 1 for size in values.shape), dtype=values.dtype)
+	sums[1:, 1:, 1:] = values.cumsum(0).cumsum(1).cumsum(2)
+
+	return sums
+
+
+def GetBoxSum(
+	sums    : np.ndarray,
+	cell_min: tuple[int, int, int],
+	cell_max: tuple[int, int, int]
+) -> float:
+	"""
+	Get the sum of the values in a box of grid cells.
+
+	:param sums: The prefix sums, as returned by GetSummedVolume.
+	:type sums: np.ndarray
+
+	:param cell_min: The first cell of the box.
+	:type cell_min: tuple[int, int, int]
+
+	:param cell_max: The last cell of the box, inclusive.
+	:type cell_max: tuple[int, int, int]
+
+	:return: The sum of the values in the box.
+	:rtype: float
+	"""
+
+	x0, y0, z0 = cell_min
+	x1, y1, z1 = (cell_max[i] + 1 for i in range(3))
+
+	return (
+		  sums[x1, y1, z1] - sums[x0, y1, z1] - sums[x1, y0, z1] - sums[x1, y1, z0]
+		+ sums[x0, y0, z1] + sums[x0, y1, z0] + sums[x1, y0, z0] - sums[x0, y0, z0]
+	)
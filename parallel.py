@@ -0,0 +1,420 @@
+import bpy
+import heapq
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+
+from . boundingBox	import GetCollectionBoundsData, GetCollectionObjectBounds
+from . export		import ExportTilesetToJSON, GetExportPath
+from . headless		import GetSettingsValues
+from . incremental	import TileManifest
+from . logging		import Log, LogError, LogWarning
+from . session		import SliceSession
+from . spatialIndex	import BuildSpatialIndex, GetObjectsInTile, GetOccupiedTiles, SplitObjectsByContainment
+from . tileIndex	import ExportTileIndex, TILE_INDEX_NAME
+from . tilesets		import CreateTilesetFromCollection
+from . traversal	import GetTileOrder
+
+
+
+#  ██████╗ ██████╗ ███╗   ██╗███████╗████████╗ █████╗ ███╗   ██╗████████╗███████╗
+# ██╔════╝██╔═══██╗████╗  ██║██╔════╝╚══██╔══╝██╔══██╗████╗  ██║╚══██╔══╝██╔════╝
+# ██║     ██║   ██║██╔██╗ ██║███████╗   ██║   ███████║██╔██╗ ██║   ██║   ███████╗
+# ██║     ██║   ██║██║╚██╗██║╚════██║   ██║   ██╔══██║██║╚██╗██║   ██║   ╚════██║
+# ╚██████╗╚██████╔╝██║ ╚████║███████║   ██║   ██║  ██║██║ ╚████║   ██║   ███████║
+#  ╚═════╝ ╚═════╝ ╚═╝  ╚═══╝╚══════╝   ╚═╝   ╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝   ╚══════╝
+#
+
+# Relative cost of slicing a face compared to copying it as-is, used when estimating tile costs
+STRADDLE_COST = 4
+
+# Fixed cost of a tile regardless of its contents (duplicating, exporting, etc), in faces
+TILE_COST = 1000
+
+# How many times a tile is attempted before the export is considered failed
+MAX_ATTEMPTS = 3
+
+HEADLESS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "headless.py")
+
+
+
+# ██╗    ██╗ ██████╗ ██████╗ ██╗  ██╗    ██╗   ██╗███╗   ██╗██╗████████╗███████╗
+# ██║    ██║██╔═══██╗██╔══██╗██║ ██╔╝    ██║   ██║████╗  ██║██║╚══██╔══╝██╔════╝
+# ██║ █╗ ██║██║   ██║██████╔╝█████╔╝     ██║   ██║██╔██╗ ██║██║   ██║   ███████╗
+# ██║███╗██║██║   ██║██╔══██╗██╔═██╗     ██║   ██║██║╚██╗██║██║   ██║   ╚════██║
+# ╚███╔███╔╝╚██████╔╝██║  ██║██║  ██╗    ╚██████╔╝██║ ╚████║██║   ██║   ███████║
+#  ╚══╝╚══╝  ╚═════╝ ╚═╝  ╚═╝╚═╝  ╚═╝     ╚═════╝ ╚═╝  ╚═══╝╚═╝   ╚═╝   ╚══════╝
+#
+
+def EstimateTileCosts(
+	spatial_index: dict[str, object],
+	tileset_data : dict
+) -> dict[tuple[int, int, int], float]:
+	"""
+	Estimate how expensive each occupied tile is to slice and export, based on the face counts
+	of the objects in it. Objects straddling the tile's faces have to be cut, so cost more than
+	objects fully inside it, which are copied as-is.
+
+	:param spatial_index: The spatial index, as returned by BuildSpatialIndex.
+	:type spatial_index: dict[str, object]
+
+	:param tileset_data: The tileset data, as returned by CreateTilesetFromCollection.
+	:type tileset_data: dict
+
+	:return: Maps occupied tile indexes to their estimated cost.
+	:rtype: dict[tuple[int, int, int], float]
+	"""
+
+	tile_costs = {}
+
+	for tile_index in GetOccupiedTiles(spatial_index):
+		x, y, z   = tile_index
+		tile_data = tileset_data["tiles"][x][y][z]
+
+		inside, straddling = SplitObjectsByContainment(spatial_index, GetObjectsInTile(spatial_index, tile_index), tile_data["pos_min"], tile_data["pos_max"])
+
+		cost  = TILE_COST
+		cost += sum(len(obj.data.polygons) for obj in inside)
+		cost += sum(len(obj.data.polygons) for obj in straddling) * STRADDLE_COST
+
+		tile_costs[tile_index] = cost
+
+	return tile_costs
+
+
+def BalanceWorkUnits(
+	tiles       : list[tuple[int, int, int]],
+	tile_costs  : dict[tuple[int, int, int], float],
+	worker_count: int,
+	tile_order  : list[tuple[int, int, int]]
+) -> list[list[tuple[int, int, int]]]:
+	"""
+	Share the tiles out between the workers so each has roughly the same total cost, using the
+	longest-processing-time rule: most expensive tile first, always to the least loaded worker.
+	Each unit is then put back in tile order so neighbouring tiles are still processed together.
+
+	:param tiles: The indexes of the tiles to share out.
+	:type tiles: list[tuple[int, int, int]]
+
+	:param tile_costs: The estimated cost of each tile, as returned by EstimateTileCosts.
+	:type tile_costs: dict[tuple[int, int, int], float]
+
+	:param worker_count: The number of workers to share the tiles between.
+	:type worker_count: int
+
+	:param tile_order: The order tiles are processed in, as returned by GetTileOrder.
+	:type tile_order: list[tuple[int, int, int]]
+
+	:return: A list of tiles for each worker, leaving out any workers with nothing to do.
+	:rtype: list[list[tuple[int, int, int]]]
+	"""
+
+	units = [[] for _ in range(worker_count)]
+	loads = [(0, i) for i in range(worker_count)]
+
+	for tile_index in sorted(tiles, key=lambda t: (-tile_costs.get(t, TILE_COST), t)):
+		load, i = heapq.heappop(loads)
+		units[i].append(tile_index)
+		heapq.heappush(loads, (load + tile_costs.get(tile_index, TILE_COST), i))
+
+	rank = {tile_index: i for i, tile_index in enumerate(tile_order)}
+	return [sorted(unit, key=rank.get) for unit in units if unit]
+
+
+
+# ██╗    ██╗ ██████╗ ██████╗ ██╗  ██╗███████╗██████╗ ███████╗
+# ██║    ██║██╔═══██╗██╔══██╗██║ ██╔╝██╔════╝██╔══██╗██╔════╝
+# ██║ █╗ ██║██║   ██║██████╔╝█████╔╝ █████╗  ██████╔╝███████╗
+# ██║███╗██║██║   ██║██╔══██╗██╔═██╗ ██╔══╝  ██╔══██╗╚════██║
+# ╚███╔███╔╝╚██████╔╝██║  ██║██║  ██╗███████╗██║  ██║███████║
+#  ╚══╝╚══╝  ╚═════╝ ╚═╝  ╚═╝╚═╝  ╚═╝╚══════╝╚═╝  ╚═╝╚══════╝
+#
+
+def LaunchWorker(
+	job_path : str,
+	unit_path: str,
+	log_path : str
+) -> subprocess.Popen:
+	"""
+	Start a background Blender instance on the current .blend file to process a work unit.
+
+	:param job_path: Path to the JSON file of settings shared by all workers.
+	:type job_path: str
+
+	:param unit_path: Path to the JSON file describing this worker's tiles.
+	:type unit_path: str
+
+	:param log_path: Path to write the worker's output to.
+	:type log_path: str
+
+	:return: The worker process.
+	:rtype: subprocess.Popen
+	"""
+
+	command = [
+		bpy.app.binary_path, "-b", bpy.data.filepath,
+		"--python", HEADLESS_PATH,
+		"--",
+		"--job", job_path,
+		"--worker-unit", unit_path,
+	]
+
+	with open(log_path, "w") as log_file:
+		return subprocess.Popen(command, stdout=log_file, stderr=subprocess.STDOUT)
+
+
+def ReadWorkerResults(results_path: str) -> dict[tuple[int, int, int], tuple[str, list[dict]]]:
+	"""
+	Read the tiles a worker finished. Workers write one line per tile as they go, so the tiles
+	done before a crash are still picked up.
+
+	:param results_path: Path to the worker's results file.
+	:type results_path: str
+
+	:return: Maps tile indexes to their src, or None if the tile was skipped, and their LODs.
+	:rtype: dict[tuple[int, int, int], tuple[str, list[dict]]]
+	"""
+
+	results = {}
+
+	if not os.path.exists(results_path):
+		return results
+
+	with open(results_path, "r") as file:
+		for line in file:
+			# Ignore a partly written line from a worker that died mid-write
+			try:
+				result = json.loads(line)
+			except json.JSONDecodeError:
+				continue
+
+			results[tuple(result["index"])] = (result["src"], result.get("lods"))
+
+	return results
+
+
+def RunWorker(collection: bpy.types.Collection, unit_path: str) -> dict:
+	"""
+	Slice and export the tiles in a work unit, recording each tile as it finishes. This is the
+	worker side of RunParallelExport, tileset.json is left to the coordinator.
+
+	:param collection: The collection to be sliced.
+	:type collection: bpy.types.Collection
+
+	:param unit_path: Path to the JSON file describing this worker's tiles.
+	:type unit_path: str
+
+	:return: A summary of the worker's run.
+	:rtype: dict
+	"""
+
+	with open(unit_path, "r") as file:
+		unit = json.load(file)
+
+	# Workers share the output folder, so they can't each keep a checkpoint in it
+	session = SliceSession(collection, use_checkpoint=False)
+	session.Begin()
+	session.RestrictToTiles(unit["tiles"])
+
+	with open(unit["results"], "a") as results_file:
+
+		def RecordTile(tile_index, tile_data):
+			results_file.write(json.dumps({"index": list(tile_index), "src": tile_data["src"], "lods": tile_data.get("lods")}) + "\n")
+			results_file.flush()
+
+		session.Step(on_tile=RecordTile)
+
+	session.Cleanup()
+
+	return session.GetSummary("FINISHED")
+
+
+
+#  ██████╗ ██████╗  ██████╗ ██████╗ ██████╗ ██╗███╗   ██╗ █████╗ ████████╗ ██████╗ ██████╗
+# ██╔════╝██╔═══██╗██╔═══██╗██╔══██╗██╔══██╗██║████╗  ██║██╔══██╗╚══██╔══╝██╔═══██╗██╔══██╗
+# ██║     ██║   ██║██║   ██║██████╔╝██║  ██║██║██╔██╗ ██║███████║   ██║   ██║   ██║██████╔╝
+# ██║     ██║   ██║██║   ██║██╔══██╗██║  ██║██║██║╚██╗██║██╔══██║   ██║   ██║   ██║██╔══██╗
+# ╚██████╗╚██████╔╝╚██████╔╝██║  ██║██████╔╝██║██║ ╚████║██║  ██║   ██║   ╚██████╔╝██║  ██║
+#  ╚═════╝ ╚═════╝  ╚═════╝ ╚═╝  ╚═╝╚═════╝ ╚═╝╚═╝  ╚═══╝╚═╝  ╚═╝   ╚═╝    ╚═════╝ ╚═╝  ╚═╝
+#
+
+def RunParallelExport(collection: bpy.types.Collection, worker_count: int) -> dict:
+	"""
+	Slice and export a collection using several background Blender workers, then merge their
+	results into a single tileset.json, the same as a serial export would produce.
+
+	Tiles are shared out by estimated cost. Tiles a worker didn't finish, eg because it crashed,
+	are shared out again, up to MAX_ATTEMPTS times.
+
+	:param collection: The collection to be sliced.
+	:type collection: bpy.types.Collection
+
+	:param worker_count: The number of workers to run at once.
+	:type worker_count: int
+
+	:return: A summary of the run, in the same form as SliceSession.GetSummary.
+	:rtype: dict
+	"""
+
+	# Get scene slicer settings
+	ss_settings = bpy.context.scene.ss_settings
+
+	if not bpy.data.filepath:
+		raise ValueError("The .blend file must be saved before it can be exported in parallel")
+
+	time_start = time.time()
+
+	# Build the same tileset and spatial index a serial export would
+	bounds_data       = GetCollectionBoundsData(collection)
+	tileset_data      = CreateTilesetFromCollection(collection, bounds_data)
+	col_object_bounds = GetCollectionObjectBounds(collection, bounds_data)
+	spatial_index     = BuildSpatialIndex(col_object_bounds, tileset_data)
+	tile_order        = GetTileOrder(tileset_data["tileset_size"], ss_settings.tile_order)
+	tile_costs        = EstimateTileCosts(spatial_index, tileset_data)
+
+	size        = tileset_data["tileset_size"]
+	count_total = size[0] * size[1] * size[2]
+
+	count_fast_path = 0
+	count_sliced    = 0
+	for tile_index in tile_costs:
+		x, y, z   = tile_index
+		tile_data = tileset_data["tiles"][x][y][z]
+
+		inside, straddling = SplitObjectsByContainment(spatial_index, GetObjectsInTile(spatial_index, tile_index), tile_data["pos_min"], tile_data["pos_max"])
+		count_fast_path += len(inside)
+		count_sliced    += len(straddling)
+
+	Log("Tiles occupied:", len(tile_costs), "of", count_total, "- sharing between", worker_count, "workers")
+
+	results = {}
+	pending = list(tile_costs)
+	attempt = 0
+
+	# Only hand out the tiles that have changed since the last export
+	manifest = None
+	if ss_settings.incremental_export:
+		manifest = TileManifest(spatial_index, tileset_data)
+		for tile_index in tile_costs:
+			if manifest.IsUnchanged(tile_index):
+				results[tile_index] = (manifest.GetPreviousSrc(tile_index), manifest.GetPreviousLods(tile_index))
+
+		pending = [tile_index for tile_index in pending if tile_index not in results]
+		Log("Reused", len(results), "tiles unchanged since the last export")
+
+	count_unchanged = len(results)
+
+	# Write the settings for the workers, so they match this process even if the .blend file doesn't.
+	# Workers always export the tiles they're given, the manifest is handled here, and as they never
+	# save the .blend file there's no point keeping their sliced objects. Workers would all write
+	# their profiles to the same file, so profiling is left to serial exports
+	settings = GetSettingsValues(ss_settings)
+	settings["incremental_export"] = False
+	settings["keep_sliced"]        = False
+	settings["use_profiler"]       = False
+
+	work_dir = tempfile.mkdtemp(prefix="scene_slicer_")
+	job_path = os.path.join(work_dir, "job.json")
+	with open(job_path, "w") as file:
+		json.dump(settings, file)
+
+	while pending and attempt < MAX_ATTEMPTS:
+		attempt += 1
+		units = BalanceWorkUnits(pending, tile_costs, worker_count, tile_order)
+
+		Log("Attempt", attempt, "-", len(pending), "tiles in", len(units), "work units")
+
+		# Start a worker for each unit
+		workers = []
+		for i, unit in enumerate(units):
+			prefix       = os.path.join(work_dir, f"attempt_{attempt}_worker_{i}")
+			results_path = prefix + ".results"
+			unit_path    = prefix + ".unit.json"
+
+			with open(unit_path, "w") as file:
+				json.dump({"tiles": [list(tile_index) for tile_index in unit], "results": results_path}, file)
+
+			workers.append((LaunchWorker(job_path, unit_path, prefix + ".log"), results_path))
+
+		# Wait for them all and collect whatever they finished
+		for process, results_path in workers:
+			return_code = process.wait()
+			if return_code != 0:
+				LogWarning("Worker exited with code", return_code, "- see", results_path.replace(".results", ".log"))
+
+			results.update(ReadWorkerResults(results_path))
+
+		pending = [tile_index for tile_index in pending if tile_index not in results]
+
+	# Merge the results into the tileset data, unoccupied tiles are skipped the same as a serial export
+	count_skipped       = 0
+	count_skipped_empty = 0
+
+	for tile_index in tile_order:
+		x, y, z   = tile_index
+		tile_data = tileset_data["tiles"][x][y][z]
+
+		if tile_index not in tile_costs:
+			tile_data["src"] = None
+			count_skipped   += 1
+
+		elif tile_index in results:
+			tile_data["src"], lods = results[tile_index]
+			if lods:
+				tile_data["lods"] = lods
+
+			if tile_data["src"] is None:
+				count_skipped       += 1
+				count_skipped_empty += 1
+
+	summary = {
+		"status"             : "FINISHED",
+		"collection"         : collection.name,
+		"tiles_total"        : count_total,
+		"tiles_processed"    : count_total - len(pending),
+		"tiles_exported"     : count_total - len(pending) - count_skipped,
+		"tiles_skipped"      : count_skipped,
+		"tiles_skipped_empty": count_skipped_empty,
+		"objects_fast_path"  : count_fast_path,
+		"objects_sliced"     : count_sliced,
+		"tileset_path"       : None,
+		"time_taken"         : 0,
+		"tiles_unchanged"    : count_unchanged,
+		"workers"            : worker_count,
+		"attempts"           : attempt,
+	}
+
+	# Don't write a tileset.json with holes in it, and keep the worker logs to look at
+	if pending:
+		LogError(len(pending), "tiles failed after", attempt, "attempts, worker logs are in", work_dir)
+		summary["status"]       = "FAILED"
+		summary["tiles_failed"] = [list(tile_index) for tile_index in pending]
+		summary["time_taken"]   = round(time.time() - time_start, 3)
+		return summary
+
+	shutil.rmtree(work_dir, ignore_errors=True)
+
+	# Export the tileset json, swizzling the data as it's written if required
+	summary["tileset_path"] = GetExportPath("tileset.json")
+	ExportTilesetToJSON(tileset_data, summary["tileset_path"], ss_settings.minify_json, ss_settings.swizzle_yz, ss_settings.tileset_schema)
+
+	# Export the binary tile index beside it
+	if ss_settings.export_tile_index:
+		ExportTileIndex(tileset_data, GetExportPath(TILE_INDEX_NAME), ss_settings.swizzle_yz)
+
+	# Store the tile fingerprints for the next export
+	if manifest:
+		for tile_index, (src, lods) in results.items():
+			manifest.Record(tile_index, src, lods)
+		manifest.Save()
+
+	summary["time_taken"] = round(time.time() - time_start, 3)
+
+	Log("-----------------------------------------------------")
+	Log("Processed", summary["tiles_processed"], "tiles, skipped", count_skipped, "-", count_skipped_empty, "had 0 tris after bool)")
+	Log("Total time taken:", str(summary["time_taken"]))
+
+	return summary
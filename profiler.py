@@ -0,0 +1,299 @@
+import json
+import os
+import threading
+import time
+
+from . logging	import Log
+
+
+
+#  ██████╗ ██████╗ ███╗   ██╗███████╗████████╗ █████╗ ███╗   ██╗████████╗███████╗
+# ██╔════╝██╔═══██╗████╗  ██║██╔════╝╚══██╔══╝██╔══██╗████╗  ██║╚══██╔══╝██╔════╝
+# ██║     ██║   ██║██╔██╗ ██║███████╗   ██║   ███████║██╔██╗ ██║   ██║   ███████╗
+# ██║     ██║   ██║██║╚██╗██║╚════██║   ██║   ██╔══██║██║╚██╗██║   ██║   ╚════██║
+# ╚██████╗╚██████╔╝██║ ╚████║███████║   ██║   ██║  ██║██║ ╚████║   ██║   ███████║
+#  ╚═════╝ ╚═════╝ ╚═╝  ╚═══╝╚══════╝   ╚═╝   ╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝   ╚══════╝
+#
+
+PROFILE_TRACE_NAME   = "profile.trace.json"
+PROFILE_SUMMARY_NAME = "profile.summary.json"
+
+# The profiler recording spans, or None when profiling is off
+active_profiler = None
+
+
+
+# ███████╗██████╗  █████╗ ███╗   ██╗███████╗
+# ██╔════╝██╔══██╗██╔══██╗████╗  ██║██╔════╝
+# ███████╗██████╔╝███████║██╔██╗ ██║███████╗
+# ╚════██║██╔═══╝ ██╔══██║██║╚██╗██║╚════██║
+# ███████║██║     ██║  ██║██║ ╚████║███████║
+# ╚══════╝╚═╝     ╚═╝  ╚═╝╚═╝  ╚═══╝╚══════╝
+#
+
+class NullSpan:
+	"""
+	Stands in for a span when profiling is off. A single shared instance is returned by Span, so
+	an unprofiled stage costs one function call and nothing else.
+	"""
+
+	__slots__ = ()
+
+	def __enter__(self):
+		return self
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		return False
+
+	def Set(self, **attributes):
+		pass
+
+
+NULL_SPAN = NullSpan()
+
+
+class ProfileSpan:
+	"""
+	Times a stage of the export, recording it to the profiler when it ends. Spans opened inside
+	another span, on the same thread, are nested inside it in the trace.
+
+	:param profiler: The profiler to record to.
+	:type profiler: Profiler
+
+	:param name: The name of the stage.
+	:type name: str
+
+	:param attributes: Values to attach to the span, eg the tile it's for.
+	:type attributes: dict
+	"""
+
+	__slots__ = ("profiler", "name", "attributes", "start")
+
+	def __init__(self, profiler, name: str, attributes: dict):
+		self.profiler   = profiler
+		self.name       = name
+		self.attributes = attributes
+		self.start      = 0
+
+
+	def __enter__(self):
+		self.start = time.perf_counter_ns()
+		return self
+
+
+	def __exit__(self, exc_type, exc_value, traceback):
+		if exc_type:
+			self.attributes["error"] = exc_type.__name__
+
+		self.profiler.Record(self.name, self.start, time.perf_counter_ns(), self.attributes)
+		return False
+
+
+	def Set(self, **attributes):
+		"""
+		Attach more values to the span, for things only known once the stage has run.
+
+		:param attributes: The values to attach.
+		:type attributes: dict
+		"""
+
+		self.attributes.update(attributes)
+
+
+def Span(name: str, **attributes):
+	"""
+	Open a span timing a stage of the export, for use in a with statement.
+
+	:param name: The name of the stage, spans with the same name are added up in the summary.
+	:type name: str
+
+	:param attributes: Values to attach to the span, eg the tile it's for.
+	:type attributes: dict
+
+	:return: The span, or a shared no-op span when profiling is off.
+	:rtype: ProfileSpan | NullSpan
+	"""
+
+	if active_profiler is None:
+		return NULL_SPAN
+
+	return ProfileSpan(active_profiler, name, attributes)
+
+
+
+# ██████╗ ██████╗  ██████╗ ███████╗██╗██╗     ███████╗██████╗
+# ██╔══██╗██╔══██╗██╔═══██╗██╔════╝██║██║     ██╔════╝██╔══██╗
+# ██████╔╝██████╔╝██║   ██║█████╗  ██║██║     █████╗  ██████╔╝
+# ██╔═══╝ ██╔══██╗██║   ██║██╔══╝  ██║██║     ██╔══╝  ██╔══██╗
+# ██║     ██║  ██║╚██████╔╝██║     ██║███████╗███████╗██║  ██║
+# ╚═╝     ╚═╝  ╚═╝ ╚═════╝ ╚═╝     ╚═╝╚══════╝╚══════╝╚═╝  ╚═╝
+#
+
+class Profiler:
+	"""
+	Collects the spans recorded during an export, and turns them into a Chrome trace and a
+	summary of the time spent in each stage.
+	"""
+
+	def __init__(self):
+		self.events = []
+		self.origin = time.perf_counter_ns()
+		self.pid    = os.getpid()
+
+
+	def Record(self, name: str, start: int, end: int, attributes: dict):
+		"""
+		Record a finished span.
+
+		:param name: The name of the stage.
+		:type name: str
+
+		:param start: When the span started, from time.perf_counter_ns.
+		:type start: int
+
+		:param end: When the span ended, from time.perf_counter_ns.
+		:type end: int
+
+		:param attributes: The values attached to the span.
+		:type attributes: dict
+		"""
+
+		self.events.append((name, start, end, threading.get_ident(), attributes))
+
+
+	def GetTraceEvents(self) -> list[dict]:
+		"""
+		Get the spans as complete ("X") events in the Chrome trace event format, which can be
+		opened in Perfetto or chrome://tracing.
+
+		:return: The trace events, with times in microseconds.
+		:rtype: list[dict]
+		"""
+
+		return [
+			{
+				"name": name,
+				"cat" : "scene_slicer",
+				"ph"  : "X",
+				"ts"  : (start - self.origin) / 1000,
+				"dur" : (end - start) / 1000,
+				"pid" : self.pid,
+				"tid" : tid,
+				"args": {key: value if isinstance(value, (int, float, bool, str, type(None))) else str(value) for key, value in attributes.items()},
+			}
+			for name, start, end, tid, attributes in self.events
+		]
+
+
+	def GetSummary(self) -> dict[str, dict]:
+		"""
+		Add up the spans of each stage. Self time is the time spent in the stage itself, not in
+		the stages nested inside it, so the self times add up to the total time profiled.
+
+		:return: Maps each stage to its count, and total, self, mean and max time in milliseconds, slowest first.
+		:rtype: dict[str, dict]
+		"""
+
+		stages = {}
+
+		# Work out the nesting on each thread, parents sort before their children
+		by_thread = {}
+		for event in self.events:
+			by_thread.setdefault(event[3], []).append(event)
+
+		for events in by_thread.values():
+			events.sort(key=lambda event: (event[1], -event[2]))
+
+			stack = []
+			for name, start, end, tid, attributes in events:
+				while stack and stack[-1][2] <= start:
+					stack.pop()
+
+				duration = end - start
+
+				stage = stages.setdefault(name, {"count": 0, "total_ns": 0, "self_ns": 0, "max_ns": 0})
+				stage["count"]    += 1
+				stage["total_ns"] += duration
+				stage["self_ns"]  += duration
+				stage["max_ns"]    = max(stage["max_ns"], duration)
+
+				if stack:
+					stages[stack[-1][0]]["self_ns"] -= duration
+
+				stack.append((name, start, end))
+
+		summary = {}
+		for name, stage in sorted(stages.items(), key=lambda item: item[1]["self_ns"], reverse=True):
+			summary[name] = {
+				"count"   : stage["count"],
+				"total_ms": round(stage["total_ns"] / 1e6, 3),
+				"self_ms" : round(stage["self_ns"] / 1e6, 3),
+				"mean_ms" : round(stage["total_ns"] / stage["count"] / 1e6, 3),
+				"max_ms"  : round(stage["max_ns"] / 1e6, 3),
+			}
+
+		return summary
+
+
+	def Write(self, trace_path: str, summary_path: str) -> dict[str, dict]:
+		"""
+		Write the Chrome trace and the stage summary, and log the summary.
+
+		:param trace_path: The path to write the trace to.
+		:type trace_path: str
+
+		:param summary_path: The path to write the summary to.
+		:type summary_path: str
+
+		:return: The summary, see GetSummary.
+		:rtype: dict[str, dict]
+		"""
+
+		with open(trace_path, "w") as file:
+			json.dump({"traceEvents": self.GetTraceEvents(), "displayTimeUnit": "ms"}, file)
+
+		summary = self.GetSummary()
+		with open(summary_path, "w") as file:
+			json.dump(summary, file, indent="\t")
+
+		Log("Profile:", len(self.events), "spans, trace written to", trace_path)
+		Log(f"{'stage':<20} {'count':>8} {'self ms':>12} {'total ms':>12} {'mean ms':>10} {'max ms':>10}")
+		for name, stage in summary.items():
+			Log(f"{name:<20} {stage['count']:>8} {stage['self_ms']:>12.3f} {stage['total_ms']:>12.3f} {stage['mean_ms']:>10.3f} {stage['max_ms']:>10.3f}")
+
+		return summary
+
+
+
+# ███████╗████████╗ █████╗ ██████╗ ████████╗    ███████╗████████╗ ██████╗ ██████╗
+# ██╔════╝╚══██╔══╝██╔══██╗██╔══██╗╚══██╔══╝    ██╔════╝╚══██╔══╝██╔═══██╗██╔══██╗
+# ███████╗   ██║   ███████║██████╔╝   ██║       ███████╗   ██║   ██║   ██║██████╔╝
+# ╚════██║   ██║   ██╔══██║██╔══██╗   ██║       ╚════██║   ██║   ██║   ██║██╔═══╝
+# ███████║   ██║   ██║  ██║██║  ██║   ██║       ███████║   ██║   ╚██████╔╝██║
+# ╚══════╝   ╚═╝   ╚═╝  ╚═╝╚═╝  ╚═╝   ╚═╝       ╚══════╝   ╚═╝    ╚═════╝ ╚═╝
+#
+
+def StartProfiling(profiler: Profiler = None):
+	"""
+	Start recording spans, discarding any from a previous run.
+
+	:param profiler: A stopped profiler to carry on recording to, or None for a new one.
+	:type profiler: Profiler
+	"""
+
+	global active_profiler
+	active_profiler = profiler or Profiler()
+
+
+def StopProfiling():
+	"""
+	Stop recording spans.
+
+	:return: The profiler with the recorded spans, or None if profiling wasn't on.
+	:rtype: Profiler
+	"""
+
+	global active_profiler
+	profiler, active_profiler = active_profiler, None
+
+	return profiler
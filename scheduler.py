@@ -0,0 +1,87 @@
+import time
+
+
+
+# ███████╗ ██████╗██╗  ██╗███████╗██████╗ ██╗   ██╗██╗     ███████╗██████╗
+# ██╔════╝██╔════╝██║  ██║██╔════╝██╔══██╗██║   ██║██║     ██╔════╝██╔══██╗
+# ███████╗██║     ███████║█████╗  ██║  ██║██║   ██║██║     █████╗  ██████╔╝
+# ╚════██║██║     ██╔══██║██╔══╝  ██║  ██║██║   ██║██║     ██╔══╝  ██╔══██╗
+# ███████║╚██████╗██║  ██║███████╗██████╔╝╚██████╔╝███████╗███████╗██║  ██║
+# ╚══════╝ ╚═════╝╚═╝  ╚═╝╚══════╝╚═════╝  ╚═════╝ ╚══════╝╚══════╝╚═╝  ╚═╝
+#
+
+class TileScheduler:
+	"""
+	Decides how many tiles to process in each tick of the modal export loop.
+
+	Occupied tiles are processed for as long as the measured cost of the next one still fits in
+	the frame-time budget, and at least one is always processed per tick so the export keeps
+	moving. Empty tiles cost next to nothing, so they are cleared in bulk until the budget runs
+	out. Either way control returns to Blender promptly, so the UI stays responsive and ESC works.
+
+	:param budget_seconds: How long each tick may spend processing tiles, in seconds.
+	:type budget_seconds: float
+
+	:param smoothing: Weight given to the latest measurement in the running tile cost estimate.
+	:type smoothing: float
+	"""
+
+	def __init__(self, budget_seconds: float, smoothing: float = 0.3):
+		self.budget_seconds = budget_seconds
+		self.smoothing      = smoothing
+		self.tile_estimate  = None
+		self.tick_start     = time.perf_counter()
+		self.tick_tiles     = 0
+
+
+	def StartTick(self) -> None:
+		"""
+		Start timing a new tick.
+		"""
+
+		self.tick_start = time.perf_counter()
+		self.tick_tiles = 0
+
+
+	def Elapsed(self) -> float:
+		"""
+		Get the time spent so far in the current tick, in seconds.
+		"""
+
+		return time.perf_counter() - self.tick_start
+
+
+	def CanProcessTile(self) -> bool:
+		"""
+		Check if there's time left in this tick for another occupied tile, based on the running
+		estimate of how long one takes.
+		"""
+
+		if self.tick_tiles == 0:
+			return True
+
+		return self.Elapsed() + self.tile_estimate <= self.budget_seconds
+
+
+	def CanProcessEmptyTile(self) -> bool:
+		"""
+		Check if there's any time left in this tick, for clearing empty tiles.
+		"""
+
+		return self.Elapsed() < self.budget_seconds
+
+
+	def RecordTile(self, seconds: float) -> None:
+		"""
+		Record how long an occupied tile took, updating the running estimate.
+
+		:param seconds: The time the tile took to process.
+		:type seconds: float
+		"""
+
+		self.tick_tiles += 1
+
+		if self.tile_estimate is None:
+			self.tile_estimate = seconds
+		else:
+			self.tile_estimate += self.smoothing * (seconds - self.tile_estimate)
@@ -0,0 +1,604 @@
+import bpy
+import time
+
+from . booleans		import *
+from . boundingBox	import *
+from . collections	import DeleteCollection, RemoveObjects
+from . cutter		import CreateCutter, CreateCutterHelper
+from . duplicate	import DuplicateObjects, DuplicateObjectsData
+from . export		import ExportObjectsToGLtf, ExportTilesetToJSON, GetExportPath
+from . checkpoint	import ExportCheckpoint
+from . incremental	import TileManifest, GetTileKey, TILE_PROPERTY
+from . lods		import ExportTileLods, GetLodRatios
+from . logging		import Log, LogDebug, LogFlush, LogWarning
+from . meshCache	import EvaluatedMeshCache
+from . octree		import BuildOctree
+from . profiler		import Span, StartProfiling, StopProfiling, PROFILE_TRACE_NAME, PROFILE_SUMMARY_NAME
+from . slicing		import SliceObjectsBisect, SliceObjectsSlab, FreeSlabPieces, ReleaseSlabPieces
+from . spatialIndex	import BuildSpatialIndex, GetObjectsInTile, GetOccupiedTiles, SplitObjectsByContainment
+from . teardown		import TagGenerated, TeardownPreviousRun
+from . tileIndex	import ExportTileIndex, TILE_INDEX_NAME
+from . tilesets		import CreateTilesetFromCollection
+from . traversal	import GetTileOrder, GetObjectReleaseTiles
+from . triCounts 	import *
+
+
+
+# ███████╗███████╗███████╗███████╗██╗ ██████╗ ███╗   ██╗
+# ██╔════╝██╔════╝██╔════╝██╔════╝██║██╔═══██╗████╗  ██║
+# ███████╗█████╗  ███████╗███████╗██║██║   ██║██╔██╗ ██║
+# ╚════██║██╔══╝  ╚════██║╚════██║██║██║   ██║██║╚██╗██║
+# ███████║███████╗███████║███████║██║╚██████╔╝██║ ╚████║
+# ╚══════╝╚══════╝╚══════╝╚══════╝╚═╝ ╚═════╝ ╚═╝  ╚═══╝
+#
+
+class SliceSession:
+	"""
+	Holds the state of a single slice and export run, from reading the collection bounds to
+	writing tileset.json.
+
+	The session does no UI work of its own, so the same pipeline can be driven by the modal
+	export operator, a tick at a time, or by the headless batch mode, in a single call.
+
+	:param collection: The collection to be sliced.
+	:type collection: bpy.types.Collection
+
+	:param resume: Carry on from the checkpoint left by a previous export, rather than starting again.
+	:type resume: bool
+
+	:param use_checkpoint: Record progress to a checkpoint file, so the export can be resumed.
+	:type use_checkpoint: bool
+	"""
+
+	def __init__(self, collection: bpy.types.Collection, resume: bool = False, use_checkpoint: bool = True):
+		# Get scene slicer settings
+		ss_settings = bpy.context.scene.ss_settings
+
+		# Setup some starting values for the operation
+		self.count_total         = 0
+		self.count_processed     = 0
+		self.count_skipped       = 0
+		self.count_skipped_empty = 0
+		self.count_fast_path     = 0
+		self.count_sliced        = 0
+		self.count_unchanged     = 0
+		self.count_resumed       = 0
+
+		self.tileset_data        = None
+		self.tile_order          = []
+		self.tile_cursor         = 0
+		self.release_tiles       = {}
+
+		self.collection          = collection
+		self.bounds_data         = None
+		self.col_object_bounds   = None
+		self.spatial_index       = None
+		self.octree              = None
+		self.sliced_collection   = None
+		self.sliced_objects      = {}
+		self.keep_sliced         = ss_settings.keep_sliced
+		self.manifest            = None
+		self.resume              = resume
+		self.use_checkpoint      = use_checkpoint
+		self.checkpoint          = None
+		self.resumed_tiles       = {}
+
+		self.slice_method        = ss_settings.slice_method
+		self.lod_ratios          = GetLodRatios(ss_settings)
+		self.cutter              = None
+		self.cutter_helper       = None
+		self.bound_objects       = set()
+		self.slab_pieces         = {}
+		self.mesh_cache          = EvaluatedMeshCache(ss_settings.mesh_cache_budget * 1024 * 1024) if ss_settings.mesh_cache_budget > 0 else None
+		self.profiler            = None
+
+		self.tileset_path        = None
+		self.reclaimed_bytes     = 0
+		self.time_start          = time.time()
+
+
+	def Begin(self):
+		"""
+		Prepare the run: create the sliced collection, build the tileset data and spatial index,
+		work out the tile order and set up the cutter.
+		"""
+
+		# Get scene slicer settings
+		ss_settings = bpy.context.scene.ss_settings
+
+		# Start recording the time spent in each stage, if asked to. Anything still recording from
+		# a run that never cleaned up is dropped
+		StopProfiling()
+		if ss_settings.use_profiler:
+			StartProfiling()
+
+		# Create a new collection to place the sliced objects in
+		# If it already exists, remove it and everything left by the previous run
+		sliced_collection_name = "_sliced." + self.collection.name
+		self.sliced_collection = bpy.data.collections.get(sliced_collection_name)
+
+		# When keeping the sliced objects and exporting incrementally or resuming, group them by tile
+		# instead, so the ones belonging to tiles that aren't redone can be left alone
+		if self.sliced_collection and self.keep_sliced and (ss_settings.incremental_export or self.resume):
+			untagged = []
+			for obj in list(self.sliced_collection.objects):
+				if TILE_PROPERTY in obj:
+					self.sliced_objects.setdefault(obj[TILE_PROPERTY], []).append(obj)
+				else:
+					untagged.append(obj)
+
+			RemoveObjects(untagged)
+
+		else:
+			with Span("teardown"):
+				self.reclaimed_bytes = TeardownPreviousRun(self.collection.name)["bytes"]
+
+			self.sliced_collection = bpy.data.collections.new(sliced_collection_name)
+			bpy.context.scene.collection.children.link(self.sliced_collection)
+
+		# Ensure nothing is selected
+		bpy.ops.object.select_all(action='DESELECT')
+
+		# Read the bounds of every object in the collection in a single pass
+		with Span("bounds", objects=len(self.collection.all_objects)):
+			self.bounds_data = GetCollectionBoundsData(self.collection)
+
+		# Generate the basic tileset data from the collection: size, bounds, etc
+		with Span("tileset"):
+			self.tileset_data = CreateTilesetFromCollection(self.collection, self.bounds_data)
+
+		# Update the expected number of tiles
+		size = self.tileset_data["tileset_size"]
+		self.count_total = size[0] * size[1] * size[2]
+
+		# Build a dict of each object and their min/max bounds
+		with Span("object_bounds"):
+			self.col_object_bounds = GetCollectionObjectBounds(self.collection, self.bounds_data)
+
+		# Index the objects by the tiles they overlap, so each tile lookup only touches its own objects
+		with Span("spatial_index"):
+			self.spatial_index = BuildSpatialIndex(self.col_object_bounds, self.tileset_data)
+		Log("Tiles occupied:", len(GetOccupiedTiles(self.spatial_index)), "of", self.count_total)
+
+		# Work out the order to visit the tiles in, and which tile each object is last needed by
+		self.tile_order    = GetTileOrder(self.tileset_data["tileset_size"], ss_settings.tile_order)
+		self.release_tiles = GetObjectReleaseTiles(self.spatial_index, self.tile_order)
+
+		# With octree tiling the tiles are the leaves of the octree instead, visited depth first.
+		# The octree buckets are laid out like the spatial index's, so the same helpers work on them
+		if ss_settings.tiling_mode == "OCTREE":
+			with Span("octree"):
+				self.octree = BuildOctree(self.spatial_index, self.tileset_data, ss_settings.octree_tri_budget, ss_settings.octree_max_level)
+
+			self.tileset_data["root"] = self.octree["root"]
+			self.tile_order           = list(self.octree["leaves"])
+			self.release_tiles        = GetObjectReleaseTiles(self.octree, self.tile_order)
+			self.count_total          = len(self.tile_order)
+
+			# Slab cuts along the uniform grid, so can't cut the merged tiles
+			if self.slice_method == "SLAB":
+				LogWarning("The Slab slice method doesn't support octree tiling, using Bisect instead")
+				self.slice_method = "BISECT"
+
+			if ss_settings.incremental_export:
+				LogWarning("Incremental export doesn't support octree tiling yet, exporting every tile")
+
+		# Load the fingerprints from the last export, to skip tiles that haven't changed since
+		if ss_settings.incremental_export and not self.octree:
+			self.manifest = TileManifest(self.spatial_index, self.tileset_data)
+
+		# Record progress as we go, so the export can be resumed if it's cancelled or crashes
+		if self.use_checkpoint:
+			self.checkpoint = ExportCheckpoint(self.collection, self.tileset_data)
+			if self.resume:
+				self.resumed_tiles = self.checkpoint.Resume()
+			else:
+				self.checkpoint.Start()
+
+		# Create/update the helper object
+		self.cutter_helper = CreateCutterHelper(self.tileset_data)
+
+		# The boolean slice method needs a cutter. Bool mods are only bound to the objects in the
+		# current tile as we go, so tidy up any left over from a previous run as well as broken ones
+		if self.slice_method == "BOOLEAN":
+			self.cutter = CreateCutter(self.tileset_data)
+
+			for obj in self.collection.all_objects:
+				if obj.type == 'MESH':
+					RemoveIntersectBooleans(obj, self.cutter)
+					RemoveBrokenBooleans(obj)
+
+
+	def IsFinished(self) -> bool:
+		"""
+		Check whether every tile has been visited.
+
+		:return: True once there are no more tiles to process.
+		:rtype: bool
+		"""
+
+		return self.tile_cursor >= len(self.tile_order)
+
+
+	def RestrictToTiles(self, tiles: list):
+		"""
+		Only process the given tiles, keeping them in the usual tile order. Used by parallel
+		workers, which each handle a share of the tileset.
+
+		:param tiles: The indexes of the tiles to process.
+		:type tiles: list[tuple[int, int, int]]
+		"""
+
+		keep = set(tuple(tile_index) for tile_index in tiles)
+
+		self.tile_order    = [tile_index for tile_index in self.tile_order if tile_index in keep]
+		self.release_tiles = GetObjectReleaseTiles(self.spatial_index, self.tile_order)
+		self.count_total   = len(self.tile_order)
+
+
+	def Step(self, scheduler=None, on_tile=None):
+		"""
+		Process tiles in order until the scheduler says to stop, or until every tile is done if
+		no scheduler is given.
+
+		:param scheduler: Decides how much work fits in the current tick, or None to run to the end.
+		:type scheduler: TileScheduler
+
+		:param on_tile: Called with the tile index and its tile data after each tile is processed.
+		:type on_tile: callable
+		"""
+
+		if scheduler:
+			scheduler.StartTick()
+
+		while not self.IsFinished():
+			tile_index = self.tile_order[self.tile_cursor]
+
+			# Find which objects are in the current tile
+			with Span("index_lookup"):
+				objects_in_bounds = self.GetTileObjects(tile_index)
+
+			# Tiles completed before the export was resumed, or that haven't changed since the last
+			# export, cost next to nothing, like empty ones
+			if len(objects_in_bounds) > 0 and tile_index in self.resumed_tiles:
+				if scheduler and not scheduler.CanProcessEmptyTile():
+					break
+
+				self.ReuseTile(tile_index, *self.resumed_tiles.pop(tile_index))
+				self.count_resumed += 1
+
+			elif len(objects_in_bounds) > 0 and self.manifest and self.manifest.IsUnchanged(tile_index):
+				if scheduler and not scheduler.CanProcessEmptyTile():
+					break
+
+				self.ReuseTile(tile_index, self.manifest.GetPreviousSrc(tile_index), self.manifest.GetPreviousLods(tile_index))
+				self.count_unchanged += 1
+
+				if self.checkpoint:
+					self.checkpoint.Record(tile_index, self.manifest.GetPreviousSrc(tile_index), self.manifest.GetPreviousLods(tile_index))
+
+			elif len(objects_in_bounds) > 0:
+				if scheduler and not scheduler.CanProcessTile():
+					break
+
+				tile_time_start = time.perf_counter()
+				with Span("tile", tile=GetTileKey(tile_index), objects=len(objects_in_bounds)) as tile_span:
+					self.ProcessTile(tile_index, objects_in_bounds)
+					tile_span.Set(src=self.GetTileData(tile_index)["src"])
+				if scheduler:
+					scheduler.RecordTile(time.perf_counter() - tile_time_start)
+
+			# If no objects are in the bounds, skip the export and set the src to none
+			else:
+				if scheduler and not scheduler.CanProcessEmptyTile():
+					break
+
+				self.GetTileData(tile_index)["src"] = None
+				self.count_skipped += 1
+
+			self.count_processed += 1
+
+			if on_tile:
+				on_tile(tile_index, self.GetTileData(tile_index))
+
+			# Release anything cached for objects that no later tile needs
+			for obj in self.release_tiles.pop(tile_index, []):
+				if self.mesh_cache:
+					self.mesh_cache.Release(obj)
+				ReleaseSlabPieces(self.slab_pieces, obj)
+
+			# Move on to the next tile
+			self.tile_cursor += 1
+
+
+	def GetTileData(self, tile_index) -> dict:
+		"""
+		Get the entry for a tile in the tileset data, or its node when using octree tiling.
+
+		:param tile_index: The index of the tile, or the key of the octree leaf.
+		:type tile_index: tuple[int, ...]
+
+		:return: The tile data, which is updated in place.
+		:rtype: dict
+		"""
+
+		if self.octree:
+			return self.octree["leaves"][tile_index]
+
+		x, y, z = tile_index
+		return self.tileset_data["tiles"][x][y][z]
+
+
+	def GetTileObjects(self, tile_index) -> list:
+		"""
+		Get the objects overlapping a tile, from the spatial index or the octree.
+
+		:param tile_index: The index of the tile, or the key of the octree leaf.
+		:type tile_index: tuple[int, ...]
+
+		:return: The objects in the tile, empty if the tile is unoccupied.
+		:rtype: list[bpy.types.Object]
+		"""
+
+		return GetObjectsInTile(self.octree or self.spatial_index, tile_index)
+
+
+	def ReuseTile(self, tile_index, src, lods=None):
+		"""
+		Keep the result of a tile from a previous export, rather than slicing it again.
+
+		:param tile_index: The index of the tile.
+		:type tile_index: tuple[int, int, int]
+
+		:param src: The tile's glTF file name from the previous export, or None if it was skipped.
+		:type src: str
+
+		:param lods: The tile's LOD levels from the previous export, or None if LODs were disabled.
+		:type lods: list[dict]
+		"""
+
+		tile_data = self.GetTileData(tile_index)
+
+		tile_data["src"] = src
+		if lods:
+			tile_data["lods"] = lods
+		if tile_data["src"] is None:
+			self.count_skipped       += 1
+			self.count_skipped_empty += 1
+
+		# Leave the tile's sliced objects where they are
+		self.sliced_objects.pop(GetTileKey(tile_index), None)
+
+		if self.manifest:
+			self.manifest.Record(tile_index, tile_data["src"], tile_data.get("lods"))
+
+
+	def ProcessTile(self, tile_index, objects_in_bounds):
+		"""
+		Slice and export the objects in a single tile, updating its entry in the tileset data.
+
+		:param tile_index: The index of the tile.
+		:type tile_index: tuple[int, int, int]
+
+		:param objects_in_bounds: The objects overlapping the tile, from the spatial index.
+		:type objects_in_bounds: list[bpy.types.Object]
+		"""
+
+		# Get scene slicer settings
+		ss_settings = bpy.context.scene.ss_settings
+
+		# Prefix to temporarily assign to objects being duplicated for export
+		temp_prefix = "SS_TEMP_RENAME_"
+
+		tile_time_start = time.time()
+
+		# Reference to tile data, which is updated in place so the tiles array keeps its layout
+		tile_data = self.GetTileData(tile_index)
+
+		# Get the desired tile origin from settings
+		tile_origin = tile_data["pos_center"]
+		if ss_settings.export_origin == "TILE_MIN":
+			tile_origin = tile_data["pos_min"]
+		elif ss_settings.export_origin == "TILE_MAX":
+			tile_origin = tile_data["pos_max"]
+
+		# Remove the tile's sliced objects from the last export
+		RemoveObjects(self.sliced_objects.pop(GetTileKey(tile_index), []))
+
+		# Objects fully inside the tile don't need cutting, only the ones straddling its faces do
+		with Span("containment"):
+			inside_objects, straddling_objects = SplitObjectsByContainment(self.spatial_index, objects_in_bounds, tile_data["pos_min"], tile_data["pos_max"])
+		self.count_fast_path += len(inside_objects)
+		self.count_sliced    += len(straddling_objects)
+
+		if self.slice_method == "BISECT":
+			# Copy the inside objects as-is and clip the rest to the tile planes, no cutter involved
+			duplicate_objects  = DuplicateObjectsData(inside_objects, tile_origin, temp_prefix)
+			with Span("bisect", objects=len(straddling_objects)):
+				duplicate_objects += SliceObjectsBisect(straddling_objects, tile_data["pos_min"], tile_data["pos_max"], tile_origin, temp_prefix, self.mesh_cache)
+
+		elif self.slice_method == "SLAB":
+			# Copy the inside objects as-is and take this tile's pieces of the rest, cutting up any we haven't seen yet
+			duplicate_objects  = DuplicateObjectsData(inside_objects, tile_origin, temp_prefix)
+			with Span("slab", objects=len(straddling_objects)):
+				duplicate_objects += SliceObjectsSlab(straddling_objects, tile_index, tile_origin, temp_prefix, self.slab_pieces, self.spatial_index, self.tileset_data)
+
+		else:
+			# Bind the cutter to the straddling objects only, then move and size it to the tile.
+			# Octree tiles vary in size, grid tiles are always tile_dimensions
+			with Span("cutter_move", objects=len(straddling_objects)):
+				self.bound_objects   = BindCutter(straddling_objects, self.cutter, self.bound_objects)
+				self.cutter.location = tile_data["pos_center"]
+				self.cutter.scale    = [tile_data["pos_max"][i] - tile_data["pos_min"][i] for i in range(3)]
+
+			# Move the 3d cursor to the tile origin. This is semi-redundant as it's also done
+			# by DuplicateObjects, but adding it here seems to be required sometimes
+			bpy.context.scene.cursor.location = tile_origin
+
+			# Duplicate all the objects (applying their modifiers and setting the right position)
+			if ss_settings.duplicate_method == "DATA":
+				duplicate_objects = DuplicateObjectsData(objects_in_bounds, tile_origin, temp_prefix)
+			else:
+				duplicate_objects = DuplicateObjects(objects_in_bounds, tile_origin, temp_prefix)
+
+		# Ensure all objects are deselected
+		bpy.ops.object.select_all(action='DESELECT')
+
+		# Move the duplicate objects to the sliced collection, tagged with their tile
+		for obj in duplicate_objects:
+			for collection in obj.users_collection:
+				collection.objects.unlink(obj)
+			self.sliced_collection.objects.link(obj)
+			obj[TILE_PROPERTY] = GetTileKey(tile_index)
+
+		# Tag them and their meshes too, so the next run can find anything left behind
+		TagGenerated(duplicate_objects, self.collection)
+
+		# Check we have some tris before triggering the glTF export
+		with Span("tri_count"):
+			tri_count = GetTotalTriCount(duplicate_objects)
+
+		if tri_count > 0:
+			ExportObjectsToGLtf(duplicate_objects, tile_data["src"])
+
+			# Decimate the same sliced objects for each LOD level, rather than slicing again
+			if self.lod_ratios:
+				with Span("lods", levels=len(self.lod_ratios)):
+					tile_data["lods"] = ExportTileLods(duplicate_objects, tile_data["src"], self.lod_ratios)
+
+		else:
+			self.count_skipped += 1
+			self.count_skipped_empty += 1
+			tile_data["src"] = None
+
+		# Remove temp_prefix from original names
+		for obj in objects_in_bounds:
+			obj.name = obj.name.replace(temp_prefix, '')
+
+		# Unless they're being kept to look at, free the tile's objects and meshes now it's exported,
+		# so only one tile's worth of sliced geometry is ever held at once
+		if not self.keep_sliced:
+			with Span("free", objects=len(duplicate_objects)):
+				RemoveObjects(duplicate_objects)
+
+		if self.manifest:
+			self.manifest.Record(tile_index, tile_data["src"], tile_data.get("lods"))
+
+		if self.checkpoint:
+			self.checkpoint.Record(tile_index, tile_data["src"], tile_data.get("lods"))
+
+		LogDebug(str(self.count_processed), tile_data["src"], "took", time.time() - tile_time_start)
+
+
+	def Cleanup(self):
+		"""
+		Free anything held for the export and remove the Bools used for cutting.
+		"""
+
+		FreeSlabPieces(self.slab_pieces)
+		if self.mesh_cache:
+			self.mesh_cache.Clear()
+
+		# Stop recording spans, so a cancelled or failed run doesn't leave them going into the next
+		profiler = StopProfiling()
+		if profiler:
+			self.profiler = profiler
+
+		if self.cutter:
+			self.bound_objects = BindCutter([], self.cutter, self.bound_objects)
+
+		# Leave the checkpoint in place, so a cancelled export can be resumed
+		if self.checkpoint:
+			self.checkpoint.Close()
+
+
+	def Finish(self) -> dict:
+		"""
+		Clean up after the last tile and export the tileset json.
+
+		:return: A summary of the run, see GetSummary.
+		:rtype: dict
+		"""
+
+		# Get scene slicer settings
+		ss_settings = bpy.context.scene.ss_settings
+
+		self.Cleanup()
+
+		# Carry on profiling the tileset export, Cleanup stopped it
+		if self.profiler:
+			StartProfiling(self.profiler)
+
+		# Remove any sliced objects left from tiles that are now empty
+		RemoveObjects([obj for objects in self.sliced_objects.values() for obj in objects])
+		self.sliced_objects = {}
+
+		# The sliced collection was only needed to export from
+		if not self.keep_sliced:
+			DeleteCollection(self.sliced_collection, True)
+			self.sliced_collection = None
+
+		# Export the tileset json, swizzling the data as it's written if required
+		self.tileset_path = GetExportPath("tileset.json")
+		ExportTilesetToJSON(self.tileset_data, self.tileset_path, ss_settings.minify_json, ss_settings.swizzle_yz, ss_settings.tileset_schema)
+
+		# Export the binary tile index beside it. It indexes the uniform grid, so doesn't fit octree tiles
+		if ss_settings.export_tile_index and not self.octree:
+			with Span("tile_index_write"):
+				ExportTileIndex(self.tileset_data, GetExportPath(TILE_INDEX_NAME), ss_settings.swizzle_yz)
+
+		# Store the tile fingerprints for the next export
+		if self.manifest:
+			self.manifest.Save()
+
+		# The export is complete, so there's nothing left to resume
+		if self.checkpoint:
+			self.checkpoint.Remove()
+
+		# Logging
+		Log("-----------------------------------------------------")
+		Log("Processed", self.count_processed, "tiles, skipped", self.count_skipped, "-", self.count_skipped_empty, "had 0 tris after bool)")
+		Log("Copied", self.count_fast_path, "objects fully inside their tile as-is, sliced", self.count_sliced, "straddling objects")
+		if self.manifest:
+			Log("Reused", self.count_unchanged, "tiles unchanged since the last export")
+		if self.resume:
+			Log("Resumed", self.count_resumed, "tiles completed before the export was resumed")
+		Log("Total time taken:", str(time.time() - self.time_start))
+
+		# Write out the time spent in each stage
+		if self.profiler:
+			StopProfiling()
+			self.profiler.Write(GetExportPath(PROFILE_TRACE_NAME), GetExportPath(PROFILE_SUMMARY_NAME))
+
+		LogFlush()
+
+		return self.GetSummary("FINISHED")
+
+
+	def GetSummary(self, status: str) -> dict:
+		"""
+		Describe the run so far in a form that can be dumped straight to JSON.
+
+		:param status: The outcome of the run, eg FINISHED or CANCELLED.
+		:type status: str
+
+		:return: The counts, timings and output paths of the run.
+		:rtype: dict
+		"""
+
+		return {
+			"status"             : status,
+			"collection"         : self.collection.name,
+			"tiles_total"        : self.count_total,
+			"tiles_processed"    : self.count_processed,
+			"tiles_exported"     : self.count_processed - self.count_skipped,
+			"tiles_skipped"      : self.count_skipped,
+			"tiles_skipped_empty": self.count_skipped_empty,
+			"objects_fast_path"  : self.count_fast_path,
+			"objects_sliced"     : self.count_sliced,
+			"tiles_unchanged"    : self.count_unchanged,
+			"tiles_resumed"      : self.count_resumed,
+			"bytes_reclaimed"    : self.reclaimed_bytes,
+			"tileset_path"       : self.tileset_path,
+			"time_taken"         : round(time.time() - self.time_start, 3),
+		}
@@ -0,0 +1,389 @@
+import bpy
+import bmesh
+
+from mathutils 	import Matrix, Vector
+
+from . duplicate	import CreateTileObject
+from . logging 		import LogDebug
+from . tiles		import GetTilePositionMin
+
+# Distance threshold used when bisecting, matches the double_threshold of the boolean modifiers
+BISECT_THRESHOLD = 0.0001
+
+
+
+# ██████╗ ██╗███████╗███████╗ ██████╗████████╗    ███████╗██╗     ██╗ ██████╗███████╗
+# ██╔══██╗██║██╔════╝██╔════╝██╔════╝╚══██╔══╝    ██╔════╝██║     ██║██╔════╝██╔════╝
+# ██████╔╝██║███████╗█████╗  ██║        ██║       ███████╗██║     ██║██║     █████╗
+# ██╔══██╗██║╚════██║██╔══╝  ██║        ██║       ╚════██║██║     ██║██║     ██╔══╝
+# ██████╔╝██║███████║███████╗╚██████╗   ██║       ███████║███████╗██║╚██████╗███████╗
+# ╚═════╝ ╚═╝╚══════╝╚══════╝ ╚═════╝   ╚═╝       ╚══════╝╚══════╝╚═╝ ╚═════╝╚══════╝
+#
+
+def GetEvaluatedWorldBMesh(
+	obj       : bpy.types.Object,
+	depsgraph : bpy.types.Depsgraph,
+	mesh_cache: "EvaluatedMeshCache" = None
+) -> bmesh.types.BMesh:
+	"""
+	Get a bmesh of an object's evaluated mesh (all modifiers applied), transformed into world space.
+
+	:param obj: The object to read.
+	:type obj: bpy.types.Object
+
+	:param depsgraph: The evaluated depsgraph to read the object from.
+	:type depsgraph: bpy.types.Depsgraph
+
+	:param mesh_cache: Optional cache to read the evaluated mesh from, instead of evaluating it again.
+	:type mesh_cache: EvaluatedMeshCache
+
+	:return: A new bmesh, owned by the caller.
+	:rtype: bmesh.types.BMesh
+	"""
+
+	if mesh_cache is not None:
+		bm = bmesh.new()
+		bm.from_mesh(mesh_cache.Get(obj, depsgraph))
+		return bm
+
+	obj_eval = obj.evaluated_get(depsgraph)
+
+	bm = bmesh.new()
+	bm.from_mesh(obj_eval.to_mesh())
+	bm.transform(obj_eval.matrix_world)
+
+	# Baking a negative scale into the vertices turns the faces inside out, so flip them back
+	if obj_eval.matrix_world.is_negative:
+		bmesh.ops.reverse_faces(bm, faces=bm.faces)
+
+	obj_eval.to_mesh_clear()
+
+	return bm
+
+
+def ClipBMeshToBounds(
+	bm        : bmesh.types.BMesh,
+	bounds_min: tuple[float, float, float],
+	bounds_max: tuple[float, float, float]
+) -> bmesh.types.BMesh:
+	"""
+	Clip a world-space bmesh to an axis-aligned box, in place, by bisecting it along the six
+	planes of the box and discarding everything outside it.
+
+	Unlike the INTERSECT boolean, the cut faces are left open rather than capped. Neighbouring
+	tiles are cut along the same planes, so their geometry still meets without gaps.
+
+	:param bm: The bmesh to clip.
+	:type bm: bmesh.types.BMesh
+
+	:param bounds_min: The minimum coordinates of the box.
+	:type bounds_min: tuple[float, float, float]
+
+	:param bounds_max: The maximum coordinates of the box.
+	:type bounds_max: tuple[float, float, float]
+
+	:return: The clipped bmesh.
+	:rtype: bmesh.types.BMesh
+	"""
+
+	for axis in range(3):
+		normal = Vector((0, 0, 0))
+
+		# Remove everything below the min plane, then everything above the max plane
+		for plane_co, direction in ((bounds_min, -1), (bounds_max, 1)):
+			normal[axis] = direction
+
+			bmesh.ops.bisect_plane(
+				bm,
+				geom        = bm.verts[:] + bm.edges[:] + bm.faces[:],
+				dist        = BISECT_THRESHOLD,
+				plane_co    = plane_co,
+				plane_no    = normal,
+				clear_outer = True,
+			)
+
+	return bm
+
+
+def SliceObjectsBisect(
+	objects    : list[bpy.types.Object],
+	bounds_min : tuple[float, float, float],
+	bounds_max : tuple[float, float, float],
+	new_origin : tuple[float, float, float],
+	temp_prefix: str,
+	mesh_cache : "EvaluatedMeshCache" = None
+) -> list[bpy.types.Object]:
+	"""
+	Slice a list of objects to a tile without a cutter or boolean modifier. Each object's evaluated
+	mesh is clipped against the six planes of the tile and a new object is created from what is left,
+	with its origin at new_origin.
+
+	:param objects: List of Blender objects to slice.
+	:type objects: list[bpy.types.Object]
+
+	:param bounds_min: The minimum coordinates of the tile.
+	:type bounds_min: tuple[float, float, float]
+
+	:param bounds_max: The maximum coordinates of the tile.
+	:type bounds_max: tuple[float, float, float]
+
+	:param new_origin: The origin of the sliced objects.
+	:type new_origin: tuple[float, float, float]
+
+	:param temp_prefix: Prefix to be added to the original objects' names temporarily.
+	:type temp_prefix: str
+
+	:param mesh_cache: Optional cache of evaluated meshes, shared between tiles.
+	:type mesh_cache: EvaluatedMeshCache
+
+	:return: List of new objects, objects with no geometry left in the tile are skipped.
+	:rtype: list[bpy.types.Object]
+	"""
+
+	depsgraph = bpy.context.evaluated_depsgraph_get()
+
+	# Vertices are stored relative to the new origin
+	to_origin = Matrix.Translation(-Vector(new_origin))
+
+	sliced_objects = []
+
+	for obj in objects:
+		bm = GetEvaluatedWorldBMesh(obj, depsgraph, mesh_cache)
+		ClipBMeshToBounds(bm, bounds_min, bounds_max)
+
+		# Nothing of this object is in the tile
+		if len(bm.faces) == 0:
+			bm.free()
+			continue
+
+		bm.transform(to_origin)
+
+		mesh = bpy.data.meshes.new(obj.name)
+		bm.to_mesh(mesh)
+		bm.free()
+
+		sliced_objects.append(CreateTileObject(obj, mesh, new_origin, temp_prefix))
+
+	return sliced_objects
+
+
+
+# ███████╗██╗      █████╗ ██████╗     ███████╗██╗     ██╗ ██████╗███████╗
+# ██╔════╝██║     ██╔══██╗██╔══██╗    ██╔════╝██║     ██║██╔════╝██╔════╝
+# ███████╗██║     ███████║██████╔╝    ███████╗██║     ██║██║     █████╗
+# ╚════██║██║     ██╔══██║██╔══██╗    ╚════██║██║     ██║██║     ██╔══╝
+# ███████║███████╗██║  ██║██████╔╝    ███████║███████╗██║╚██████╗███████╗
+# ╚══════╝╚══════╝╚═╝  ╚═╝╚═════╝     ╚══════╝╚══════╝╚═╝ ╚═════╝╚══════╝
+#
+
+def SplitBMeshAtPlanes(
+	bm    : bmesh.types.BMesh,
+	axis  : int,
+	planes: list[float]
+) -> list[bmesh.types.BMesh]:
+	"""
+	Split a bmesh into len(planes) + 1 slabs along one axis.
+
+	The mesh is split in two at the middle plane and each half is split recursively, so each
+	piece of geometry is only bisected log(n) times instead of once per plane. Both halves are
+	cut along the same plane, so the slabs still meet without gaps.
+
+	:param bm: The bmesh to split. It is consumed, either freed or returned as one of the slabs.
+	:type bm: bmesh.types.BMesh
+
+	:param axis: The axis to split along, 0, 1 or 2 for X, Y or Z.
+	:type axis: int
+
+	:param planes: The sorted positions of the planes to split at.
+	:type planes: list[float]
+
+	:return: A list of slabs, in order from lowest to highest. Slabs may be empty.
+	:rtype: list[bmesh.types.BMesh]
+	"""
+
+	if len(planes) == 0:
+		return [bm]
+
+	middle   = len(planes) // 2
+	plane_co = Vector((0, 0, 0))
+	plane_no = Vector((0, 0, 0))
+	plane_co[axis] = planes[middle]
+	plane_no[axis] = 1
+
+	upper = bm.copy()
+
+	# Keep everything below the plane in bm, and everything above it in upper
+	for mesh, clear_outer in ((bm, True), (upper, False)):
+		bmesh.ops.bisect_plane(
+			mesh,
+			geom        = mesh.verts[:] + mesh.edges[:] + mesh.faces[:],
+			dist        = BISECT_THRESHOLD,
+			plane_co    = plane_co,
+			plane_no    = plane_no,
+			clear_outer = clear_outer,
+			clear_inner = not clear_outer,
+		)
+
+	return SplitBMeshAtPlanes(bm, axis, planes[:middle]) + SplitBMeshAtPlanes(upper, axis, planes[middle + 1:])
+
+
+def DecomposeObjectToTiles(
+	obj         : bpy.types.Object,
+	depsgraph   : bpy.types.Depsgraph,
+	tile_range  : tuple[tuple[int, int, int], tuple[int, int, int]],
+	tileset_data: dict[str, object]
+) -> dict[tuple[int, int, int], bmesh.types.BMesh]:
+	"""
+	Cut an object's evaluated mesh into one piece per tile, in a single pass. The mesh is split
+	into X slabs along the grid planes, each slab is split along Y, and each of those along Z.
+
+	:param obj: The object to decompose.
+	:type obj: bpy.types.Object
+
+	:param depsgraph: The evaluated depsgraph to read the object from.
+	:type depsgraph: bpy.types.Depsgraph
+
+	:param tile_range: The min and max tile index the object overlaps, from the spatial index.
+	:type tile_range: tuple[tuple[int, int, int], tuple[int, int, int]]
+
+	:param tileset_data: The tileset data, as returned by CreateTilesetFromCollection.
+	:type tileset_data: dict[str, object]
+
+	:return: A dictionary mapping tile indexes to world-space pieces. Tiles with no geometry are left out.
+	:rtype: dict[tuple[int, int, int], bmesh.types.BMesh]
+	"""
+
+	tileset_origin  = tileset_data["tileset_origin"]
+	tile_dimensions = tileset_data["tile_dimensions"]
+	range_min, range_max = tile_range
+
+	# The planes between each pair of tiles the object overlaps, on each axis
+	axis_planes = []
+	for axis in range(3):
+		planes = []
+		for i in range(range_min[axis] + 1, range_max[axis] + 1):
+			grid_coords = [0, 0, 0]
+			grid_coords[axis] = i
+			planes.append(GetTilePositionMin(grid_coords, tileset_origin, tile_dimensions)[axis])
+		axis_planes.append(planes)
+
+	pieces = {}
+
+	bm = GetEvaluatedWorldBMesh(obj, depsgraph)
+
+	for x_offset, slab in enumerate(SplitBMeshAtPlanes(bm, 0, axis_planes[0])):
+		for y_offset, column in enumerate(SplitBMeshAtPlanes(slab, 1, axis_planes[1])):
+			for z_offset, piece in enumerate(SplitBMeshAtPlanes(column, 2, axis_planes[2])):
+
+				if len(piece.faces) == 0:
+					piece.free()
+					continue
+
+				tile_index = (
+					range_min[0] + x_offset,
+					range_min[1] + y_offset,
+					range_min[2] + z_offset,
+				)
+				pieces[tile_index] = piece
+
+	return pieces
+
+
+def SliceObjectsSlab(
+	objects      : list[bpy.types.Object],
+	tile_index   : tuple[int, int, int],
+	new_origin   : tuple[float, float, float],
+	temp_prefix  : str,
+	slab_pieces  : dict[bpy.types.Object, dict[tuple[int, int, int], bmesh.types.BMesh]],
+	spatial_index: dict[str, object],
+	tileset_data : dict[str, object]
+) -> list[bpy.types.Object]:
+	"""
+	Slice a list of objects to a tile using slab decomposition. The first time an object is
+	needed it is cut into pieces for every tile it overlaps, and the pieces are stored in
+	slab_pieces. Each tile then just takes its own pieces, so every object is only cut once.
+	An object stays in slab_pieces, even with no pieces left, until ReleaseSlabPieces is called
+	after its last tile, so tiles with no geometry of their own don't cut it again.
+
+	:param objects: List of Blender objects in the tile.
+	:type objects: list[bpy.types.Object]
+
+	:param tile_index: The index of the tile.
+	:type tile_index: tuple[int, int, int]
+
+	:param new_origin: The origin of the sliced objects.
+	:type new_origin: tuple[float, float, float]
+
+	:param temp_prefix: Prefix to be added to the original objects' names temporarily.
+	:type temp_prefix: str
+
+	:param slab_pieces: Pieces of already decomposed objects, updated in place.
+	:type slab_pieces: dict[bpy.types.Object, dict[tuple[int, int, int], bmesh.types.BMesh]]
+
+	:param spatial_index: The spatial index, as returned by BuildSpatialIndex.
+	:type spatial_index: dict[str, object]
+
+	:param tileset_data: The tileset data, as returned by CreateTilesetFromCollection.
+	:type tileset_data: dict[str, object]
+
+	:return: List of new objects, objects with no geometry left in the tile are skipped.
+	:rtype: list[bpy.types.Object]
+	"""
+
+	depsgraph  = bpy.context.evaluated_depsgraph_get()
+	to_origin  = Matrix.Translation(-Vector(new_origin))
+	tile_index = tuple(tile_index)
+
+	sliced_objects = []
+
+	for obj in objects:
+		if obj not in slab_pieces:
+			slab_pieces[obj] = DecomposeObjectToTiles(obj, depsgraph, spatial_index["object_ranges"][obj], tileset_data)
+			LogDebug("    Decomposed", obj.name, "into", len(slab_pieces[obj]), "pieces")
+
+		bm = slab_pieces[obj].pop(tile_index, None)
+		if bm is None:
+			continue
+
+		bm.transform(to_origin)
+
+		mesh = bpy.data.meshes.new(obj.name)
+		bm.to_mesh(mesh)
+		bm.free()
+
+		sliced_objects.append(CreateTileObject(obj, mesh, new_origin, temp_prefix))
+
+	return sliced_objects
+
+
+def ReleaseSlabPieces(
+	slab_pieces: dict[bpy.types.Object, dict[tuple[int, int, int], bmesh.types.BMesh]],
+	obj        : bpy.types.Object
+) -> None:
+	"""
+	Free an object's remaining pieces once its last tile has been processed.
+
+	:param slab_pieces: Pieces of decomposed objects, updated in place.
+	:type slab_pieces: dict[bpy.types.Object, dict[tuple[int, int, int], bmesh.types.BMesh]]
+
+	:param obj: The object to release.
+	:type obj: bpy.types.Object
+	"""
+
+	for bm in slab_pieces.pop(obj, {}).values():
+		bm.free()
+
+
+def FreeSlabPieces(slab_pieces: dict[bpy.types.Object, dict[tuple[int, int, int], bmesh.types.BMesh]]) -> None:
+	"""
+	Free any pieces left over from slab decomposition, eg. if the export was cancelled.
+
+	:param slab_pieces: Pieces of decomposed objects, emptied in place.
+	:type slab_pieces: dict[bpy.types.Object, dict[tuple[int, int, int], bmesh.types.BMesh]]
+	"""
+
+	for pieces in slab_pieces.values():
+		for bm in pieces.values():
+			bm.free()
+
+	slab_pieces.clear()
@@ -0,0 +1,305 @@
+import bpy
+import math
+
+from . logging 	import Log
+from . tiles	import GetTilePositionMin, GetTilePositionMax
+
+
+
+# ██████╗ ██╗   ██╗██╗██╗     ██████╗     ██╗███╗   ██╗██████╗ ███████╗██╗  ██╗
+# ██╔══██╗██║   ██║██║██║     ██╔══██╗    ██║████╗  ██║██╔══██╗██╔════╝╚██╗██╔╝
+# ██████╔╝██║   ██║██║██║     ██║  ██║    ██║██╔██╗ ██║██║  ██║█████╗   ╚███╔╝
+# ██╔══██╗██║   ██║██║██║     ██║  ██║    ██║██║╚██╗██║██║  ██║██╔══╝   ██╔██╗
+# ██████╔╝╚██████╔╝██║███████╗██████╔╝    ██║██║ ╚████║██████╔╝███████╗██╔╝ ██╗
+# ╚═════╝  ╚═════╝ ╚═╝╚══════╝╚═════╝     ╚═╝╚═╝  ╚═══╝╚═════╝ ╚══════╝╚═╝  ╚═╝
+#
+
+def BuildSpatialIndex(
+	object_bounds: dict[bpy.types.Object, tuple[tuple[float, float, float], tuple[float, float, float]]],
+	tileset_data : dict[str, object]
+) -> dict[str, object]:
+	"""
+	Build a uniform-grid spatial index of the objects in a tileset.
+
+	Each object is mapped to the range of tile indexes its bounding box overlaps, and every
+	tile in that range gets a reference to the object in its bucket. Tiles without a bucket
+	are empty and never need to be looked at again.
+
+	:param object_bounds: Dictionary mapping objects to their min/max bounds, as returned by GetCollectionObjectBounds.
+	:type object_bounds: dict[bpy.types.Object, tuple[tuple[float, float, float], tuple[float, float, float]]]
+
+	:param tileset_data: The tileset data, as returned by CreateTilesetFromCollection.
+	:type tileset_data: dict[str, object]
+
+	:return: A dictionary with the following keys:
+		- "object_bounds": The object_bounds the index was built from.
+		- "object_ranges": Maps each indexed object to its (min, max) tile index range, inclusive.
+		- "buckets"      : Maps each occupied tile index (x, y, z) to a list of objects.
+	:rtype: dict[str, object]
+	"""
+
+	# Get scene slicer settings
+	ss_settings = bpy.context.scene.ss_settings
+
+	# shorthand references to the values we need
+	tileset_origin  = tileset_data["tileset_origin"]
+	tileset_size    = tileset_data["tileset_size"]
+	tile_dimensions = tileset_data["tile_dimensions"]
+
+	object_ranges = {}
+	buckets       = {}
+
+	for obj, (obj_bounds_min, obj_bounds_max) in object_bounds.items():
+
+		# Apply the same filters GetObjectsWithinBounds used to apply per-tile
+		if obj.type != 'MESH':
+			continue
+
+		if ss_settings.skip_colliders and obj.name.endswith("_collider"):
+			continue
+
+		# Work out the tile range on each axis, skip the object if it misses the grid on any of them
+		axis_ranges = [
+			GetAxisTileRange(obj_bounds_min[i], obj_bounds_max[i], tileset_origin, tile_dimensions, tileset_size[i], i)
+			for i in range(3)
+		]
+
+		if None in axis_ranges:
+			continue
+
+		range_min = tuple(axis_range[0] for axis_range in axis_ranges)
+		range_max = tuple(axis_range[1] for axis_range in axis_ranges)
+		object_ranges[obj] = (range_min, range_max)
+
+		# Add the object to the bucket of every tile it touches. Objects are added in the same
+		# order as object_bounds, so lookups return them in the same order as the old linear scan
+		for x in range(range_min[0], range_max[0] + 1):
+			for y in range(range_min[1], range_max[1] + 1):
+				for z in range(range_min[2], range_max[2] + 1):
+					buckets.setdefault((x, y, z), []).append(obj)
+
+	Log("Spatial index built:", len(object_ranges), "objects across", len(buckets), "occupied tiles")
+
+	return {
+		"object_bounds": object_bounds,
+		"object_ranges": object_ranges,
+		"buckets"      : buckets,
+	}
+
+
+def GetAxisTileRange(
+	obj_min        : float,
+	obj_max        : float,
+	tileset_origin : tuple[float, float, float],
+	tile_dimensions: tuple[float, float, float],
+	tile_count     : int,
+	axis           : int
+) -> tuple[int, int] | None:
+	"""
+	Get the inclusive range of tile indexes that an object overlaps on a single axis.
+
+	The range is estimated arithmetically, widened by one tile, then trimmed using the exact
+	same overlap test as GetObjectsWithinBounds against the tile positions from GetTilePositionMin
+	and GetTilePositionMax. This keeps the result identical to the linear scan, even when an object
+	sits exactly on a tile boundary.
+
+	:param obj_min: The minimum bound of the object on this axis.
+	:type obj_min: float
+
+	:param obj_max: The maximum bound of the object on this axis.
+	:type obj_max: float
+
+	:param tileset_origin: The origin of the tileset.
+	:type tileset_origin: tuple[float, float, float]
+
+	:param tile_dimensions: The dimensions of each tile.
+	:type tile_dimensions: tuple[float, float, float]
+
+	:param tile_count: The number of tiles on this axis.
+	:type tile_count: int
+
+	:param axis: The axis to check, 0, 1 or 2 for X, Y or Z.
+	:type axis: int
+
+	:return: A tuple of the first and last tile index, or None if the object doesn't overlap any tile.
+	:rtype: tuple[int, int] | None
+	"""
+
+	if tile_count <= 0:
+		return None
+
+	origin    = tileset_origin[axis]
+	dimension = tile_dimensions[axis]
+
+	first = max(math.floor((obj_min - origin) / dimension) - 1, 0)
+	last  = min(math.ceil((obj_max - origin) / dimension), tile_count - 1)
+
+	def overlaps(i):
+		grid_coords = [0, 0, 0]
+		grid_coords[axis] = i
+		tile_min = GetTilePositionMin(grid_coords, tileset_origin, tile_dimensions)[axis]
+		tile_max = GetTilePositionMax(grid_coords, tileset_origin, tile_dimensions)[axis]
+		return (tile_max > obj_min) and (tile_min < obj_max)
+
+	while first <= last and not overlaps(first):
+		first += 1
+
+	while last >= first and not overlaps(last):
+		last -= 1
+
+	if first > last:
+		return None
+
+	return first, last
+
+
+
+# ████████╗██╗██╗     ███████╗    ██╗      ██████╗  ██████╗ ██╗  ██╗██╗   ██╗██████╗
+# ╚══██╔══╝██║██║     ██╔════╝    ██║     ██╔═══██╗██╔═══██╗██║ ██╔╝██║   ██║██╔══██╗
+#    ██║   ██║██║     █████╗      ██║     ██║   ██║██║   ██║█████╔╝ ██║   ██║██████╔╝
+#    ██║   ██║██║     ██╔══╝      ██║     ██║   ██║██║   ██║██╔═██╗ ██║   ██║██╔═══╝
+#    ██║   ██║███████╗███████╗    ███████╗╚██████╔╝╚██████╔╝██║  ██╗╚██████╔╝██║
+#    ╚═╝   ╚═╝╚══════╝╚══════╝    ╚══════╝ ╚═════╝  ╚═════╝ ╚═╝  ╚═╝ ╚═════╝ ╚═╝
+#
+
+def GetObjectsInTile(
+	spatial_index: dict[str, object],
+	tile_index   : tuple[int, int, int]
+) -> list[bpy.types.Object]:
+	"""
+	Get the objects whose bounding boxes overlap the given tile.
+
+	:param spatial_index: The spatial index, as returned by BuildSpatialIndex.
+	:type spatial_index: dict[str, object]
+
+	:param tile_index: The index of the tile.
+	:type tile_index: tuple[int, int, int]
+
+	:return: A list of objects in the tile, empty if the tile is unoccupied.
+	:rtype: list[bpy.types.Object]
+	"""
+
+	return list(spatial_index["buckets"].get(tuple(tile_index), []))
+
+
+def IsTileOccupied(
+	spatial_index: dict[str, object],
+	tile_index   : tuple[int, int, int]
+) -> bool:
+	"""
+	Check if any object overlaps the given tile.
+
+	:param spatial_index: The spatial index, as returned by BuildSpatialIndex.
+	:type spatial_index: dict[str, object]
+
+	:param tile_index: The index of the tile.
+	:type tile_index: tuple[int, int, int]
+
+	:return: True if the tile has at least one object in it.
+	:rtype: bool
+	"""
+
+	return tuple(tile_index) in spatial_index["buckets"]
+
+
+def GetOccupiedTiles(spatial_index: dict[str, object]) -> list[tuple[int, int, int]]:
+	"""
+	Get the indexes of all occupied tiles, sorted in x -> y -> z order.
+
+	:param spatial_index: The spatial index, as returned by BuildSpatialIndex.
+	:type spatial_index: dict[str, object]
+
+	:return: A sorted list of tile indexes.
+	:rtype: list[tuple[int, int, int]]
+	"""
+
+	return sorted(spatial_index["buckets"].keys())
+
+
+
+#  ██████╗ ██████╗ ███╗   ██╗████████╗ █████╗ ██╗███╗   ██╗███╗   ███╗███████╗███╗   ██╗████████╗
+# ██╔════╝██╔═══██╗████╗  ██║╚══██╔══╝██╔══██╗██║████╗  ██║████╗ ████║██╔════╝████╗  ██║╚══██╔══╝
+# ██║     ██║   ██║██╔██╗ ██║   ██║   ███████║██║██╔██╗ ██║██╔████╔██║█████╗  ██╔██╗ ██║   ██║
+# ██║     ██║   ██║██║╚██╗██║   ██║   ██╔══██║██║██║╚██╗██║██║╚██╔╝██║██╔══╝  ██║╚██╗██║   ██║
+# ╚██████╗╚██████╔╝██║ ╚████║   ██║   ██║  ██║██║██║ ╚████║██║ ╚═╝ ██║███████╗██║ ╚████║   ██║
+#  ╚═════╝ ╚═════╝ ╚═╝  ╚═══╝   ╚═╝   ╚═╝  ╚═╝╚═╝╚═╝  ╚═══╝╚═╝     ╚═╝╚══════╝╚═╝  ╚═══╝   ╚═╝
+#
+
+def ClassifyObjectInTile(
+	spatial_index: dict[str, object],
+	obj          : bpy.types.Object,
+	tile_min     : tuple[float, float, float],
+	tile_max     : tuple[float, float, float]
+) -> str:
+	"""
+	Classify how an object's bounding box sits relative to a tile.
+
+	:param spatial_index: The spatial index, as returned by BuildSpatialIndex.
+	:type spatial_index: dict[str, object]
+
+	:param obj: The object to classify.
+	:type obj: bpy.types.Object
+
+	:param tile_min: The minimum coordinates of the tile.
+	:type tile_min: tuple[float, float, float]
+
+	:param tile_max: The maximum coordinates of the tile.
+	:type tile_max: tuple[float, float, float]
+
+	:return: "INSIDE" if the object is fully contained by the tile, "STRADDLING" if it crosses
+		one or more of the tile's faces, or "OUTSIDE" if it doesn't overlap the tile at all.
+	:rtype: str
+	"""
+
+	obj_bounds_min, obj_bounds_max = spatial_index["object_bounds"][obj]
+
+	inside = True
+
+	for i in range(3):
+		if not ((tile_max[i] > obj_bounds_min[i]) and (tile_min[i] < obj_bounds_max[i])):
+			return "OUTSIDE"
+
+		if obj_bounds_min[i] < tile_min[i] or obj_bounds_max[i] > tile_max[i]:
+			inside = False
+
+	return "INSIDE" if inside else "STRADDLING"
+
+
+def SplitObjectsByContainment(
+	spatial_index: dict[str, object],
+	objects      : list[bpy.types.Object],
+	tile_min     : tuple[float, float, float],
+	tile_max     : tuple[float, float, float]
+) -> tuple[list[bpy.types.Object], list[bpy.types.Object]]:
+	"""
+	Split the objects in a tile into those fully inside it, which can be copied as-is, and
+	those straddling its faces, which need to be clipped. Objects outside the tile are dropped.
+
+	:param spatial_index: The spatial index, as returned by BuildSpatialIndex.
+	:type spatial_index: dict[str, object]
+
+	:param objects: The objects in the tile, as returned by GetObjectsInTile.
+	:type objects: list[bpy.types.Object]
+
+	:param tile_min: The minimum coordinates of the tile.
+	:type tile_min: tuple[float, float, float]
+
+	:param tile_max: The maximum coordinates of the tile.
+	:type tile_max: tuple[float, float, float]
+
+	:return: A tuple of the inside objects and the straddling objects.
+	:rtype: tuple[list[bpy.types.Object], list[bpy.types.Object]]
+	"""
+
+	inside_objects     = []
+	straddling_objects = []
+
+	for obj in objects:
+		containment = ClassifyObjectInTile(spatial_index, obj, tile_min, tile_max)
+
+		if containment == "INSIDE":
+			inside_objects.append(obj)
+		elif containment == "STRADDLING":
+			straddling_objects.append(obj)
+
+	return inside_objects, straddling_objects
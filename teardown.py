@@ -0,0 +1,190 @@
+import bpy
+
+from . logging	import Log
+
+
+
+#  ██████╗ ██████╗ ███╗   ██╗███████╗████████╗ █████╗ ███╗   ██╗████████╗███████╗
+# ██╔════╝██╔═══██╗████╗  ██║██╔════╝╚══██╔══╝██╔══██╗████╗  ██║╚══██╔══╝██╔════╝
+# ██║     ██║   ██║██╔██╗ ██║███████╗   ██║   ███████║██╔██╗ ██║   ██║   ███████╗
+# ██║     ██║   ██║██║╚██╗██║╚════██║   ██║   ██╔══██║██║╚██╗██║   ██║   ╚════██║
+# ╚██████╗╚██████╔╝██║ ╚████║███████║   ██║   ██║  ██║██║ ╚████║   ██║   ███████║
+#  ╚═════╝ ╚═════╝ ╚═╝  ╚═══╝╚══════╝   ╚═╝   ╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝   ╚══════╝
+#
+
+# Custom property used to tag the objects and meshes created by slicing, with the name of the
+# collection they were sliced from
+GENERATED_PROPERTY = "ss_generated"
+
+# Prefix of the collections the sliced objects are placed in
+SLICED_PREFIX = "_sliced."
+
+# Bytes per element of each attribute data type, used to estimate mesh sizes
+ATTRIBUTE_SIZES = {
+	"FLOAT"        : 4,
+	"INT"          : 4,
+	"FLOAT_VECTOR" : 12,
+	"FLOAT_COLOR"  : 16,
+	"BYTE_COLOR"   : 4,
+	"BOOLEAN"      : 1,
+	"FLOAT2"       : 8,
+	"INT8"         : 1,
+	"INT32_2D"     : 8,
+	"QUATERNION"   : 16,
+	"FLOAT4X4"     : 64,
+}
+
+
+
+# ████████╗ █████╗  ██████╗  ██████╗ ██╗███╗   ██╗ ██████╗
+# ╚══██╔══╝██╔══██╗██╔════╝ ██╔════╝ ██║████╗  ██║██╔════╝
+#    ██║   ███████║██║  ███╗██║  ███╗██║██╔██╗ ██║██║  ███╗
+#    ██║   ██╔══██║██║   ██║██║   ██║██║██║╚██╗██║██║   ██║
+#    ██║   ██║  ██║╚██████╔╝╚██████╔╝██║██║ ╚████║╚██████╔╝
+#    ╚═╝   ╚═╝  ╚═╝ ╚═════╝  ╚═════╝ ╚═╝╚═╝  ╚═══╝ ╚═════╝
+#
+
+def TagGenerated(objects: list[bpy.types.Object], collection: bpy.types.Collection):
+	"""
+	Tag sliced objects and their meshes as generated from a collection, so a later run can find
+	and remove them, even if they've been moved out of the sliced collection or orphaned.
+
+	:param objects: The sliced objects.
+	:type objects: list[bpy.types.Object]
+
+	:param collection: The collection they were sliced from.
+	:type collection: bpy.types.Collection
+	"""
+
+	for obj in objects:
+		obj[GENERATED_PROPERTY] = collection.name
+		if obj.data:
+			obj.data[GENERATED_PROPERTY] = collection.name
+
+
+
+# ████████╗███████╗ █████╗ ██████╗ ██████╗  ██████╗ ██╗    ██╗███╗   ██╗
+# ╚══██╔══╝██╔════╝██╔══██╗██╔══██╗██╔══██╗██╔═══██╗██║    ██║████╗  ██║
+#    ██║   █████╗  ███████║██████╔╝██║  ██║██║   ██║██║ █╗ ██║██╔██╗ ██║
+#    ██║   ██╔══╝  ██╔══██║██╔══██╗██║  ██║██║   ██║██║███╗██║██║╚██╗██║
+#    ██║   ███████╗██║  ██║██║  ██║██████╔╝╚██████╔╝╚███╔███╔╝██║ ╚████║
+#    ╚═╝   ╚══════╝╚═╝  ╚═╝╚═╝  ╚═╝╚═════╝  ╚═════╝  ╚══╝╚══╝ ╚═╝  ╚═══╝
+#
+
+def GatherGeneratedData(collection_name: str) -> list[bpy.types.ID]:
+	"""
+	Gather every datablock left by previous slicing runs of a collection: its sliced collection
+	and the objects in it, anything tagged with GENERATED_PROPERTY, and the meshes, materials and
+	images only those use, including ones that are already orphaned.
+
+	:param collection_name: The name of the collection that was sliced.
+	:type collection_name: str
+
+	:return: The datablocks to remove.
+	:rtype: list[bpy.types.ID]
+	"""
+
+	sliced_collection = bpy.data.collections.get(SLICED_PREFIX + collection_name)
+
+	objects = set(sliced_collection.all_objects) if sliced_collection else set()
+	objects.update(obj for obj in bpy.data.objects if obj.get(GENERATED_PROPERTY) == collection_name)
+
+	# Count how many of the objects use each datablock, those with other users have to stay
+	data_users = {}
+	for obj in objects:
+		if obj.data:
+			data_users[obj.data] = data_users.get(obj.data, 0) + 1
+
+	data = set(datablock for datablock, count in data_users.items() if datablock.users == count)
+
+	# Tagged data that's been orphaned, eg by objects removed without their meshes
+	for data_collection in (bpy.data.meshes, bpy.data.materials, bpy.data.images):
+		for datablock in data_collection:
+			if datablock.get(GENERATED_PROPERTY) == collection_name and datablock.users == 0:
+				data.add(datablock)
+
+	datablocks = list(objects) + list(data)
+	if sliced_collection:
+		datablocks.append(sliced_collection)
+
+	return datablocks
+
+
+def TeardownPreviousRun(collection_name: str) -> dict:
+	"""
+	Remove everything left by previous slicing runs of a collection in a single batch_remove
+	call, which is much faster than removing objects one at a time as Blender only has to
+	update its references once.
+
+	:param collection_name: The name of the collection that was sliced.
+	:type collection_name: str
+
+	:return: The number of each type of datablock removed, and "bytes", an estimate of the memory reclaimed.
+	:rtype: dict
+	"""
+
+	datablocks = GatherGeneratedData(collection_name)
+
+	report = {
+		"objects"    : 0,
+		"meshes"     : 0,
+		"materials"  : 0,
+		"images"     : 0,
+		"collections": 0,
+		"bytes"      : 0,
+	}
+
+	for datablock in datablocks:
+		report["bytes"] += EstimateDataSize(datablock)
+
+		if isinstance(datablock, bpy.types.Object):
+			report["objects"] += 1
+		elif isinstance(datablock, bpy.types.Mesh):
+			report["meshes"] += 1
+		elif isinstance(datablock, bpy.types.Material):
+			report["materials"] += 1
+		elif isinstance(datablock, bpy.types.Image):
+			report["images"] += 1
+		elif isinstance(datablock, bpy.types.Collection):
+			report["collections"] += 1
+
+	if datablocks:
+		bpy.data.batch_remove(datablocks)
+
+		Log("Removed the previous run:", report["objects"], "objects,", report["meshes"], "meshes,", report["materials"], "materials,", report["images"], "images,",
+			"reclaiming about", round(report["bytes"] / (1024 * 1024), 1), "MB")
+
+	return report
+
+
+def EstimateDataSize(datablock: bpy.types.ID) -> int:
+	"""
+	Estimate the memory held by a datablock's data. Meshes are sized from their attributes and
+	images from their pixels, anything else is counted as nothing.
+
+	:param datablock: The datablock to size.
+	:type datablock: bpy.types.ID
+
+	:return: The estimated size, in bytes.
+	:rtype: int
+	"""
+
+	if isinstance(datablock, bpy.types.Mesh):
+		domain_sizes = {
+			"POINT" : len(datablock.vertices),
+			"EDGE"  : len(datablock.edges),
+			"FACE"  : len(datablock.polygons),
+			"CORNER": len(datablock.loops),
+		}
+
+		# Face offsets aren't an attribute
+		size = (len(datablock.polygons) + 1) * 4
+		for attribute in datablock.attributes:
+			size += domain_sizes.get(attribute.domain, 0) * ATTRIBUTE_SIZES.get(attribute.data_type, 4)
+
+		return size
+
+	if isinstance(datablock, bpy.types.Image) and datablock.has_data:
+		return datablock.size[0] * datablock.size[1] * datablock.channels * (4 if datablock.is_float else 1)
+
+	return 0
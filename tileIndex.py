@@ -0,0 +1,143 @@
+import bpy
+import numpy as np
+import os
+import struct
+
+from . export		import GetExportPath
+from . tilesets		import IterTilesetRows, SwizzleYZ
+
+
+
+#  ██████╗ ██████╗ ███╗   ██╗███████╗████████╗ █████╗ ███╗   ██╗████████╗███████╗
+# ██╔════╝██╔═══██╗████╗  ██║██╔════╝╚══██╔══╝██╔══██╗████╗  ██║╚══██╔══╝██╔════╝
+# ██║     ██║   ██║██╔██╗ ██║███████╗   ██║   ███████║██╔██╗ ██║   ██║   ███████╗
+# ██║     ██║   ██║██║╚██╗██║╚════██║   ██║   ██╔══██║██║╚██╗██║   ██║   ╚════██║
+# ╚██████╗╚██████╔╝██║ ╚████║███████║   ██║   ██║  ██║██║ ╚████║   ██║   ███████║
+#  ╚═════╝ ╚═════╝ ╚═╝  ╚═══╝╚══════╝   ╚═╝   ╚═╝  ╚═╝╚═╝  ╚═══╝   ╚═╝   ╚══════╝
+#
+
+TILE_INDEX_NAME    = "tileset.index.bin"
+TILE_INDEX_MAGIC   = b"SSTI"
+TILE_INDEX_VERSION = 1
+
+# Header: magic, version, flags, tileset size (3 x u32), tileset origin (3 x f32),
+# tile dimensions (3 x f32), exported tile count, entry size, table offset, strings offset,
+# padded to 64 bytes
+HEADER_FORMAT = "<4sHH3I3f3fIIII4x"
+HEADER_SIZE   = struct.calcsize(HEADER_FORMAT)
+
+HEADER_FLAG_Y_UP = 1 << 0
+HEADER_FLAG_GLB  = 1 << 1
+
+# Entry: src offset into the strings block, src length, flags, size of the tile's glTF file
+ENTRY_DTYPE = np.dtype([
+	("src_offset", "<u4"),
+	("src_length", "<u2"),
+	("flags",      "<u2"),
+	("file_size",  "<u4"),
+])
+
+ENTRY_FLAG_OCCUPIED = 1 << 0
+ENTRY_EMPTY_OFFSET  = 0xFFFFFFFF
+
+
+
+# ████████╗██╗██╗     ███████╗    ██╗███╗   ██╗██████╗ ███████╗██╗  ██╗
+# ╚══██╔══╝██║██║     ██╔════╝    ██║████╗  ██║██╔══██╗██╔════╝╚██╗██╔╝
+#    ██║   ██║██║     █████╗      ██║██╔██╗ ██║██║  ██║█████╗   ╚███╔╝
+#    ██║   ██║██║     ██╔══╝      ██║██║╚██╗██║██║  ██║██╔══╝   ██╔██╗
+#    ██║   ██║███████╗███████╗    ██║██║ ╚████║██████╔╝███████╗██╔╝ ██╗
+#    ╚═╝   ╚═╝╚══════╝╚══════╝    ╚═╝╚═╝  ╚═══╝╚═════╝ ╚══════╝╚═╝  ╚═╝
+#
+
+def ExportTileIndex(
+	tileset_data: dict,
+	file_path   : str,
+	swizzle     : bool = False
+) -> None:
+	"""
+	Export a compact binary index of the tiles, so a client can find the tile covering a
+	position without parsing tileset.json.
+
+	The file is a fixed size header, then a table with one fixed size entry per tile in the
+	grid, then a block of the tile src names. The table is in the same x/y/z layout and axis
+	order as tileset.json, including the swizzle, so the entry for tile (x, y, z) is at
+	table_offset + ((x * size_y + y) * size_z + z) * entry_size and can be read directly.
+	See the README for the full layout.
+
+	:param tileset_data: The tileset data, as returned by CreateTilesetFromCollection.
+	:type tileset_data: dict
+
+	:param file_path: The path to write to.
+	:type file_path: str
+
+	:param swizzle: Swizzle the index to Y+ up, the same as SwizzleTilesetData.
+	:type swizzle: bool
+	"""
+
+	# Get scene slicer settings
+	ss_settings = bpy.context.scene.ss_settings
+
+	size       = SwizzleYZ(tileset_data["tileset_size"])    if swizzle else tileset_data["tileset_size"]
+	origin     = SwizzleYZ(tileset_data["tileset_origin"])  if swizzle else tileset_data["tileset_origin"]
+	dimensions = SwizzleYZ(tileset_data["tile_dimensions"]) if swizzle else tileset_data["tile_dimensions"]
+	extension  = ".glb" if ss_settings.export_format == "GLB" else ".gltf"
+
+	entries = np.zeros(size[0] * size[1] * size[2], dtype=ENTRY_DTYPE)
+	entries["src_offset"] = ENTRY_EMPTY_OFFSET
+
+	strings    = bytearray()
+	tile_count = 0
+	i          = 0
+
+	# Tiles come out in x/y/z order, the same as the table
+	for plane in IterTilesetRows(tileset_data, swizzle):
+		for row in plane:
+			for tile in row:
+				if tile["src"] is not None:
+					src       = tile["src"].encode("utf-8")
+					tile_path = GetExportPath(tile["src"] + extension)
+
+					entries[i] = (
+						len(strings),
+						len(src),
+						ENTRY_FLAG_OCCUPIED,
+						os.path.getsize(tile_path) if os.path.exists(tile_path) else 0,
+					)
+
+					strings    += src
+					tile_count += 1
+
+				i += 1
+
+	flags = 0
+	if swizzle:
+		flags |= HEADER_FLAG_Y_UP
+	if ss_settings.export_format == "GLB":
+		flags |= HEADER_FLAG_GLB
+
+	table_offset   = HEADER_SIZE
+	strings_offset = table_offset + entries.nbytes
+
+	header = struct.pack(
+		HEADER_FORMAT,
+		TILE_INDEX_MAGIC,
+		TILE_INDEX_VERSION,
+		flags,
+		*size,
+		*origin,
+		*dimensions,
+		tile_count,
+		ENTRY_DTYPE.itemsize,
+		table_offset,
+		strings_offset,
+	)
+
+	# Write beside the real file and swap it in, so a crash never leaves half an index
+	temp_path = file_path + ".tmp"
+	with open(temp_path, "wb") as file:
+		file.write(header)
+		file.write(entries.tobytes())
+		file.write(strings)
+
+	os.replace(temp_path, file_path)
@@ -25,12 +25,16 @@ except ImportError:
 #
 
 
-def CreateTilesetFromCollection(col: bpy.types.Collection) -> dict[str, object]:
+def CreateTilesetFromCollection(
+	col        : bpy.types.Collection,
+	bounds_data: dict[str, object] = None
+) -> dict[str, object]:
 	"""
 	Creates tileset data from a collection.
 
 	Args:
 	- col (bpy.types.Collection): The Blender collection.
+	- bounds_data (dict[str, object], optional): Pre-computed bounds, as returned by GetCollectionBoundsData.
 
 	Returns:
 	- Dict[str, object]: A dictionary containing tileset data.
@@ -56,7 +60,7 @@ def CreateTilesetFromCollection(col: bpy.types.Collection) -> dict[str, object]:
 	)
 
 	# Get bounds min/max points for all objects in the collections
-	bounds_min, bounds_max, bounds_com = GetCollectionBounds(col)
+	bounds_min, bounds_max, bounds_com = GetCollectionBounds(col, bounds_data)
 
 	# Use bounds to work out the required tileset size and origin
 	tileset_size, tileset_origin = GetTilesetSizeOrigin(bounds_min, bounds_max, tile_dimensions)
@@ -164,9 +168,18 @@ def SwizzleYZ(data: tuple[float, float, float]) -> tuple[float, float, float]:
 	return [data[0], data[2], data[1]]
 
 
-def SwizzleTilesetData(og_data) -> dict[str, object]:
+def SwizzleTilesetHeader(og_data) -> dict[str, object]:
+	"""
+	Swizzle everything in the tileset data except the tiles themselves.
+
+	Args:
+	- og_data (dict[str, object]): The tileset data, as returned by CreateTilesetFromCollection.
+
+	Returns:
+	- dict[str, object]: The swizzled tileset data, with an empty list of tiles.
+	"""
 
-	new_data = {
+	return {
 		"name"           : og_data["name"],
 		"tileset_size"   : SwizzleYZ(og_data["tileset_size"]),
 		"tileset_origin" : SwizzleYZ(og_data["tileset_origin"]),
@@ -176,6 +189,54 @@ def SwizzleTilesetData(og_data) -> dict[str, object]:
 		"tiles"          : []
 	}
 
+
+def SwizzleTile(og_tile) -> dict[str, object]:
+	"""
+	Swizzle a single tile's index and positions.
+
+	Args:
+	- og_tile (dict[str, object]): The tile data.
+
+	Returns:
+	- dict[str, object]: The swizzled tile data.
+	"""
+
+	new_tile = {
+		"index"     : SwizzleYZ(og_tile["index"]),
+		"src"       : og_tile["src"],
+		"pos_center": SwizzleYZ(og_tile["pos_center"]),
+		"pos_min"   : SwizzleYZ(og_tile["pos_min"]),
+		"pos_max"   : SwizzleYZ(og_tile["pos_max"]),
+	}
+
+	if "lods" in og_tile:
+		new_tile["lods"] = og_tile["lods"]
+
+	return new_tile
+
+
+def SwizzleNode(og_node) -> dict[str, object]:
+	"""
+	Swizzle an octree node and its children, see BuildOctree.
+
+	Args:
+	- og_node (dict[str, object]): The node data.
+
+	Returns:
+	- dict[str, object]: The swizzled node data.
+	"""
+
+	new_node = {"level": og_node["level"]}
+	new_node.update(SwizzleTile(og_node))
+	new_node["children"] = [SwizzleNode(child) for child in og_node["children"]]
+
+	return new_node
+
+
+def SwizzleTilesetData(og_data) -> dict[str, object]:
+
+	new_data = SwizzleTilesetHeader(og_data)
+
 	for x in range(new_data["tileset_size"][0]):
 		new_data["tiles"].append([])
 
@@ -183,15 +244,31 @@ def SwizzleTilesetData(og_data) -> dict[str, object]:
 			new_data["tiles"][x].append([])
 
 			for z in range(new_data["tileset_size"][2]):
-				
-				og_tile = og_data["tiles"][x][z][y]
-
-				new_data["tiles"][x][y].append({
-					"index"     : SwizzleYZ(og_tile["index"]),
-					"src"       : og_tile["src"],
-					"pos_center": SwizzleYZ(og_tile["pos_center"]),
-					"pos_min"   : SwizzleYZ(og_tile["pos_min"]),
-					"pos_max"   : SwizzleYZ(og_tile["pos_max"]),
-				})
+				new_data["tiles"][x][y].append(SwizzleTile(og_data["tiles"][x][z][y]))
 
 	return new_data
+
+
+def IterTilesetRows(tileset_data, swizzle: bool = False):
+	"""
+	Iterate over the tiles in the layout they're written to tileset.json, a row of tiles at a
+	time, swizzling each one as it goes if required. Nothing is copied up front, so this can be
+	used to stream the tiles out without building a swizzled copy of the tileset.
+
+	Args:
+	- tileset_data (dict[str, object]): The tileset data, as returned by CreateTilesetFromCollection.
+	- swizzle (bool): Swizzle the tiles to Y+ up, the same as SwizzleTilesetData.
+
+	Returns:
+	- Iterator[Iterator[Iterator[dict[str, object]]]]: The tiles, nested by x, y then z.
+	"""
+
+	tiles = tileset_data["tiles"]
+	size  = SwizzleYZ(tileset_data["tileset_size"]) if swizzle else tileset_data["tileset_size"]
+
+	def IterRow(x, y):
+		for z in range(size[2]):
+			yield SwizzleTile(tiles[x][z][y]) if swizzle else tiles[x][y][z]
+
+	for x in range(size[0]):
+		yield (IterRow(x, y) for y in range(size[1]))
@@ -0,0 +1,169 @@
+import bpy
+
+
+
+# ████████╗██╗██╗     ███████╗     ██████╗ ██████╗ ██████╗ ███████╗██████╗
+# ╚══██╔══╝██║██║     ██╔════╝    ██╔═══██╗██╔══██╗██╔══██╗██╔════╝██╔══██╗
+#    ██║   ██║██║     █████╗      ██║   ██║██████╔╝██║  ██║█████╗  ██████╔╝
+#    ██║   ██║██║     ██╔══╝      ██║   ██║██╔══██╗██║  ██║██╔══╝  ██╔══██╗
+#    ██║   ██║███████╗███████╗    ╚██████╔╝██║  ██║██████╔╝███████╗██║  ██║
+#    ╚═╝   ╚═╝╚══════╝╚══════╝     ╚═════╝ ╚═╝  ╚═╝╚═════╝ ╚══════╝╚═╝  ╚═╝
+#
+
+def GetTileOrder(
+	tileset_size: tuple[int, int, int],
+	method      : str = "LINEAR"
+) -> list[tuple[int, int, int]]:
+	"""
+	Get the order in which to visit every tile in the tileset.
+
+	Space-filling curves keep tiles that are close together in space close together in the order,
+	so tiles sharing the same objects are processed back-to-back and their cached data can be
+	released sooner. The order only affects processing, not the layout of the exported tileset.
+
+	Args:
+	- tileset_size (tuple[int, int, int]): The size of the tileset, in tiles.
+	- method (str): One of LINEAR (x -> y -> z, the original order), MORTON (Z-order curve) or HILBERT.
+
+	Returns:
+	- list[tuple[int, int, int]]: Every tile index in the tileset, in the order to visit them.
+	"""
+
+	tiles = [
+		(x, y, z)
+		for x in range(tileset_size[0])
+		for y in range(tileset_size[1])
+		for z in range(tileset_size[2])
+	]
+
+	if method == "LINEAR" or len(tiles) == 0:
+		return tiles
+
+	# Number of bits needed to hold the largest index on any axis
+	bits = max(1, (max(tileset_size) - 1).bit_length())
+
+	# Leave out axes that are only one tile thick, so a flat grid gets a proper 2D curve
+	axes = [axis for axis in range(3) if tileset_size[axis] > 1] or [0]
+
+	if method == "MORTON":
+		return sorted(tiles, key=lambda tile: GetMortonIndex([tile[axis] for axis in axes], bits))
+
+	if method == "HILBERT":
+		return sorted(tiles, key=lambda tile: GetHilbertIndex([tile[axis] for axis in axes], bits))
+
+	raise ValueError(f"Unknown tile order: {method}")
+
+
+def GetMortonIndex(
+	tile_index: tuple[int, ...],
+	bits      : int
+) -> int:
+	"""
+	Get the position of a tile along a Morton (Z-order) curve, by interleaving the bits of its index.
+
+	Args:
+	- tile_index (tuple[int, ...]): The index of the tile, on any number of axes.
+	- bits (int): The number of bits per axis.
+
+	Returns:
+	- int: The position of the tile along the curve.
+	"""
+
+	code = 0
+	for bit in range(bits - 1, -1, -1):
+		for axis in range(len(tile_index)):
+			code = (code << 1) | ((tile_index[axis] >> bit) & 1)
+
+	return code
+
+
+def GetHilbertIndex(
+	tile_index: tuple[int, ...],
+	bits      : int
+) -> int:
+	"""
+	Get the position of a tile along a Hilbert curve, using Skilling's transpose method
+	("Programming the Hilbert curve", AIP Conf. Proc. 707, 2004).
+
+	Unlike the Morton curve, consecutive positions along a Hilbert curve are always neighbouring tiles,
+	as long as the grid is a power-of-two cube.
+
+	Args:
+	- tile_index (tuple[int, ...]): The index of the tile, on any number of axes.
+	- bits (int): The number of bits per axis.
+
+	Returns:
+	- int: The position of the tile along the curve.
+	"""
+
+	x = list(tile_index)
+	n = len(x)
+
+	# Inverse undo excess work
+	q = 1 << (bits - 1)
+	while q > 1:
+		p = q - 1
+		for i in range(n):
+			if x[i] & q:
+				x[0] ^= p
+			else:
+				t = (x[0] ^ x[i]) & p
+				x[0] ^= t
+				x[i] ^= t
+		q >>= 1
+
+	# Gray encode
+	for i in range(1, n):
+		x[i] ^= x[i - 1]
+
+	t = 0
+	q = 1 << (bits - 1)
+	while q > 1:
+		if x[n - 1] & q:
+			t ^= q - 1
+		q >>= 1
+
+	for i in range(n):
+		x[i] ^= t
+
+	# Interleave the transposed bits into a single index
+	return GetMortonIndex(x, bits)
+
+
+
+# ██████╗ ███████╗██╗     ███████╗ █████╗ ███████╗███████╗
+# ██╔══██╗██╔════╝██║     ██╔════╝██╔══██╗██╔════╝██╔════╝
+# ██████╔╝█████╗  ██║     █████╗  ███████║███████╗█████╗
+# ██╔══██╗██╔══╝  ██║     ██╔══╝  ██╔══██║╚════██║██╔══╝
+# ██║  ██║███████╗███████╗███████╗██║  ██║███████║███████╗
+# ╚═╝  ╚═╝╚══════╝╚══════╝╚══════╝╚═╝  ╚═╝╚══════╝╚══════╝
+#
+
+def GetObjectReleaseTiles(
+	spatial_index: dict[str, object],
+	tile_order   : list[tuple[int, int, int]]
+) -> dict[tuple[int, int, int], list[bpy.types.Object]]:
+	"""
+	Work out the last tile each object is needed by, for a given tile order. Once that tile
+	has been processed, any data cached for the object can be released.
+
+	Args:
+	- spatial_index (dict[str, object]): The spatial index, as returned by BuildSpatialIndex.
+	- tile_order (list[tuple[int, int, int]]): The order tiles will be processed in, as returned by GetTileOrder.
+
+	Returns:
+	- dict[tuple[int, int, int], list[bpy.types.Object]]: Maps tile indexes to the objects that can be released after it.
+	"""
+
+	buckets    = spatial_index["buckets"]
+	last_tiles = {}
+
+	for tile_index in tile_order:
+		for obj in buckets.get(tile_index, []):
+			last_tiles[obj] = tile_index
+
+	release_tiles = {}
+	for obj, tile_index in last_tiles.items():
+		release_tiles.setdefault(tile_index, []).append(obj)
+
+	return release_tiles
@@ -1,4 +1,5 @@
 import bpy
+import numpy as np
 
 
 
@@ -26,6 +27,34 @@ def GetTotalTriCount(objects: bpy.types.Object) -> int:
 	return count
 
 
+def GetEvaluatedTriCount(objects: list[bpy.types.Object]) -> int:
+	"""
+	Gets the total triangle count of the given objects after their modifiers, as they'd be
+	exported, without duplicating or converting them.
+
+	:param objects: The objects to count.
+	:type objects: list[bpy.types.Object]
+	:return: The total triangle count.
+	:rtype: int
+	"""
+
+	depsgraph = bpy.context.evaluated_depsgraph_get()
+
+	count = 0
+	for obj in objects:
+		if obj.type != 'MESH':
+			continue
+
+		mesh = obj.evaluated_get(depsgraph).data
+
+		# A face with n corners makes n - 2 triangles
+		loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+		mesh.polygons.foreach_get("loop_total", loop_totals)
+		count += int(loop_totals.sum()) - 2 * len(loop_totals)
+
+	return count
+
+
 def GetDuplicatedObjectTriCount(obj) -> int:
 	"""
 	Gets the triangle count of an object, after it has had all its modifiers applied
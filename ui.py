@@ -1,6 +1,7 @@
 import bpy
 
-from . _main import EXPORT_OT_SceneSlicer_Export, EXPORT_OT_SceneSlicer_Preview
+from . _main    import EXPORT_OT_SceneSlicer_Export, EXPORT_OT_SceneSlicer_Preview, EXPORT_OT_SceneSlicer_Resume
+from . teardown import TeardownPreviousRun
 
 # Define a variable to hold bl_info
 try:
@@ -28,6 +29,17 @@ class SCENE_OT_SceneSlicer_RefreshCollections(bpy.types.Operator):
 		context.scene.ss_settings.refresh_collections(context)
 		return {'FINISHED'}
 
+# UI button to remove everything left by previous slicing runs
+class SCENE_OT_SceneSlicer_RemoveSliced(bpy.types.Operator):
+	bl_idname  = "ss.btn_remove_sliced"
+	bl_label   = "Remove Sliced Data"
+	bl_options = {'REGISTER', 'UNDO'}
+
+	def execute(self, context):
+		report = TeardownPreviousRun(context.scene.ss_settings.export_collection)
+		self.report({'INFO'}, f"Removed {report['objects']} objects and {report['meshes']} meshes, about {round(report['bytes'] / (1024 * 1024), 1)} MB")
+		return {'FINISHED'}
+
 # UI Panel class
 class VIEW3D_PT_SceneSlicer_Main(bpy.types.Panel):
 	bl_label       = 'Scene Slicer: Export'
@@ -71,6 +83,14 @@ class VIEW3D_PT_SceneSlicer_Main(bpy.types.Panel):
 		row = layout.row()
 		row.operator(EXPORT_OT_SceneSlicer_Export.bl_idname, text="Slice and Export", icon="FILE_VOLUME")
 
+		# Btn: Resume
+		row = layout.row()
+		row.operator(EXPORT_OT_SceneSlicer_Resume.bl_idname, text="Resume", icon="PLAY")
+
+		# Btn: Remove sliced data
+		row = layout.row()
+		row.operator(SCENE_OT_SceneSlicer_RemoveSliced.bl_idname, text="Remove sliced data", icon="TRASH")
+
 		# Progress
 		row = layout.row()
 		split = layout.split(factor=0.4)
@@ -112,11 +132,72 @@ class VIEW3D_PT_SceneSlicer_Options(bpy.types.Panel):
 			plugin_version = ".".join(map(str, bl_info["version"]))
 			col.label(text=plugin_version)
 
+		# Slice method
+		row = layout.row()
+		col = row.column(align=False)
+		col.label(text="Slice method")
+		col = row.column(align=True)
+		col.prop(context.scene.ss_settings, "slice_method", text="")
+
+		# Tiling mode
+		row = layout.row()
+		col = row.column(align=False)
+		col.label(text="Tiling mode")
+		col = row.column(align=True)
+		col.prop(context.scene.ss_settings, "tiling_mode", text="")
+
+		# Octree triangle budget
+		row = layout.row()
+		col = row.column(align=False)
+		col.label(text="Octree tri budget")
+		col = row.column(align=True)
+		col.enabled = context.scene.ss_settings.tiling_mode == "OCTREE"
+		col.prop(context.scene.ss_settings, "octree_tri_budget", text="")
+
+		# Octree merge level
+		row = layout.row()
+		col = row.column(align=False)
+		col.label(text="Octree max level")
+		col = row.column(align=True)
+		col.enabled = context.scene.ss_settings.tiling_mode == "OCTREE"
+		col.prop(context.scene.ss_settings, "octree_max_level", text="")
+
+		# Frame budget
+		row = layout.row()
+		col = row.column(align=False)
+		col.label(text="Frame budget (ms)")
+		col = row.column(align=True)
+		col.prop(context.scene.ss_settings, "frame_budget", text="")
+
+		# Tile order
+		row = layout.row()
+		col = row.column(align=False)
+		col.label(text="Tile order")
+		col = row.column(align=True)
+		col.prop(context.scene.ss_settings, "tile_order", text="")
+
+		# Mesh cache budget
+		row = layout.row()
+		col = row.column(align=False)
+		col.label(text="Mesh cache (MB)")
+		col = row.column(align=True)
+		col.enabled = context.scene.ss_settings.slice_method == "BISECT"
+		col.prop(context.scene.ss_settings, "mesh_cache_budget", text="")
+
+		# Duplicate method
+		row = layout.row()
+		col = row.column(align=False)
+		col.label(text="Duplicate method")
+		col = row.column(align=True)
+		col.enabled = context.scene.ss_settings.slice_method == "BOOLEAN"
+		col.prop(context.scene.ss_settings, "duplicate_method", text="")
+
 		# Bool solver method
 		row = layout.row()
 		col = row.column(align=False)
 		col.label(text="Bool solver method")
 		col = row.column(align=True)
+		col.enabled = context.scene.ss_settings.slice_method == "BOOLEAN"
 		col.prop(context.scene.ss_settings, "bool_solver", text="")
 
 		# Skip exporting colliders
@@ -132,12 +213,90 @@ class VIEW3D_PT_SceneSlicer_Options(bpy.types.Panel):
 		col.label(text="JSON minify")
 		col = row.column(align=True)
 		col.prop(context.scene.ss_settings, "minify_json", text="")
+
+		# Tileset schema
+		row = layout.row()
+		col = row.column(align=False)
+		col.label(text="Tileset schema")
+		col = row.column(align=True)
+		col.prop(context.scene.ss_settings, "tileset_schema", text="")
+
+		# Binary tile index
+		row = layout.row()
+		col = row.column(align=False)
+		col.label(text="Export tile index")
+		col = row.column(align=True)
+		col.prop(context.scene.ss_settings, "export_tile_index", text="")
+
+		# Incremental export
+		row = layout.row()
+		col = row.column(align=False)
+		col.label(text="Incremental export")
+		col = row.column(align=True)
+		col.prop(context.scene.ss_settings, "incremental_export", text="")
+
+		# Keep sliced objects
+		row = layout.row()
+		col = row.column(align=False)
+		col.label(text="Keep sliced objects")
+		col = row.column(align=True)
+		col.prop(context.scene.ss_settings, "keep_sliced", text="")
+
+		# Profiling
+		row = layout.row()
+		col = row.column(align=False)
+		col.label(text="Profile export")
+		col = row.column(align=True)
+		col.prop(context.scene.ss_settings, "use_profiler", text="")
+
+		# Log level
+		row = layout.row()
+		col = row.column(align=False)
+		col.label(text="Log level")
+		col = row.column(align=True)
+		col.prop(context.scene.ss_settings, "log_level", text="")
+
+		# Log format
+		row = layout.row()
+		col = row.column(align=False)
+		col.label(text="Log format")
+		col = row.column(align=True)
+		col.prop(context.scene.ss_settings, "log_format", text="")
+
+		# Log text block
+		row = layout.row()
+		col = row.column(align=False)
+		col.label(text="Log to text block")
+		col = row.column(align=True)
+		col.prop(context.scene.ss_settings, "log_to_text", text="")
+
+		# LODs
+		row = layout.row()
+		col = row.column(align=False)
+		col.label(text="Export LODs")
+		col = row.column(align=True)
+		col.prop(context.scene.ss_settings, "use_lods", text="")
+
+		# LOD ratios
+		row = layout.row()
+		col = row.column(align=False)
+		col.label(text="LOD ratios")
+		col = row.column(align=True)
+		col.enabled = context.scene.ss_settings.use_lods
+		col.prop(context.scene.ss_settings, "lod_ratios", text="")
 	
 		# glTF settings
 		row = layout.row()
 		row.label(text="glTF settings:")
 		box = layout.box()
 
+		# glTF writer
+		row = box.row()
+		col = row.column(align=False)
+		col.label(text="glTF writer")
+		col = row.column(align=True)
+		col.prop(context.scene.ss_settings, "gltf_writer", text="")
+
 		# Draco compression
 		row = box.row()
 		col = row.column(align=False)